@@ -3,120 +3,947 @@ AI Report Generator für ControlBot
 Nutzt OpenAI GPT für intelligente Report-Generierung
 """
 
+from __future__ import annotations
+
 import os
-from typing import Dict, List, Any
-import pandas as pd
-from openai import OpenAI
+import asyncio
+import functools
+import hashlib
+import json
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, List, Any, NamedTuple, Optional, Iterator, Tuple, Union
+import httpx
+import numpy as np
+
+# pandas und openai nur für Type Hints - openai wird beim ersten Gebrauch geladen
+if TYPE_CHECKING:
+    import pandas as pd
+    from openai import AsyncOpenAI
+
+# Optionaler persistenter Cache - prüfe ob diskcache verfügbar ist
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+
+# Optionaler exakter Tokenizer - prüfe ob tiktoken verfügbar ist
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+# HTTP/2 in httpx benötigt das optionale Paket h2
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Obergrenze gleichzeitiger Verbindungen für parallele Requests (OpenAI Rate Limits)
+MAX_PARALLEL_REQUESTS = 16
+
+# Connection Pool für den persistenten HTTP-Client
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+HTTP_RETRIES = 2  # Wiederholungen bei Verbindungsfehlern (nicht bei HTTP-Fehlern)
+
+# Wiederholungen des OpenAI SDK bei 408/409/429/5xx (exponentielles Backoff mit Jitter)
+OPENAI_MAX_RETRIES = 5
+
+logger = logging.getLogger(__name__)
+
+# Token-Budget: Kontextfenster von gpt-4o-mini, gewünschte und minimale Report-Länge
+MODEL_CONTEXT_WINDOW = 128_000
+REPORT_MAX_TOKENS = 2000
+REPORT_MIN_TOKENS = 500
+TOKEN_SAFETY_MARGIN = 64
+
+# Versions-Tag im Cache-Key - erhöhen, wenn sich Prompts oder Antwortformat ändern
+CACHE_VERSION = "1"
+CACHE_DIR = os.path.join(".cache", "ai_reports")
+
+# Grenzen der Antwort-Caches: Einträge im Speicher (LRU), Größe und Lebensdauer auf der Platte
+RESPONSE_CACHE_MAX_ENTRIES = 256
+DISK_CACHE_SIZE_LIMIT = 100 * 1024 * 1024  # 100 MB
+DISK_CACHE_TTL = 7 * 24 * 3600  # Sekunden
+
+# Semantischer Cache: Embedding-Model und minimale Kosinus-Ähnlichkeit für einen Treffer
+EMBEDDING_MODEL = "text-embedding-3-small"
+SEMANTIC_CACHE_THRESHOLD = 0.97
+# Reports pro Parameter-Kombination (Ringpuffer) und Anzahl gehaltener Kombinationen
+SEMANTIC_CACHE_CAPACITY = 128
+SEMANTIC_CACHE_MAX_SCOPES = 32
+
+# Statischer Teil des System Prompts. Muss über alle Aufrufe byte-identisch
+# bleiben, damit OpenAI den Prompt-Prefix serverseitig cachen kann.
+SYSTEM_PROMPT_PREFIX = """Du bist ein erfahrener Projektcontroller und Business Analyst mit 15+ Jahren Erfahrung.
+
+Deine Aufgabe ist es, professionelle Projektcontrolling-Reports zu erstellen.
+
+Schreibstil:
+- Professionell aber verständlich
+- Faktenbasiert und objektiv
+- Handlungsorientiert
+- Nutze Bullet Points für bessere Lesbarkeit
+- Verwende klare Überschriften
+- Hebe wichtige Zahlen hervor
+
+Struktur:
+1. Executive Summary (2-3 Sätze)
+2. Wichtigste Erkenntnisse (3-5 Punkte)
+3. Detailanalyse
+4. Handlungsempfehlungen (wenn angefordert)
+5. Fazit
+
+WICHTIG: 
+- Alle Zahlen präzise aus den Daten übernehmen
+- Keine Spekulationen, nur faktenbasierte Aussagen
+- Konkrete, umsetzbare Empfehlungen geben
+"""
+
+# Antwortformat für den nicht-gestreamten Report: kompaktes JSON, das in
+# _format_report lokal zu Markdown gerendert wird (spart Formatierungs-Tokens)
+REPORT_JSON_INSTRUCTIONS = """
+Antwortformat:
+Antworte ausschließlich als JSON-Objekt mit genau diesen Feldern (ohne Markdown-Formatierung):
+{"executive_summary": "...", "findings": ["..."], "detail": "...", "recommendations": [{"project": "...", "priority": "Hoch", "text": "..."}], "fazit": "..."}
+Sind keine Handlungsempfehlungen angefordert, bleibt "recommendations" eine leere Liste.
+"""
+
+# Statische Anforderungen stehen am Anfang des User Prompts, vor den Daten
+REPORT_REQUIREMENTS_WITH_RECOMMENDATIONS = """## ANFORDERUNG
+Erstelle einen Report mit folgenden Elementen:
+1. Executive Summary
+2. Situationsanalyse
+3. Kritische Projekte im Detail
+4. Konkrete Handlungsempfehlungen für jedes Risiko-Projekt
+5. Nächste Schritte und Prioritäten
+6. Fazit
+
+Die Handlungsempfehlungen sollten:
+- Spezifisch und umsetzbar sein
+- Zeitrahmen enthalten
+- Verantwortlichkeiten definieren
+- Risiken adressieren
+"""
+
+REPORT_REQUIREMENTS = """## ANFORDERUNG
+Erstelle einen Report mit folgenden Elementen:
+1. Executive Summary
+2. Situationsanalyse
+3. Kritische Projekte im Detail
+4. Fazit
+"""
+
+# Prompt-Templates werden einmal beim Import angelegt und pro Aufruf nur mit
+# str.format_map befüllt. Zahlen kommen bereits kompakt formatiert an
+# (siehe _summary_fields/_project_fields), das spart Input-Tokens.
+REPORT_DATA_TEMPLATE = """
+Erstelle den Report basierend auf folgenden Daten (Beträge in Tausend Euro):
+
+## GESAMTÜBERSICHT
+- Anzahl Projekte: {total_projects}
+- Gesamtkosten Plan: {total_cost_plan}
+- Gesamtkosten Ist: {total_cost_actual}
+- Gesamtabweichung: {total_deviation} ({total_deviation_pct})
+
+## PROJEKTSTATUS
+- Kritische Projekte (>10% Überschreitung): {projects_critical}
+- Projekte mit Warnung (5-10% Überschreitung): {projects_warning}
+- Projekte im Plan: {projects_on_track}
+- Projekte über Budget: {projects_over_budget}
+
+## KENNZAHLEN
+- Durchschnittliche Kostenabweichung: {avg_cost_deviation_pct}
+- Höchste Einzelabweichung: {max_cost_deviation_pct}
+- Niedrigste Einzelabweichung: {min_cost_deviation_pct}
+
+## TOP 3 RISIKO-PROJEKTE
+"""
+
+# Projekte als kompakte Tabellenzeilen statt fünf Bullet Points pro Projekt
+PROJECT_TABLE_HEADER = "Nr | Projekt | Plan | Ist | Abweichung | Status\n"
+PROJECT_ROW_TEMPLATE = "{index} | {name} | {plan} | {ist} | {pct} | {status}\n"
+
+CONTEXT_TEMPLATE = "\n## ZUSÄTZLICHER KONTEXT\n{context}\n"
+
+RECOMMENDATION_TEMPLATE = """Gib eine konkrete, umsetzbare Handlungsempfehlung für folgendes Projekt:
+
+Projekt | Plan | Ist | Abweichung | Status
+{name} | {plan} | {ist} | {pct} | {status}
+
+Die Empfehlung sollte:
+- In 2-3 Sätzen formuliert sein
+- Konkrete Maßnahmen enthalten
+- Einen Zeitrahmen nennen
+- Priorität angeben (Hoch/Mittel/Niedrig)
+
+Format: "[PRIORITÄT] Empfehlung: ..."
+"""
+
+BATCH_RECOMMENDATION_TEMPLATE = """Gib für jedes der folgenden Projekte eine konkrete, umsetzbare Handlungsempfehlung:
+
+{project_lines}
+Jede Empfehlung sollte:
+- In 2-3 Sätzen formuliert sein
+- Konkrete Maßnahmen enthalten
+- Einen Zeitrahmen nennen
+- Priorität angeben (Hoch/Mittel/Niedrig)
+
+Antworte ausschließlich als JSON-Objekt im Format (idx = Nr):
+{{"recommendations": [{{"idx": 1, "priority": "Hoch", "text": "..."}}]}}
+"""
+
+# Eigener, kleiner Aufruf für das Executive Summary, wenn kein Report im Cache liegt
+EXECUTIVE_SUMMARY_SYSTEM_PROMPT = "Du bist ein erfahrener Projektcontroller. Erstelle prägnante Executive Summaries."
+EXECUTIVE_SUMMARY_TEMPLATE = """Erstelle ein kurzes Executive Summary (max. 3 Sätze) für folgende Projektportfolio-Situation:
+
+- {total_projects} Projekte im Portfolio
+- Gesamtbudget Plan: €{total_cost_plan:,.0f}
+- Gesamtkosten Ist: €{total_cost_actual:,.0f}
+- Abweichung: {total_deviation_pct:.1f}%
+- {projects_critical} kritische Projekte
+
+Das Summary sollte die wichtigste Botschaft vermitteln und zum Handeln auffordern, falls nötig.
+"""
+EXECUTIVE_SUMMARY_MAX_TOKENS = 200
+
+# Pflichtfelder der Analyseergebnisse - werden vor dem API-Aufruf geprüft
+REQUIRED_SUMMARY_KEYS = frozenset((
+    'total_projects', 'total_cost_plan', 'total_cost_actual', 'total_deviation',
+    'total_deviation_pct', 'projects_critical', 'projects_warning', 'projects_on_track',
+    'projects_over_budget', 'avg_cost_deviation_pct', 'max_cost_deviation_pct',
+    'min_cost_deviation_pct'
+))
+REQUIRED_PROJECT_KEYS = frozenset((
+    'projekt_name', 'kosten_plan', 'kosten_ist', 'kosten_abweichung_prozent', 'kosten_status'
+))
+
+# Längere Projektnamen werden im Prompt gekürzt
+MAX_PROJECT_NAME_LENGTH = 40
+
+REPORT_RESPONSE_FORMAT = {"type": "json_object"}
+
+# Executive Summary in einer Markdown-Antwort (Fallback, wenn kein JSON geliefert wurde)
+EXECUTIVE_SUMMARY_PATTERN = re.compile(r"^#+\s*Executive Summary\s*$(.*?)(?=^#|\Z)", re.S | re.M)
+
+# Prozessweiter Cache für erfolgreiche API-Antworten (überlebt Streamlit-Reruns).
+# Alle Sessions teilen ihn, daher begrenzt (LRU) und per Lock geschützt.
+_response_cache: "OrderedDict[str, str]" = OrderedDict()
+_response_cache_lock = threading.Lock()
+_disk_cache = None
+
+# Semantischer Cache pro Parameter-Kombination: Ringpuffer aus normalisierten
+# Embeddings und Reports; die Kombinationen selbst werden per LRU begrenzt
+_semantic_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_semantic_cache_lock = threading.Lock()
+
+# Lazy geladenes openai-Modul (Import dauert mehrere hundert Millisekunden)
+_openai = None
+
+
+def _get_openai():
+    """Importiert das openai-Paket beim ersten Zugriff"""
+    global _openai
+    if _openai is None:
+        import openai
+        _openai = openai
+    return _openai
+
+
+def _get_disk_cache():
+    """Öffnet den persistenten Cache beim ersten Zugriff"""
+    global _disk_cache
+    if _disk_cache is None and DISKCACHE_AVAILABLE:
+        _disk_cache = diskcache.Cache(
+            CACHE_DIR,
+            size_limit=DISK_CACHE_SIZE_LIMIT,
+            eviction_policy='least-recently-used'
+        )
+    return _disk_cache
+
+
+def _memory_put(key: str, value: str) -> None:
+    """Legt eine Antwort im Memory-Cache ab und verdrängt den ältesten Eintrag"""
+    with _response_cache_lock:
+        _response_cache[key] = value
+        _response_cache.move_to_end(key)
+        while len(_response_cache) > RESPONSE_CACHE_MAX_ENTRIES:
+            _response_cache.popitem(last=False)
+
+
+def _cache_get(key: str) -> Optional[str]:
+    """Liest eine Antwort aus dem Memory- oder Disk-Cache"""
+    with _response_cache_lock:
+        value = _response_cache.get(key)
+        if value is not None:
+            _response_cache.move_to_end(key)
+            return value
+    
+    disk_cache = _get_disk_cache()
+    if disk_cache is not None:
+        value = disk_cache.get(key)
+        if value is not None:
+            _memory_put(key, value)
+            return value
+    
+    return None
+
+
+def _cache_put(key: str, value: str) -> None:
+    """Speichert eine erfolgreiche Antwort im Memory- und Disk-Cache"""
+    _memory_put(key, value)
+    
+    disk_cache = _get_disk_cache()
+    if disk_cache is not None:
+        disk_cache.set(key, value, expire=DISK_CACHE_TTL)
+
+
+def _semantic_lookup(scope: str, vector: np.ndarray) -> Optional[str]:
+    """Sucht den ähnlichsten gespeicherten Report (Kosinus-Ähnlichkeit)"""
+    with _semantic_cache_lock:
+        entry = _semantic_cache.get(scope)
+        if entry is None or entry['count'] == 0:
+            return None
+        _semantic_cache.move_to_end(scope)
+        
+        # Vektoren sind normalisiert - das Skalarprodukt ist die Kosinus-Ähnlichkeit
+        scores = entry['vectors'][:entry['count']] @ vector
+        best = int(np.argmax(scores))
+        if scores[best] >= SEMANTIC_CACHE_THRESHOLD:
+            return entry['reports'][best]
+    
+    return None
+
+
+def _semantic_insert(scope: str, vector: np.ndarray, report_text: str) -> None:
+    """
+    Fügt einen Report mit seinem Embedding zum semantischen Cache hinzu
+    
+    Jede Parameter-Kombination hat einen vorab angelegten Ringpuffer mit
+    SEMANTIC_CACHE_CAPACITY Plätzen; ist er voll, wird der älteste Eintrag
+    überschrieben. Es wird nur eine Zeile geschrieben, nichts umkopiert.
+    """
+    with _semantic_cache_lock:
+        entry = _semantic_cache.get(scope)
+        if entry is None:
+            entry = _semantic_cache[scope] = {
+                'vectors': np.empty((SEMANTIC_CACHE_CAPACITY, vector.shape[0]), dtype=np.float32),
+                'reports': [None] * SEMANTIC_CACHE_CAPACITY,
+                'count': 0,
+                'next': 0
+            }
+            while len(_semantic_cache) > SEMANTIC_CACHE_MAX_SCOPES:
+                _semantic_cache.popitem(last=False)
+        else:
+            _semantic_cache.move_to_end(scope)
+        
+        slot = entry['next']
+        entry['vectors'][slot] = vector
+        entry['reports'][slot] = report_text
+        entry['next'] = (slot + 1) % SEMANTIC_CACHE_CAPACITY
+        entry['count'] = min(entry['count'] + 1, SEMANTIC_CACHE_CAPACITY)
+
+class _ReportCall(NamedTuple):
+    """Vorbereiteter Report-Aufruf, gemeinsam für die Sync- und Async-Variante"""
+    messages: List[Dict[str, str]]
+    max_tokens: int
+    use_cache: bool
+    cached: Optional[str]  # Treffer im Exact-Match Cache
+    semantic_scope: Optional[str]  # None = semantischer Cache aus
+    fingerprint: Optional[str]  # Text für das Embedding des semantischen Caches
+
+
+def _normalized_embedding(response: Any) -> np.ndarray:
+    """Liest das Embedding aus der API-Antwort und normalisiert es auf Länge 1"""
+    vector = np.asarray(response.data[0].embedding, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+@functools.lru_cache(maxsize=64)
+def _build_system_prompt(language: str, report_type: str, detail_level: str, json_output: bool) -> str:
+    """
+    Baut den System Prompt für eine Parameter-Kombination (einmal pro Kombination)
+    
+    Variable Angaben stehen am Ende, damit der statische Prefix für das
+    Prompt-Caching von OpenAI byte-identisch bleibt.
+    """
+    return (
+        f"{SYSTEM_PROMPT_PREFIX}"
+        f"{REPORT_JSON_INSTRUCTIONS if json_output else ''}\n"
+        f"Sprache: {language}\n"
+        f"Report-Typ: {report_type}\n"
+        f"Detailgrad: {detail_level}\n"
+    )
+
+
+def _validate_analysis_results(analysis_results: Dict[str, Any]) -> None:
+    """
+    Prüft die Analyseergebnisse auf alle Felder, die der Prompt benötigt
+    
+    Raises:
+        ValueError: Wenn Abschnitte oder Pflichtfelder fehlen
+    """
+    missing_sections = [
+        key for key in ('summary', 'top_risk_projects', 'top_performers')
+        if key not in analysis_results
+    ]
+    if missing_sections:
+        raise ValueError(f"Analyseergebnisse unvollständig, fehlend: {', '.join(missing_sections)}")
+    
+    missing = REQUIRED_SUMMARY_KEYS - analysis_results['summary'].keys()
+    if missing:
+        raise ValueError(f"Zusammenfassung unvollständig, fehlende Felder: {', '.join(sorted(missing))}")
+    
+    for project in analysis_results['top_risk_projects'][:5] + analysis_results['top_performers'][:3]:
+        missing = REQUIRED_PROJECT_KEYS - project.keys()
+        if missing:
+            raise ValueError(f"Projektdaten unvollständig, fehlende Felder: {', '.join(sorted(missing))}")
+
+
+def _fmt_eur(value: float) -> str:
+    """Formatiert einen Betrag kompakt in Tausend Euro (z.B. 1250000 -> 1250k€)"""
+    return f"{value / 1000:.0f}k€"
+
+
+def _fmt_pct(value: float) -> str:
+    """Formatiert einen Prozentwert ohne Nachkommastellen"""
+    return f"{value:.0f}%"
+
+
+def _short_name(name: Any) -> str:
+    """Kürzt lange Projektnamen für den Prompt"""
+    name = str(name)
+    if len(name) > MAX_PROJECT_NAME_LENGTH:
+        return name[:MAX_PROJECT_NAME_LENGTH] + "…"
+    return name
+
+
+def _summary_fields(summary: Dict[str, Any]) -> Dict[str, Any]:
+    """Bereitet die Kennzahlen der Zusammenfassung für die Prompt-Templates auf"""
+    return {
+        'total_projects': summary['total_projects'],
+        'total_cost_plan': _fmt_eur(summary['total_cost_plan']),
+        'total_cost_actual': _fmt_eur(summary['total_cost_actual']),
+        'total_deviation': _fmt_eur(summary['total_deviation']),
+        'total_deviation_pct': _fmt_pct(summary['total_deviation_pct']),
+        'projects_critical': summary['projects_critical'],
+        'projects_warning': summary['projects_warning'],
+        'projects_on_track': summary['projects_on_track'],
+        'projects_over_budget': summary['projects_over_budget'],
+        'avg_cost_deviation_pct': _fmt_pct(summary['avg_cost_deviation_pct']),
+        'max_cost_deviation_pct': _fmt_pct(summary['max_cost_deviation_pct']),
+        'min_cost_deviation_pct': _fmt_pct(summary['min_cost_deviation_pct'])
+    }
+
+
+def _project_fields(project: Dict[str, Any], index: int = 0) -> Dict[str, Any]:
+    """Bereitet ein Projekt für die Prompt-Templates auf"""
+    return {
+        'index': index,
+        'name': _short_name(project['projekt_name']),
+        'plan': _fmt_eur(project['kosten_plan']),
+        'ist': _fmt_eur(project['kosten_ist']),
+        'pct': _fmt_pct(project['kosten_abweichung_prozent']),
+        'status': project['kosten_status']
+    }
+
+
+def report_header(params: Dict[str, Any]) -> str:
+    """Erstellt den Report-Header mit Zeitstempel"""
+    from datetime import datetime
+    
+    return f"""# ControlBot Projektcontrolling Report
+**Erstellt am:** {datetime.now().strftime('%d.%m.%Y um %H:%M Uhr')}
+**Report-Typ:** {params.get('report_type', 'Standard')}
+**Sprache:** {params.get('language', 'Deutsch')}
+
+---
+
+"""
+
+
+def report_footer() -> str:
+    """Erstellt den Report-Footer"""
+    return """
+
+---
+
+*Dieser Report wurde automatisch mit ControlBot AI generiert.*
+*Die Daten basieren auf den hochgeladenen Projektinformationen.*
+"""
+
+
+def render_report(body: str, params: Dict[str, Any]) -> str:
+    """
+    Ergänzt den Report-Inhalt um Header und Footer für die Anzeige
+    
+    Args:
+        body: Report-Inhalt aus AIReportGenerator.generate_report
+        params: Report-Parameter
+        
+    Returns:
+        Vollständiger Report als Markdown-Text
+    """
+    return report_header(params) + body + report_footer()
+
 
 class AIReportGenerator:
     """Klasse für KI-gestützte Report-Generierung"""
     
+    __slots__ = ('api_key', '_http', 'client', 'model', '_encoding')
+    
     def __init__(self):
         """Initialisiert den AI Generator mit OpenAI Client"""
         api_key = os.environ.get('OPENAI_API_KEY')
         if not api_key:
             raise ValueError("OpenAI API Key nicht gefunden. Bitte in Umgebungsvariablen setzen.")
         
-        self.client = OpenAI(api_key=api_key)
+        self.api_key = api_key
+        # Persistenter HTTP-Client: Verbindungen (inkl. TLS) werden über Aufrufe wiederverwendet
+        self._http = httpx.Client(
+            timeout=HTTP_TIMEOUT,
+            transport=httpx.HTTPTransport(http2=HTTP2_AVAILABLE, limits=HTTP_LIMITS, retries=HTTP_RETRIES)
+        )
+        self.client = _get_openai().OpenAI(
+            api_key=api_key,
+            http_client=self._http,
+            max_retries=OPENAI_MAX_RETRIES,
+            timeout=HTTP_TIMEOUT
+        )
         self.model = "gpt-4o-mini"  # Kosteneffektives Model
+        self._encoding = None  # tiktoken-Encoding, wird beim ersten Zählen geladen
+    
+    def close(self) -> None:
+        """Schließt den HTTP-Client und gibt offene Verbindungen frei"""
+        self._http.close()
+    
+    def __enter__(self) -> "AIReportGenerator":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
     
     def generate_report(
         self, 
         analysis_results: Dict[str, Any], 
-        df: pd.DataFrame,
-        params: Dict[str, Any]
-    ) -> str:
+        df: Optional[pd.DataFrame] = None,
+        params: Optional[Dict[str, Any]] = None,
+        stream: bool = False
+    ) -> Union[str, Iterator[str]]:
         """
         Generiert einen vollständigen Report mit KI
         
-        Args:
-            analysis_results: Dictionary mit Analyseergebnissen
-            df: Original DataFrame mit Projektdaten
-            params: Report-Parameter (Typ, Sprache, etc.)
-            
-        Returns:
-            Vollständiger Report als Markdown-Text
+        Args:
+            analysis_results: Dictionary mit Analyseergebnissen
+            df: Original DataFrame mit Projektdaten (wird nicht ausgewertet, der
+                Prompt basiert nur auf den bereits aggregierten analysis_results)
+            params: Report-Parameter (Typ, Sprache, etc.)
+            stream: Report schrittweise liefern (z.B. für st.write_stream)
+            
+        Returns:
+            Report-Inhalt als Markdown-Text, bei stream=True ein Generator mit
+            den Textstücken. Header (mit Zeitstempel) und Footer ergänzt erst
+            render_report bei der Anzeige.
+        """
+        params = params or {}
+        
+        if stream:
+            messages, max_tokens = self._prepare_report(analysis_results, params, json_output=False)
+            return self._stream_report(messages, max_tokens, not params.get('nocache', False))
+        
+        report_text = self._generate_report_text(analysis_results, params)
+        return self._format_report(report_text)
+    
+    def generate_report_with_summary(
+        self,
+        analysis_results: Dict[str, Any],
+        df: Optional[pd.DataFrame] = None,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Tuple[str, str]:
+        """
+        Generiert Report und Executive Summary mit einem einzigen API-Aufruf
+        
+        Args:
+            analysis_results: Dictionary mit Analyseergebnissen
+            df: Original DataFrame mit Projektdaten (wird nicht ausgewertet)
+            params: Report-Parameter (Typ, Sprache, etc.)
+            
+        Returns:
+            Tuple aus Report-Inhalt (Markdown, ohne Header/Footer) und Executive Summary
+        """
+        params = params or {}
+        report_text = self._generate_report_text(analysis_results, params)
+        return self._format_report(report_text), self._extract_executive_summary(report_text)
+    
+    def _prepare_report(
+        self,
+        analysis_results: Dict[str, Any],
+        params: Dict[str, Any],
+        json_output: bool
+    ) -> Tuple[List[Dict[str, str]], int]:
+        """Prüft die Eingaben und baut Nachrichten und Token-Budget für den Report"""
+        # Eingaben prüfen, bevor ein API-Aufruf bezahlt wird
+        _validate_analysis_results(analysis_results)
+        
+        # Baue Prompt für GPT (gestreamt als Markdown, sonst als JSON)
+        messages = self._build_report_messages(
+            analysis_results['summary'],
+            analysis_results['top_risk_projects'],
+            analysis_results['top_performers'],
+            params,
+            json_output=json_output
+        )
+        return messages, self._report_max_tokens(messages)
+    
+    def _begin_report_call(self, analysis_results: Dict[str, Any], params: Dict[str, Any]) -> _ReportCall:
+        """
+        Gemeinsame Vorbereitung für _generate_report_text/_agenerate_report_text
+        
+        Prüft die Eingaben, baut den JSON-Prompt und schaut im Exact-Match
+        Cache nach. Für den semantischen Cache werden Bereich und Fingerprint
+        bestimmt; das Embedding selbst berechnet der Aufrufer (sync oder async).
+        """
+        messages, max_tokens = self._prepare_report(analysis_results, params, json_output=True)
+        
+        use_cache = not params.get('nocache', False)
+        cached = _cache_get(
+            self._cache_key(messages, 0.7, max_tokens, REPORT_RESPONSE_FORMAT)
+        ) if use_cache else None
+        
+        semantic_scope = fingerprint = None
+        if cached is None and use_cache and params.get('semantic_cache', False):
+            semantic_scope = self._semantic_scope(params)
+            fingerprint = self._summary_fingerprint(
+                analysis_results['summary'],
+                analysis_results['top_risk_projects'],
+                analysis_results['top_performers']
+            )
+        
+        return _ReportCall(messages, max_tokens, use_cache, cached, semantic_scope, fingerprint)
+    
+    def _report_chat_kwargs(self, call: _ReportCall) -> Dict[str, Any]:
+        """Parameter des Chat-Aufrufs für den Report"""
+        return {
+            'temperature': 0.7,
+            'max_tokens': call.max_tokens,
+            'use_cache': call.use_cache,
+            'response_format': REPORT_RESPONSE_FORMAT
+        }
+    
+    def _finish_report_call(self, call: _ReportCall, vector: Optional[np.ndarray], report_text: str) -> str:
+        """Legt eine neue Antwort im semantischen Cache ab (der Exact-Match Cache füllt _chat)"""
+        if vector is not None:
+            _semantic_insert(call.semantic_scope, vector, report_text)
+        return report_text
+    
+    def _generate_report_text(self, analysis_results: Dict[str, Any], params: Dict[str, Any]) -> str:
+        """
+        Fragt den Report als JSON-Antwort ab (mit Exact-Match und semantischem Cache)
+        
+        Returns:
+            Unformatierte Antwort des Models
+        """
+        call = self._begin_report_call(analysis_results, params)
+        if call.cached is not None:
+            return call.cached
+        
+        # Rufe OpenAI API auf (fast identische Portfolios kommen aus dem semantischen Cache)
+        try:
+            vector = None
+            if call.semantic_scope is not None:
+                vector = self._embed(call.fingerprint)
+                report_text = _semantic_lookup(call.semantic_scope, vector)
+                if report_text is not None:
+                    return report_text
+            
+            report_text = self._chat(call.messages, **self._report_chat_kwargs(call))
+            return self._finish_report_call(call, vector, report_text)
+            
+        except _get_openai().OpenAIError:
+            # Transiente Fehler hat das SDK bereits wiederholt - typisierte Exception weiterreichen
+            logger.exception("OpenAI API Aufruf für den Report fehlgeschlagen")
+            raise
+    
+    def generate_report_collect(
+        self,
+        analysis_results: Dict[str, Any],
+        df: Optional[pd.DataFrame] = None,
+        params: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Generiert den Report-Inhalt im Streaming-Modus und gibt ihn komplett zurück"""
+        return "".join(self.generate_report(analysis_results, df, params, stream=True))
+    
+    def _stream_report(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        use_cache: bool
+    ) -> Iterator[str]:
+        """Liefert den Report-Text gestreamt oder aus dem Cache"""
+        cached = _cache_get(self._cache_key(messages, 0.7, max_tokens)) if use_cache else None
+        if cached is not None:
+            return iter([cached])
+        
+        return self._stream_chat(messages, temperature=0.7, max_tokens=max_tokens, use_cache=use_cache)
+    
+    def _stream_chat(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        use_cache: bool = True
+    ) -> Iterator[str]:
+        """
+        Streamt die Antwort des Models Stück für Stück
+        
+        Die vollständige Antwort wird nach dem letzten Stück im Cache abgelegt.
+        """
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True
+        )
+        
+        parts = []
+        for chunk in response:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content or ""
+            if delta:
+                parts.append(delta)
+                yield delta
+        
+        if use_cache and parts:
+            _cache_put(self._cache_key(messages, temperature, max_tokens), "".join(parts))
+    
+    def _cache_key(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        response_format: Optional[Dict[str, str]] = None
+    ) -> str:
+        """Berechnet den Cache-Key aus Model, Prompts und Parametern"""
+        payload = json.dumps(
+            {
+                "version": CACHE_VERSION,
+                "model": self.model,
+                "messages": messages,
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                "response_format": response_format
+            },
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+    
+    def _chat(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        use_cache: bool = True,
+        response_format: Optional[Dict[str, str]] = None
+    ) -> str:
+        """
+        Führt einen Chat-Completion Aufruf aus, mit Exact-Match Cache
+        
+        Args:
+            messages: Chat-Nachrichten (System + User)
+            temperature: Sampling-Temperatur
+            max_tokens: Maximale Antwortlänge
+            use_cache: Ob der Response-Cache genutzt werden soll
+            response_format: Optionales Antwortformat (z.B. JSON-Objekt)
+            
+        Returns:
+            Antworttext des Models
+        """
+        key = self._cache_key(messages, temperature, max_tokens, response_format)
+        if use_cache:
+            cached = _cache_get(key)
+            if cached is not None:
+                return cached
+        
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **({'response_format': response_format} if response_format else {})
+        )
+        content = response.choices[0].message.content
+        
+        if use_cache and content:
+            _cache_put(key, content)
+        
+        return content
+    
+    async def _achat(
+        self,
+        client: AsyncOpenAI,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        use_cache: bool = True,
+        response_format: Optional[Dict[str, str]] = None
+    ) -> str:
+        """Async-Variante von _chat mit demselben Response-Cache"""
+        key = self._cache_key(messages, temperature, max_tokens, response_format)
+        if use_cache:
+            cached = _cache_get(key)
+            if cached is not None:
+                return cached
+        
+        response = await client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **({'response_format': response_format} if response_format else {})
+        )
+        content = response.choices[0].message.content
+        
+        if use_cache and content:
+            _cache_put(key, content)
+        
+        return content
+    
+    def _embed(self, text: str) -> np.ndarray:
+        """Berechnet ein normalisiertes Embedding für den semantischen Cache"""
+        return _normalized_embedding(self.client.embeddings.create(model=EMBEDDING_MODEL, input=text))
+    
+    async def _aembed(self, client: AsyncOpenAI, text: str) -> np.ndarray:
+        """Async-Variante von _embed"""
+        return _normalized_embedding(await client.embeddings.create(model=EMBEDDING_MODEL, input=text))
+    
+    def _semantic_scope(self, params: Dict[str, Any]) -> str:
+        """
+        Bereich des semantischen Caches: nur Reports mit identischem Model,
+        identischen Parametern (Sprache, Typ, Kontext, ...) sind austauschbar
+        """
+        payload = json.dumps(
+            {"version": CACHE_VERSION, "model": self.model, "params": params},
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+    
+    def _summary_fingerprint(
+        self,
+        summary: Dict[str, Any],
+        risk_projects: List[Dict],
+        top_performers: List[Dict]
+    ) -> str:
+        """
+        Kanonische Textform der Analyse für das Embedding
+        
+        Beträge werden auf Tausender, Prozente auf ganze Zahlen gerundet,
+        damit kleine Schwankungen zwischen zwei Läufen nicht ins Gewicht fallen.
+        """
+        lines = [
+            f"Projekte: {summary['total_projects']}",
+            f"Plan: {round(summary['total_cost_plan'] / 1000)}k",
+            f"Ist: {round(summary['total_cost_actual'] / 1000)}k",
+            f"Abweichung: {round(summary['total_deviation_pct'])}%",
+            f"Kritisch: {summary['projects_critical']}",
+            f"Warnung: {summary['projects_warning']}",
+            f"Im Plan: {summary['projects_on_track']}",
+            f"Risiko-Projekte: {', '.join(str(p['projekt_name']) for p in risk_projects[:3])}",
+            f"Best Performer: {', '.join(str(p['projekt_name']) for p in top_performers[:3])}"
+        ]
+        return "\n".join(lines)
+    
+    def _count_tokens(self, messages: List[Dict[str, str]]) -> int:
+        """
+        Zählt die Prompt-Tokens lokal
+        
+        Mit tiktoken exakt, sonst konservativ geschätzt (ca. 3 Zeichen pro Token).
+        Pro Nachricht kommen 4 Tokens für Rolle und Trennzeichen hinzu.
+        """
+        if self._encoding is None and TIKTOKEN_AVAILABLE:
+            try:
+                self._encoding = tiktoken.encoding_for_model(self.model)
+            except Exception:
+                self._encoding = False  # Encoding nicht ladbar (z.B. offline) - schätzen
+        
+        if self._encoding:
+            return sum(len(self._encoding.encode(m["content"])) + 4 for m in messages)
+        return sum(len(m["content"]) // 3 + 4 for m in messages)
+    
+    def _report_max_tokens(self, messages: List[Dict[str, str]]) -> int:
+        """Begrenzt die Antwortlänge auf den im Kontextfenster verbleibenden Platz"""
+        budget = MODEL_CONTEXT_WINDOW - self._count_tokens(messages) - TOKEN_SAFETY_MARGIN
+        return max(min(REPORT_MAX_TOKENS, budget), 1)
+    
+    def _build_report_messages(
+        self,
+        summary: Dict[str, Any],
+        risk_projects: List[Dict],
+        top_performers: List[Dict],
+        params: Dict[str, Any],
+        json_output: bool
+    ) -> List[Dict[str, str]]:
+        """
+        Baut System- und User-Nachricht für den Report
+        
+        Bleibt neben dem Prompt nicht genug Platz für den Report, werden zuerst
+        die Best Performer weggelassen und danach der zusätzliche Kontext gekürzt.
         """
-        # Extrahiere relevante Daten
-        summary = analysis_results['summary']
-        risk_projects = analysis_results['top_risk_projects']
-        top_performers = analysis_results['top_performers']
+        system_prompt = self._get_system_prompt(params, json_output=json_output)
         
-        # Baue Prompt für GPT
-        prompt = self._build_prompt(summary, risk_projects, top_performers, params)
+        def build(performers: List[Dict], prompt_params: Dict[str, Any]) -> List[Dict[str, str]]:
+            return [
+                {
+                    "role": "system",
+                    "content": system_prompt
+                },
+                {
+                    "role": "user",
+                    "content": self._build_prompt(summary, risk_projects, performers, prompt_params)
+                }
+            ]
         
-        # Rufe OpenAI API auf
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": self._get_system_prompt(params)
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.7,
-                max_tokens=2000
-            )
-            
-            report_text = response.choices[0].message.content
-            
-            # Formatiere den Report
-            formatted_report = self._format_report(report_text, params)
-            
-            return formatted_report
-            
-        except Exception as e:
-            raise Exception(f"Fehler bei OpenAI API Aufruf: {str(e)}")
+        limit = MODEL_CONTEXT_WINDOW - REPORT_MIN_TOKENS - TOKEN_SAFETY_MARGIN
+        messages = build(top_performers, params)
+        if self._count_tokens(messages) <= limit:
+            return messages
+        
+        messages = build([], params)
+        context = params.get('context', '')
+        excess = self._count_tokens(messages) - limit
+        while excess > 0 and context:
+            # Um die überzähligen Tokens kürzen (ca. 3 Zeichen pro Token)
+            context = context[:max(len(context) - excess * 3, 0)]
+            messages = build([], {**params, 'context': context})
+            excess = self._count_tokens(messages) - limit
+        
+        return messages
     
-    def _get_system_prompt(self, params: Dict[str, Any]) -> str:
+    def _get_system_prompt(self, params: Dict[str, Any], json_output: bool = False) -> str:
         """
         Erstellt den System Prompt basierend auf Report-Parametern
         
         Args:
             params: Report-Parameter
+            json_output: Antwort als JSON-Objekt statt als Markdown anfordern
             
         Returns:
             System Prompt als String
         """
-        language = params.get('language', 'Deutsch')
-        report_type = params.get('report_type', 'Management Summary')
-        detail_level = params.get('detail_level', 'Mittel')
-        
-        system_prompt = f"""Du bist ein erfahrener Projektcontroller und Business Analyst mit 15+ Jahren Erfahrung.
-        
-Deine Aufgabe ist es, professionelle Projektcontrolling-Reports zu erstellen.
-
-Sprache: {language}
-Report-Typ: {report_type}
-Detailgrad: {detail_level}
-
-Schreibstil:
-- Professionell aber verständlich
-- Faktenbasiert und objektiv
-- Handlungsorientiert
-- Nutze Bullet Points für bessere Lesbarkeit
-- Verwende klare Überschriften
-- Hebe wichtige Zahlen hervor
-
-Struktur:
-1. Executive Summary (2-3 Sätze)
-2. Wichtigste Erkenntnisse (3-5 Punkte)
-3. Detailanalyse
-4. Handlungsempfehlungen (wenn angefordert)
-5. Fazit
-
-WICHTIG: 
-- Alle Zahlen präzise aus den Daten übernehmen
-- Keine Spekulationen, nur faktenbasierte Aussagen
-- Konkrete, umsetzbare Empfehlungen geben
-"""
-        
-        return system_prompt
+        return _build_system_prompt(
+            params.get('language', 'Deutsch'),
+            params.get('report_type', 'Management Summary'),
+            params.get('detail_level', 'Mittel'),
+            json_output
+        )
     
     def _build_prompt(
         self,
@@ -140,162 +967,322 @@ WICHTIG:
         context = params.get('context', '')
         include_recommendations = params.get('include_recommendations', True)
         
-        prompt = f"""Erstelle einen professionellen Projektcontrolling-Report basierend auf folgenden Daten:
-
-## GESAMTÜBERSICHT
-- Anzahl Projekte: {summary['total_projects']}
-- Gesamtkosten Plan: €{summary['total_cost_plan']:,.0f}
-- Gesamtkosten Ist: €{summary['total_cost_actual']:,.0f}
-- Gesamtabweichung: €{summary['total_deviation']:,.0f} ({summary['total_deviation_pct']:.1f}%)
-
-## PROJEKTSTATUS
-- Kritische Projekte (>10% Überschreitung): {summary['projects_critical']}
-- Projekte mit Warnung (5-10% Überschreitung): {summary['projects_warning']}
-- Projekte im Plan: {summary['projects_on_track']}
-- Projekte über Budget: {summary['projects_over_budget']}
-
-## KENNZAHLEN
-- Durchschnittliche Kostenabweichung: {summary['avg_cost_deviation_pct']:.1f}%
-- Höchste Einzelabweichung: {summary['max_cost_deviation_pct']:.1f}%
-- Niedrigste Einzelabweichung: {summary['min_cost_deviation_pct']:.1f}%
-
-## TOP 3 RISIKO-PROJEKTE
-"""
-        
-        for i, project in enumerate(risk_projects[:3], 1):
-            prompt += f"""
-{i}. {project['projekt_name']}
-   - Plan: €{project['kosten_plan']:,.0f}
-   - Ist: €{project['kosten_ist']:,.0f}
-   - Abweichung: {project['kosten_abweichung_prozent']:.1f}%
-   - Status: {project['kosten_status']}
-"""
+        requirements = REPORT_REQUIREMENTS_WITH_RECOMMENDATIONS if include_recommendations else REPORT_REQUIREMENTS
         
-        prompt += "\n## TOP 3 BEST PERFORMERS\n"
+        parts = [requirements, REPORT_DATA_TEMPLATE.format_map(_summary_fields(summary)), PROJECT_TABLE_HEADER]
+        parts.extend(
+            self._format_project_row(i, project)
+            for i, project in enumerate(risk_projects[:3], 1)
+        )
         
-        for i, project in enumerate(top_performers[:3], 1):
-            prompt += f"""
-{i}. {project['projekt_name']}
-   - Plan: €{project['kosten_plan']:,.0f}
-   - Ist: €{project['kosten_ist']:,.0f}
-   - Abweichung: {project['kosten_abweichung_prozent']:.1f}%
-   - Status: {project['kosten_status']}
-"""
+        if top_performers:
+            parts.append("\n## TOP 3 BEST PERFORMERS\n")
+            parts.append(PROJECT_TABLE_HEADER)
+            parts.extend(
+                self._format_project_row(i, project)
+                for i, project in enumerate(top_performers[:3], 1)
+            )
         
         if context:
-            prompt += f"\n## ZUSÄTZLICHER KONTEXT\n{context}\n"
+            parts.append(CONTEXT_TEMPLATE.format(context=context))
         
-        if include_recommendations:
-            prompt += """
-## ANFORDERUNG
-Erstelle einen Report mit folgenden Elementen:
-1. Executive Summary
-2. Situationsanalyse
-3. Kritische Projekte im Detail
-4. Konkrete Handlungsempfehlungen für jedes Risiko-Projekt
-5. Nächste Schritte und Prioritäten
-6. Fazit
-
-Die Handlungsempfehlungen sollten:
-- Spezifisch und umsetzbar sein
-- Zeitrahmen enthalten
-- Verantwortlichkeiten definieren
-- Risiken adressieren
-"""
-        else:
-            prompt += """
-## ANFORDERUNG
-Erstelle einen Report mit folgenden Elementen:
-1. Executive Summary
-2. Situationsanalyse
-3. Kritische Projekte im Detail
-4. Fazit
-"""
+        return "".join(parts)
+    
+    def _format_project_row(self, index: int, project: Dict) -> str:
+        """Formatiert ein Projekt als nummerierte Tabellenzeile für den Prompt"""
+        return PROJECT_ROW_TEMPLATE.format_map(_project_fields(project, index))
+    
+    def _format_report(self, report_text: str) -> str:
+        """
+        Formatiert den generierten Report-Inhalt
+        
+        Das Ergebnis ist deterministisch (kein Zeitstempel), damit identische
+        Antworten auch identische Reports ergeben.
+        
+        Args:
+            report_text: Von GPT generierter Text (JSON-Objekt oder Markdown)
+            
+        Returns:
+            Report-Inhalt als Markdown
+        """
+        body = self._render_report_json(report_text)
+        if body is None:
+            # Fallback: Antwort ist kein gültiges JSON - Text unverändert übernehmen
+            body = report_text
+        
+        return body
+    
+    def _render_report_json(self, report_text: str) -> Optional[str]:
+        """
+        Rendert die JSON-Antwort des Models als Markdown
+        
+        Returns:
+            Report als Markdown oder None, wenn die Antwort kein gültiges JSON ist
+        """
+        try:
+            data = json.loads(report_text)
+        except (TypeError, ValueError):
+            return None
+        if not isinstance(data, dict):
+            return None
+        
+        parts = []
+        if data.get('executive_summary'):
+            parts.append(f"## Executive Summary\n\n{data['executive_summary']}\n")
+        
+        findings = data.get('findings') or []
+        if findings:
+            parts.append("## Wichtigste Erkenntnisse\n\n" + "".join(f"- {finding}\n" for finding in findings))
+        
+        if data.get('detail'):
+            parts.append(f"## Detailanalyse\n\n{data['detail']}\n")
+        
+        recommendations = data.get('recommendations') or []
+        if recommendations:
+            lines = []
+            for item in recommendations:
+                if isinstance(item, dict):
+                    lines.append(
+                        f"- **{item.get('project', '')}** [{item.get('priority', '')}]: {item.get('text', '')}\n"
+                    )
+                else:
+                    lines.append(f"- {item}\n")
+            parts.append("## Handlungsempfehlungen\n\n" + "".join(lines))
+        
+        if data.get('fazit'):
+            parts.append(f"## Fazit\n\n{data['fazit']}\n")
+        
+        return "\n".join(parts)
+    
+    async def _agenerate_report_text(
+        self,
+        client: AsyncOpenAI,
+        analysis_results: Dict[str, Any],
+        params: Dict[str, Any]
+    ) -> str:
+        """Async-Variante von _generate_report_text mit denselben Caches"""
+        call = self._begin_report_call(analysis_results, params)
+        if call.cached is not None:
+            return call.cached
         
-        return prompt
+        try:
+            vector = None
+            if call.semantic_scope is not None:
+                vector = await self._aembed(client, call.fingerprint)
+                report_text = _semantic_lookup(call.semantic_scope, vector)
+                if report_text is not None:
+                    return report_text
+            
+            report_text = await self._achat(client, call.messages, **self._report_chat_kwargs(call))
+            return self._finish_report_call(call, vector, report_text)
+            
+        except _get_openai().OpenAIError:
+            logger.exception("OpenAI API Aufruf für den Report fehlgeschlagen")
+            raise
     
-    def _format_report(self, report_text: str, params: Dict[str, Any]) -> str:
+    async def generate_report_async(
+        self,
+        analysis_results: Dict[str, Any],
+        df: Optional[pd.DataFrame] = None,
+        params: Optional[Dict[str, Any]] = None
+    ) -> str:
         """
-        Formatiert den generierten Report
+        Async-Variante von generate_report (ohne Streaming)
         
         Args:
-            report_text: Von GPT generierter Text
-            params: Report-Parameter
+            analysis_results: Dictionary mit Analyseergebnissen
+            df: Original DataFrame mit Projektdaten (wird nicht ausgewertet)
+            params: Report-Parameter (Typ, Sprache, etc.)
             
         Returns:
-            Formatierter Report
+            Report-Inhalt als Markdown-Text (ohne Header/Footer)
         """
-        # Füge Header hinzu
-        from datetime import datetime
+        params = params or {}
+        async with self._create_async_client() as client:
+            report_text = await self._agenerate_report_text(client, analysis_results, params)
+        return self._format_report(report_text)
+    
+    async def generate_report_bundle_async(
+        self,
+        analysis_results: Dict[str, Any],
+        df: Optional[pd.DataFrame] = None,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Tuple[str, List[str]]:
+        """
+        Generiert Report und Handlungsempfehlungen gleichzeitig
         
-        header = f"""# ControlBot Projektcontrolling Report
-**Erstellt am:** {datetime.now().strftime('%d.%m.%Y um %H:%M Uhr')}
-**Report-Typ:** {params.get('report_type', 'Standard')}
-**Sprache:** {params.get('language', 'Deutsch')}
-
----
-
-"""
+        Beide Anfragen sind unabhängig voneinander und laufen parallel, die
+        Wartezeit entspricht damit der längeren statt der Summe beider Aufrufe.
         
-        # Füge Footer hinzu
-        footer = """
-
----
-
-*Dieser Report wurde automatisch mit ControlBot AI generiert.*
-*Die Daten basieren auf den hochgeladenen Projektinformationen.*
-"""
+        Args:
+            analysis_results: Dictionary mit Analyseergebnissen
+            df: Original DataFrame mit Projektdaten (wird nicht ausgewertet)
+            params: Report-Parameter (Typ, Sprache, etc.)
+            
+        Returns:
+            Tuple aus Report-Inhalt (Markdown) und Handlungsempfehlungen. Ohne
+            params['include_recommendations'] bleibt die Liste leer.
+        """
+        params = params or {}
+        _validate_analysis_results(analysis_results)
+        
+        if not params.get('include_recommendations', True):
+            return await self.generate_report_async(analysis_results, params=params), []
+        
+        report, recommendations = await asyncio.gather(
+            self.generate_report_async(analysis_results, params=params),
+            self.generate_recommendations_async(analysis_results['top_risk_projects'])
+        )
+        return report, recommendations
+    
+    def _extract_executive_summary(self, report_text: str) -> str:
+        """Liest das Executive Summary aus der JSON- oder Markdown-Antwort"""
+        try:
+            data = json.loads(report_text)
+            if isinstance(data, dict):
+                return str(data.get('executive_summary', '')).strip()
+        except (TypeError, ValueError):
+            pass
         
-        return header + report_text + footer
+        match = EXECUTIVE_SUMMARY_PATTERN.search(report_text or '')
+        return match.group(1).strip() if match else ''
     
-    def generate_executive_summary(self, analysis_results: Dict[str, Any]) -> str:
+    def generate_executive_summary(
+        self,
+        analysis_results: Dict[str, Any],
+        params: Optional[Dict[str, Any]] = None
+    ) -> str:
         """
-        Generiert nur ein kurzes Executive Summary
+        Liefert nur das Executive Summary
+        
+        Liegt der Report mit denselben params bereits im Cache (siehe
+        generate_report_with_summary), wird dessen Summary ohne API-Aufruf
+        übernommen. Sonst genügt ein eigener, kurzer Aufruf - ein kompletter
+        Report wird dafür nicht erzeugt.
         
         Args:
             analysis_results: Dictionary mit Analyseergebnissen
+            params: Report-Parameter (Typ, Sprache, etc.)
             
         Returns:
             Executive Summary als Text
         """
-        summary = analysis_results['summary']
-        
-        prompt = f"""Erstelle ein kurzes Executive Summary (max. 3 Sätze) für folgende Projektportfolio-Situation:
-
-- {summary['total_projects']} Projekte im Portfolio
-- Gesamtbudget Plan: €{summary['total_cost_plan']:,.0f}
-- Gesamtkosten Ist: €{summary['total_cost_actual']:,.0f}
-- Abweichung: {summary['total_deviation_pct']:.1f}%
-- {summary['projects_critical']} kritische Projekte
-
-Das Summary sollte die wichtigste Botschaft vermitteln und zum Handeln auffordern, falls nötig.
-"""
+        params = params or {}
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "Du bist ein erfahrener Projektcontroller. Erstelle prägnante Executive Summaries."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
+            summary_text = self._cached_executive_summary(analysis_results, params)
+            if summary_text:
+                return summary_text
+            
+            messages = [
+                {
+                    "role": "system",
+                    "content": EXECUTIVE_SUMMARY_SYSTEM_PROMPT
+                },
+                {
+                    "role": "user",
+                    "content": EXECUTIVE_SUMMARY_TEMPLATE.format_map(analysis_results['summary'])
+                }
+            ]
+            return self._chat(
+                messages,
                 temperature=0.5,
-                max_tokens=200
+                max_tokens=EXECUTIVE_SUMMARY_MAX_TOKENS,
+                use_cache=not params.get('nocache', False)
             )
             
-            return response.choices[0].message.content
-            
         except Exception as e:
             return f"Executive Summary konnte nicht generiert werden: {str(e)}"
     
-    def generate_recommendations(self, risk_projects: List[Dict]) -> List[str]:
+    def _cached_executive_summary(self, analysis_results: Dict[str, Any], params: Dict[str, Any]) -> str:
+        """Executive Summary aus einem bereits gecachten Report (leer, wenn keiner vorliegt)"""
+        try:
+            call = self._begin_report_call(analysis_results, params)
+        except ValueError:
+            # Unvollständige Analyse: für einen Report nicht nutzbar, das Summary aber schon
+            return ''
+        return self._extract_executive_summary(call.cached) if call.cached is not None else ''
+    
+    def _create_async_client(self) -> AsyncOpenAI:
         """
-        Generiert spezifische Handlungsempfehlungen für Risiko-Projekte
+        Erstellt einen AsyncOpenAI Client mit begrenztem Connection Pool
+        
+        Der Client wird pro Event-Loop neu erstellt, da httpx-Verbindungen
+        an den Loop gebunden sind, in dem sie geöffnet wurden.
+        """
+        limits = httpx.Limits(
+            max_keepalive_connections=MAX_PARALLEL_REQUESTS,
+            max_connections=MAX_PARALLEL_REQUESTS
+        )
+        return _get_openai().AsyncOpenAI(
+            api_key=self.api_key,
+            max_retries=OPENAI_MAX_RETRIES,
+            timeout=HTTP_TIMEOUT,
+            http_client=httpx.AsyncClient(
+                timeout=HTTP_TIMEOUT,
+                transport=httpx.AsyncHTTPTransport(http2=HTTP2_AVAILABLE, limits=limits, retries=HTTP_RETRIES)
+            )
+        )
+    
+    def _build_recommendation_prompt(self, project: Dict) -> str:
+        """Baut den Prompt für die Handlungsempfehlung eines Projekts"""
+        return RECOMMENDATION_TEMPLATE.format_map(_project_fields(project))
+    
+    def _build_batch_recommendation_prompt(self, projects: List[Dict]) -> str:
+        """Baut einen gemeinsamen Prompt für die Empfehlungen aller Projekte"""
+        project_lines = PROJECT_TABLE_HEADER + "".join(
+            self._format_project_row(i, project)
+            for i, project in enumerate(projects, 1)
+        )
+        
+        return BATCH_RECOMMENDATION_TEMPLATE.format(project_lines=project_lines)
+    
+    def _parse_batch_recommendations(self, content: str, projects: List[Dict]) -> Optional[List[str]]:
+        """
+        Ordnet die JSON-Antwort des Batch-Prompts den Projekten zu
+        
+        Returns:
+            Liste mit Handlungsempfehlungen oder None, wenn die Antwort
+            nicht vollständig auswertbar ist
+        """
+        try:
+            items = json.loads(content)['recommendations']
+            by_idx = {int(item['idx']): item for item in items}
+            
+            recommendations = []
+            for i, project in enumerate(projects, 1):
+                item = by_idx[i]
+                recommendations.append(
+                    f"{project['projekt_name']}: [{str(item['priority']).upper()}] Empfehlung: {item['text']}"
+                )
+            return recommendations
+        except (TypeError, ValueError, KeyError):
+            return None
+    
+    async def _generate_recommendation(self, client: AsyncOpenAI, project: Dict) -> str:
+        """Fragt die Handlungsempfehlung für ein einzelnes Projekt ab"""
+        return await self._achat(
+            client,
+            messages=[
+                {
+                    "role": "system",
+                    "content": "Du bist ein erfahrener Projektmanagement-Berater."
+                },
+                {
+                    "role": "user",
+                    "content": self._build_recommendation_prompt(project)
+                }
+            ],
+            temperature=0.6,
+            max_tokens=150
+        )
+    
+    async def generate_recommendations_async(self, risk_projects: List[Dict]) -> List[str]:
+        """
+        Generiert Handlungsempfehlungen für alle Risiko-Projekte
+        
+        Alle Projekte werden in einem Request abgefragt. Ist die Antwort kein
+        gültiges JSON, werden die Empfehlungen einzeln und parallel abgefragt.
         
         Args:
             risk_projects: Liste der Risiko-Projekte
@@ -303,29 +1290,15 @@ Das Summary sollte die wichtigste Botschaft vermitteln und zum Handeln aufforder
         Returns:
             Liste mit Handlungsempfehlungen
         """
-        recommendations = []
+        projects = risk_projects[:5]  # Top 5 Risiken
+        if not projects:
+            return []
         
-        for project in risk_projects[:5]:  # Top 5 Risiken
-            prompt = f"""Gib eine konkrete, umsetzbare Handlungsempfehlung für folgendes Projekt:
-
-Projektname: {project['projekt_name']}
-Geplante Kosten: €{project['kosten_plan']:,.0f}
-Tatsächliche Kosten: €{project['kosten_ist']:,.0f}
-Abweichung: {project['kosten_abweichung_prozent']:.1f}%
-Status: {project['kosten_status']}
-
-Die Empfehlung sollte:
-- In 2-3 Sätzen formuliert sein
-- Konkrete Maßnahmen enthalten
-- Einen Zeitrahmen nennen
-- Priorität angeben (Hoch/Mittel/Niedrig)
-
-Format: "[PRIORITÄT] Empfehlung: ..."
-"""
-            
+        async with self._create_async_client() as client:
+            # Ein gemeinsamer Request für alle Projekte
             try:
-                response = self.client.chat.completions.create(
-                    model=self.model,
+                content = await self._achat(
+                    client,
                     messages=[
                         {
                             "role": "system",
@@ -333,17 +1306,172 @@ Format: "[PRIORITÄT] Empfehlung: ..."
                         },
                         {
                             "role": "user",
-                            "content": prompt
+                            "content": self._build_batch_recommendation_prompt(projects)
                         }
                     ],
                     temperature=0.6,
-                    max_tokens=150
+                    max_tokens=150 * len(projects),
+                    response_format={"type": "json_object"}
                 )
+                recommendations = self._parse_batch_recommendations(content, projects)
+            except Exception:
+                recommendations = None
+            
+            if recommendations is not None:
+                return recommendations
+            
+            # Fallback: ein Request pro Projekt, parallel ausgeführt
+            results = await asyncio.gather(
+                *(self._generate_recommendation(client, project) for project in projects),
+                return_exceptions=True
+            )
+        
+        recommendations = []
+        for project, result in zip(projects, results):
+            if isinstance(result, Exception):
+                recommendations.append(f"{project['projekt_name']}: Empfehlung konnte nicht generiert werden")
+            else:
+                recommendations.append(f"{project['projekt_name']}: {result}")
+        
+        return recommendations
+    
+    def generate_recommendations(self, risk_projects: List[Dict]) -> List[str]:
+        """
+        Generiert spezifische Handlungsempfehlungen für Risiko-Projekte
+        
+        Synchroner Wrapper um generate_recommendations_async. Aufrufer mit
+        bereits laufendem Event-Loop nutzen direkt die async-Variante.
+        
+        Args:
+            risk_projects: Liste der Risiko-Projekte
+            
+        Returns:
+            Liste mit Handlungsempfehlungen
+        """
+        return asyncio.run(self.generate_recommendations_async(risk_projects))
+    
+    def submit_batch(self, jobs: List[Dict[str, Any]]) -> str:
+        """
+        Reicht Chat-Completions als OpenAI Batch-Job ein (asynchron, ca. 50% günstiger)
+        
+        Für nicht-interaktive Läufe (z.B. nächtliche Reports), bei denen das
+        Ergebnis nicht sofort benötigt wird.
+        
+        Args:
+            jobs: Liste von Aufträgen mit 'id', 'messages' und optional
+                'temperature', 'max_tokens', 'response_format'
                 
-                recommendation = response.choices[0].message.content
-                recommendations.append(f"{project['projekt_name']}: {recommendation}")
-                
-            except Exception as e:
+        Returns:
+            ID des Batch-Jobs für poll_batch
+        """
+        lines = []
+        for job in jobs:
+            body = {
+                "model": self.model,
+                "messages": job['messages'],
+                "temperature": job.get('temperature', 0.7),
+                "max_tokens": job.get('max_tokens', REPORT_MAX_TOKENS)
+            }
+            if job.get('response_format'):
+                body["response_format"] = job['response_format']
+            lines.append(json.dumps({
+                "custom_id": str(job['id']),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": body
+            }))
+        
+        batch_file = self.client.files.create(
+            file=("controlbot_batch.jsonl", "\n".join(lines).encode('utf-8')),
+            purpose="batch"
+        )
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        return batch.id
+    
+    def poll_batch(self, batch_id: str) -> Optional[Dict[str, str]]:
+        """
+        Fragt den Status eines Batch-Jobs ab
+        
+        Args:
+            batch_id: ID aus submit_batch
+            
+        Returns:
+            Antworttexte nach 'id' des Auftrags oder None, solange der Job läuft.
+            Fehlgeschlagene Einzelaufträge fehlen im Ergebnis.
+        """
+        batch = self.client.batches.retrieve(batch_id)
+        if batch.status in ("failed", "expired", "cancelled"):
+            raise Exception(f"Batch-Job {batch_id} wurde nicht abgeschlossen (Status: {batch.status})")
+        if batch.status != "completed":
+            return None
+        
+        results = {}
+        if batch.output_file_id:
+            content = self.client.files.content(batch.output_file_id).text
+            for line in content.splitlines():
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                response = item.get('response') or {}
+                if response.get('status_code') == 200:
+                    results[item['custom_id']] = response['body']['choices'][0]['message']['content']
+        
+        return results
+    
+    def submit_recommendations_batch(self, risk_projects: List[Dict]) -> str:
+        """
+        Reicht die Handlungsempfehlungen der Top-5-Risiken als Batch-Job ein
+        
+        Args:
+            risk_projects: Liste der Risiko-Projekte
+            
+        Returns:
+            ID des Batch-Jobs für collect_recommendations_batch
+        """
+        jobs = [
+            {
+                'id': i,
+                'messages': [
+                    {
+                        "role": "system",
+                        "content": "Du bist ein erfahrener Projektmanagement-Berater."
+                    },
+                    {
+                        "role": "user",
+                        "content": self._build_recommendation_prompt(project)
+                    }
+                ],
+                'temperature': 0.6,
+                'max_tokens': 150
+            }
+            for i, project in enumerate(risk_projects[:5])
+        ]
+        return self.submit_batch(jobs)
+    
+    def collect_recommendations_batch(self, batch_id: str, risk_projects: List[Dict]) -> Optional[List[str]]:
+        """
+        Liest die Ergebnisse von submit_recommendations_batch aus
+        
+        Args:
+            batch_id: ID aus submit_recommendations_batch
+            risk_projects: Dieselbe Projektliste wie beim Einreichen
+            
+        Returns:
+            Liste mit Handlungsempfehlungen oder None, solange der Job läuft
+        """
+        results = self.poll_batch(batch_id)
+        if results is None:
+            return None
+        
+        recommendations = []
+        for i, project in enumerate(risk_projects[:5]):
+            if str(i) in results:
+                recommendations.append(f"{project['projekt_name']}: {results[str(i)]}")
+            else:
                 recommendations.append(f"{project['projekt_name']}: Empfehlung konnte nicht generiert werden")
         
         return recommendations
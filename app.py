@@ -6,14 +6,19 @@ Mit Smart Data Import und Multi-Source Intelligence
 import streamlit as st
 import pandas as pd
 from datetime import datetime
+import asyncio
+import hashlib
+import importlib.util
+import io
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
-# Imports - prüfe ob neue Module verfügbar sind
-try:
-    from smart_data_processor import SmartDataProcessor
-    SMART_FEATURES = True
-except ImportError:
-    SMART_FEATURES = False
+# Imports - prüfe ob neue Module verfügbar sind. smart_data_processor zieht
+# data_processor samt Numba-Kernels nach und wird erst bei der ersten Analyse
+# importiert; hier wird nur geprüft, ob das Modul vorhanden ist.
+SMART_FEATURES = importlib.util.find_spec('smart_data_processor') is not None
     
 try:
     from template_manager import TemplateManager
@@ -22,16 +27,34 @@ except ImportError:
     TEMPLATE_FEATURES = False
 
 try:
-    from multi_file_processor import MultiFileProcessor
+    from multi_file_processor import MONEY_COLUMNS, MultiFileProcessor, source_usecols, to_arrow_tables
     MULTIFILE_FEATURES = True
 except ImportError:
     MULTIFILE_FEATURES = False
 
-from data_processor import DataProcessor
-from ai_generator import AIReportGenerator
-from report_builder import ReportBuilder
-import plotly.express as px
-import plotly.graph_objects as go
+# Optionaler schneller CSV-Parser (multithreaded)
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Optionaler schneller Excel-Parser (Rust, pandas >= 2.2)
+try:
+    import python_calamine  # noqa: F401
+    CALAMINE_AVAILABLE = True
+except ImportError:
+    CALAMINE_AVAILABLE = False
+
+# Optionaler SIMD-beschleunigter Hash für die Cache-Keys der Uploads
+try:
+    import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+# plotly, openai (ai_generator), python-docx und der Smart Import werden erst
+# in den Seiten importiert, die sie brauchen - das verkürzt den Kaltstart der App
 
 st.set_page_config(
     page_title="ControlBot",
@@ -39,6 +62,227 @@ st.set_page_config(
     layout="wide"
 )
 
+# Ab dieser Dateigröße liest der Standard-Parser die CSV in Blöcken
+CSV_CHUNK_THRESHOLD = 50 * 1024 * 1024
+CSV_CHUNK_ROWS = 200_000
+
+def _file_digest(file_bytes: bytes) -> str:
+    """Schneller Hash des Dateiinhalts als Cache-Key (BLAKE3, sonst BLAKE2b)"""
+    if BLAKE3_AVAILABLE:
+        return blake3.blake3(file_bytes).hexdigest()
+    return hashlib.blake2b(file_bytes, digest_size=16).hexdigest()
+
+@st.cache_data(show_spinner=False)
+def _load_df(file_key: str, _file_bytes: bytes, name: str, usecols: tuple = None) -> pd.DataFrame:
+    """
+    Liest eine hochgeladene CSV- oder Excel-Datei
+    
+    Gecacht über file_key (Hash des Dateiinhalts, siehe _file_digest) - bei
+    Reruns (jede Widget-Interaktion) wird die Datei nicht erneut geparst.
+    Die Bytes selbst hasht Streamlit wegen des Unterstrichs (_file_bytes) nicht.
+    Mit usecols werden nur diese Spalten eingelesen, alle übrigen überspringt
+    der Parser.
+    """
+    cols = list(usecols) if usecols else None
+    if name.endswith('.csv'):
+        if PYARROW_AVAILABLE:
+            try:
+                return pd.read_csv(io.BytesIO(_file_bytes), engine="pyarrow", usecols=cols)
+            except Exception:
+                pass  # z.B. uneinheitliche Zeilen - Standard-Parser ist toleranter
+        if len(_file_bytes) > CSV_CHUNK_THRESHOLD:
+            # Große Dateien stückweise parsen, begrenzt den Spitzenspeicher des Tokenizers
+            chunks = pd.read_csv(io.BytesIO(_file_bytes), usecols=cols, chunksize=CSV_CHUNK_ROWS)
+            return pd.concat(chunks, ignore_index=True)
+        return pd.read_csv(io.BytesIO(_file_bytes), usecols=cols)
+    if name.endswith('.xlsb'):
+        return pd.read_excel(io.BytesIO(_file_bytes), engine="pyxlsb", usecols=cols)
+    if CALAMINE_AVAILABLE:
+        try:
+            return pd.read_excel(io.BytesIO(_file_bytes), engine="calamine", usecols=cols)
+        except (ImportError, ValueError):
+            pass  # z.B. pandas < 2.2 ohne calamine-Engine
+    if name.endswith('.xlsx'):
+        return _read_xlsx(_file_bytes, cols)
+    return pd.read_excel(io.BytesIO(_file_bytes), usecols=cols)
+
+@st.cache_data(show_spinner=False)
+def _read_header(file_key: str, _file_bytes: bytes, name: str) -> list:
+    """Liest nur die Spaltennamen einer hochgeladenen Datei (keine Datenzeilen)"""
+    if name.endswith('.csv'):
+        return list(pd.read_csv(io.BytesIO(_file_bytes), nrows=0).columns)
+    if CALAMINE_AVAILABLE:
+        try:
+            return list(pd.read_excel(io.BytesIO(_file_bytes), engine="calamine", nrows=0).columns)
+        except (ImportError, ValueError):
+            pass  # z.B. pandas < 2.2 ohne calamine-Engine
+    if name.endswith('.xlsx'):
+        import openpyxl
+        
+        wb = openpyxl.load_workbook(io.BytesIO(_file_bytes), read_only=True, data_only=True)
+        try:
+            return list(next(wb.active.values, ()))
+        finally:
+            wb.close()
+    return list(pd.read_excel(io.BytesIO(_file_bytes), nrows=0).columns)
+
+def _read_xlsx(file_bytes: bytes, usecols: list = None) -> pd.DataFrame:
+    """
+    Liest das erste Tabellenblatt einer .xlsx-Datei im read_only-Modus
+    
+    Styles und Formeln werden nicht geladen, die Zeilen werden gestreamt.
+    """
+    import openpyxl
+    
+    wb = openpyxl.load_workbook(io.BytesIO(file_bytes), read_only=True, data_only=True)
+    try:
+        rows = wb.active.values
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame()
+        if usecols:
+            keep = [i for i, col in enumerate(header) if col in usecols]
+            header = [header[i] for i in keep]
+            rows = ([row[i] for i in keep] for row in rows)
+        df = pd.DataFrame(list(rows), columns=list(header))
+    finally:
+        wb.close()
+    
+    # Leere Zeilen am Blattende (formatierte, aber leere Zellen) entfernen
+    return df.dropna(how='all').reset_index(drop=True)
+
+@st.cache_data(show_spinner=False)
+def _example_csv() -> bytes:
+    """Beispieldatei für den Upload (konstant, wird nur einmal erzeugt)"""
+    example_data = pd.DataFrame({
+        'Projekt': ['ERP Einführung', 'Website Relaunch', 'CRM Migration', 'Data Warehouse', 'Mobile App'],
+        'Kosten Plan': [250000, 80000, 120000, 300000, 95000],
+        'Kosten Ist': [290000, 76000, 131000, 305000, 118000],
+        'Verantwortlich': ['M. Weber', 'S. Klein', 'T. Braun', 'A. Wolf', 'J. Neumann']
+    })
+    return example_data.to_csv(index=False).encode('utf-8')
+
+@st.cache_data(show_spinner=False)
+def _detect_column_mapping(file_key: str, _file_bytes: bytes, name: str) -> dict:
+    """
+    Spaltenerkennung des Smart Imports, gecacht über den Dateiinhalt
+    
+    Die Erkennung braucht nur die Spaltennamen, daher wird nur der Header gelesen.
+    """
+    from smart_data_processor import SmartDataProcessor
+    
+    columns = _read_header(file_key, _file_bytes, name)
+    return SmartDataProcessor().detect_column_mapping(pd.DataFrame(columns=columns))
+
+def _mapped_columns(mapping: dict) -> tuple:
+    """Tatsächliche Spaltennamen eines Mappings (ohne Duplikate, None ohne Mapping)"""
+    return tuple(dict.fromkeys(mapping.values())) if mapping else None
+
+@st.cache_data(show_spinner=False)
+def _smart_analyze(file_key: str, _file_bytes: bytes, name: str) -> dict:
+    """
+    Bereinigung und Projektanalyse des Smart Imports, gecacht über den Dateiinhalt
+    
+    Erneutes Analysieren derselben Datei liefert das Ergebnis ohne
+    validate_and_clean/analyze_projects erneut zu durchlaufen.
+    """
+    from smart_data_processor import SmartDataProcessor
+    
+    processor = SmartDataProcessor()
+    mapping = _detect_column_mapping(file_key, _file_bytes, name)
+    df_clean, _ = processor.validate_and_clean(
+        _load_df(file_key, _file_bytes, name, _mapped_columns(mapping)), mapping
+    )
+    analysis = processor.analyze_projects(df_clean)
+    
+    # Kennzahlen sind in float64 berechnet; das Projekt-DataFrame landet in
+    # session_state und wird dafür auf float32/kleine Integer verkleinert.
+    # Eurobeträge bleiben float64, der Word-Report druckt sie auf den Euro genau.
+    analysis['detailed_projects_df'] = compact_dataframe(
+        analysis['detailed_projects_df'], keep=PROJECT_MONEY_COLUMNS
+    )
+    return analysis
+
+@st.cache_data(show_spinner=False)
+def _integrate_files(file_keys: tuple, _dataframes: dict) -> dict:
+    """
+    Multi-Source Integration, gecacht über Namen und Hashes der Dateien
+    
+    Dieselben Dateien erneut zu integrieren überspringt load_files; das
+    Ergebnis ist bereits für session_state verkleinert und hält die
+    Quelldaten als Arrow-Tabellen.
+    """
+    return to_arrow_tables(compact_integrated_data(MultiFileProcessor().load_files(_dataframes)))
+
+def _session_upload(uploaded_file) -> dict:
+    """
+    Liefert Cache-Key, Mapping, Zeilenzahl und Vorschau einer hochgeladenen Datei
+    
+    Pro Session wird je file_id nur einmal gelesen und gehasht. In
+    session_state liegen nur diese kleinen Angaben; das DataFrame selbst
+    bleibt einmalig im cache_data-Eintrag von _load_df (über den Key).
+    """
+    upload = st.session_state.get('_upload')
+    if upload is None or upload['file_id'] != uploaded_file.file_id:
+        file_bytes = uploaded_file.getvalue()
+        file_key = _file_digest(file_bytes)
+        mapping = (
+            _detect_column_mapping(file_key, file_bytes, uploaded_file.name) if SMART_FEATURES else None
+        )
+        # Mit erkanntem Mapping nur die benötigten Spalten parsen
+        df = _load_df(file_key, file_bytes, uploaded_file.name, _mapped_columns(mapping))
+        upload = {
+            'file_id': uploaded_file.file_id,
+            'key': file_key,
+            'mapping': mapping,
+            'rows': len(df),
+            'preview': df.iloc[:10]
+        }
+        st.session_state._upload = upload
+    return upload
+
+# Betragsspalten des analysierten Projekt-DataFrames (float32 ist ab ~16,7 Mio. € ungenau)
+PROJECT_MONEY_COLUMNS = frozenset({
+    'kosten_plan', 'kosten_ist', 'kosten_forecast', 'kosten_abweichung_absolut'
+})
+
+def compact_dataframe(df: pd.DataFrame, keep: frozenset = frozenset()) -> pd.DataFrame:
+    """
+    Verkleinert ein DataFrame für die Ablage in session_state
+    
+    Ganzzahlen werden verlustfrei auf den kleinsten Integer-Typ, Kommazahlen
+    auf float32 reduziert, Textspalten mit vielen Wiederholungen werden
+    kategorisch. Kennzahlen sind zu diesem Zeitpunkt bereits berechnet.
+    Spalten in keep bleiben unverändert.
+    """
+    df = df.copy(deep=False)
+    for col in df.columns:
+        if col in keep:
+            continue
+        series = df[col]
+        if pd.api.types.is_bool_dtype(series):
+            continue
+        if pd.api.types.is_integer_dtype(series):
+            df[col] = pd.to_numeric(series, downcast='integer')
+        elif pd.api.types.is_float_dtype(series):
+            df[col] = pd.to_numeric(series, downcast='float')
+        elif pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+            if len(series) > 0 and series.nunique() <= len(series) // 2:
+                df[col] = series.astype('category')
+    return df
+
+def compact_integrated_data(integrated: dict) -> dict:
+    """
+    Verkleinert die DataFrames der Multi-Source Integration (Schlüssel 'data')
+    
+    Betragsspalten (MONEY_COLUMNS) bleiben wie bei der Integration float64,
+    da das Dashboard über sie summiert.
+    """
+    for source in integrated.values():
+        if isinstance(source, dict) and isinstance(source.get('data'), pd.DataFrame):
+            source['data'] = compact_dataframe(source['data'], keep=MONEY_COLUMNS)
+    return integrated
+
 def init_session_state():
     if 'data_loaded' not in st.session_state:
         st.session_state.data_loaded = False
@@ -48,13 +292,76 @@ def init_session_state():
         st.session_state.integrated_data = None
     if 'analysis_results' not in st.session_state:
         st.session_state.analysis_results = None
+    if 'dashboard_cache' not in st.session_state:
+        st.session_state.dashboard_cache = None
+    if 'report_text' not in st.session_state:
+        st.session_state.report_text = None
+    if 'report_recommendations' not in st.session_state:
+        st.session_state.report_recommendations = []
+    if 'report_docx' not in st.session_state:
+        st.session_state.report_docx = None
+
+def build_dashboard_cache(data: dict) -> dict:
+    """
+    Erstellt die Dashboard-Charts der Multi-Source Daten
+    
+    Wird einmal nach der Integration berechnet und in session_state
+    abgelegt, damit Reruns (jede Widget-Interaktion) nur noch rendern.
+    Finanzen und Arbeitspakete liegen als Subplots in einer Figur, damit
+    pro Rerun nur ein Chart serialisiert und übertragen wird.
+    """
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+    
+    summary = data['summary']
+    has_ap = bool(data['arbeitspakete'])
+    
+    if has_ap:
+        overview_fig = make_subplots(
+            rows=1, cols=2,
+            specs=[[{'type': 'xy'}, {'type': 'domain'}]],
+            subplot_titles=('💰 Finanzen', '📦 Arbeitspakete')
+        )
+    else:
+        overview_fig = make_subplots(rows=1, cols=1, subplot_titles=('💰 Finanzen',))
+    
+    overview_fig.add_trace(go.Bar(name='Budget', x=[''], y=[summary['total_budget']], marker_color='lightblue'), row=1, col=1)
+    overview_fig.add_trace(go.Bar(name='Ist', x=[''], y=[summary['total_ist']], marker_color='orange'), row=1, col=1)
+    overview_fig.add_trace(go.Bar(name='Forecast', x=[''], y=[summary['total_forecast']], marker_color='lightgreen'), row=1, col=1)
+    
+    if has_ap:
+        ap = data['arbeitspakete']['summary']
+        # go.Pie direkt statt px.pie - spart Plotly Express' DataFrame-Aufbereitung
+        overview_fig.add_trace(go.Pie(
+            labels=['Fertig', 'In Arbeit', 'Nicht gestartet'],
+            values=[ap['completed'], ap['in_progress'], ap['not_started']],
+            marker=dict(colors=['green', 'orange', 'gray']),
+            showlegend=False
+        ), row=1, col=2)
+    
+    overview_fig.update_layout(barmode='group', height=300, showlegend=True, uirevision='dash')
+    
+    return {'overview_fig': overview_fig}
+
+# Seitenkopf hängt nur von den verfügbaren Modulen ab - einmal beim Import gebaut
+_VERSION = "v1.2 Multi-Source" if MULTIFILE_FEATURES else "v1.1"
+_HEADER_HTML = (
+    f'<h1 style="text-align: center; color: #1f77b4;">📊 ControlBot {_VERSION}</h1>\n'
+    '<p style="text-align: center; color: #666;">Ihr intelligenter Assistent für Projektcontrolling</p>'
+)
+
+@st.cache_resource(show_spinner=False)
+def _load_secret_api_key():
+    """API Key aus st.secrets (einmal pro Prozess gelesen, None ohne secrets.toml)"""
+    try:
+        return st.secrets.get("OPENAI_API_KEY")
+    except (FileNotFoundError, KeyError):
+        return None
 
 def main():
     init_session_state()
     
-    version = "v1.2 Multi-Source" if MULTIFILE_FEATURES else "v1.1"
-    st.markdown(f'<h1 style="text-align: center; color: #1f77b4;">📊 ControlBot {version}</h1>', unsafe_allow_html=True)
-    st.markdown('<p style="text-align: center; color: #666;">Ihr intelligenter Assistent für Projektcontrolling</p>', unsafe_allow_html=True)
+    st.markdown(_HEADER_HTML, unsafe_allow_html=True)
     
     with st.sidebar:
         st.markdown("---")
@@ -70,11 +377,7 @@ def main():
         st.markdown("---")
         st.markdown("### ⚙️ Einstellungen")
         
-        api_key = None
-        try:
-            api_key = st.secrets.get("OPENAI_API_KEY")
-        except:
-            pass
+        api_key = _load_secret_api_key()
         
         if api_key:
             os.environ['OPENAI_API_KEY'] = api_key
@@ -85,6 +388,8 @@ def main():
                 os.environ['OPENAI_API_KEY'] = user_key
                 st.success("✅ Key gespeichert")
         
+        st.checkbox("🎈 Animation nach der Analyse", key='celebrate')
+        
         st.markdown("---")
         st.markdown("### ✨ Features")
         if SMART_FEATURES:
@@ -111,37 +416,47 @@ def show_upload_page():
     if SMART_FEATURES:
         st.info("🚀 Smart Import aktiviert: Automatische Erkennung von 20+ Formaten!")
     
-    uploaded_file = st.file_uploader("Excel oder CSV", type=['csv', 'xlsx', 'xls'])
+    # .xls (BIFF) nur mit calamine - der xlrd-Pfad ist um ein Vielfaches langsamer
+    file_types = ['csv', 'xlsx', 'xlsb'] + (['xls'] if CALAMINE_AVAILABLE else [])
+    uploaded_file = st.file_uploader("Excel oder CSV", type=file_types)
+    if not CALAMINE_AVAILABLE:
+        st.caption("Alte .xls-Dateien bitte vorher als .xlsx speichern.")
+    
+    if not uploaded_file:
+        st.download_button(
+            "📋 Beispieldaten herunterladen",
+            data=_example_csv(),
+            file_name="controlbot_beispiel.csv",
+            mime="text/csv"
+        )
     
     if uploaded_file:
         try:
-            if uploaded_file.name.endswith('.csv'):
-                df = pd.read_csv(uploaded_file)
-            else:
-                df = pd.read_excel(uploaded_file)
+            upload = _session_upload(uploaded_file)
             
-            st.success(f"✅ {uploaded_file.name} geladen: {len(df)} Zeilen")
+            st.success(f"✅ {uploaded_file.name} geladen: {upload['rows']} Zeilen")
             
             if SMART_FEATURES:
-                processor = SmartDataProcessor()
-                mapping = processor.detect_column_mapping(df)
+                mapping = upload['mapping']
                 
                 if mapping:
                     st.success(f"✅ {len(mapping)} Spalten erkannt!")
                     
                     if st.button("🚀 Analysieren", type="primary"):
                         with st.spinner("Verarbeite..."):
-                            df_clean, validation = processor.validate_and_clean(df, mapping)
-                            analysis = processor.analyze_projects(df_clean)
+                            analysis = _smart_analyze(
+                                upload['key'], uploaded_file.getvalue(), uploaded_file.name
+                            )
                             
                             st.session_state.analysis_results = analysis
                             st.session_state.data_loaded = True
                             
                             st.success("✅ Analyse fertig!")
-                            st.balloons()
+                            if st.session_state.get('celebrate', False):
+                                st.balloons()
             
             with st.expander("👁️ Vorschau"):
-                st.dataframe(df.head(10))
+                st.dataframe(upload['preview'], use_container_width=True)
                 
         except Exception as e:
             st.error(f"❌ Fehler: {str(e)}")
@@ -202,20 +517,34 @@ def show_multifile_upload():
     if ready and st.button("🚀 Integrieren", type="primary"):
         with st.spinner("Verarbeite..."):
             try:
-                dfs = {}
-                for key, file in uploaded_files.items():
-                    if file.name.endswith('.csv'):
-                        df = pd.read_csv(file)
-                    else:
-                        df = pd.read_excel(file)
-                    dfs[file.name] = df
-                    st.success(f"✅ {file.name}: {len(df)} Zeilen")
+                # Bytes einmal im Haupt-Thread kopieren, dann parallel parsen
+                files = [(file.name, file.getvalue()) for file in uploaded_files.values()]
+                file_keys = [(name, _file_digest(file_bytes)) for name, file_bytes in files]
+                # Nur die Spalten parsen, die der erkannte Dateityp nutzt
+                usecols = [
+                    source_usecols(_read_header(file_key, file_bytes, name))
+                    for (name, file_bytes), (_, file_key) in zip(files, file_keys)
+                ]
+                
+                ctx = get_script_run_ctx()
+                with ThreadPoolExecutor(
+                    max_workers=len(files),
+                    initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx)
+                ) as executor:
+                    futures = [
+                        executor.submit(_load_df, file_key, file_bytes, name, tuple(cols) if cols else None)
+                        for (name, file_bytes), (_, file_key), cols in zip(files, file_keys, usecols)
+                    ]
+                    dfs = {name: future.result() for (name, _), future in zip(files, futures)}
                 
-                processor = MultiFileProcessor()
-                integrated = processor.load_files(dfs)
+                for name, df in dfs.items():
+                    st.success(f"✅ {name}: {len(df)} Zeilen")
+                
+                integrated = _integrate_files(tuple(file_keys), dfs)
                 
                 st.session_state.integrated_data = integrated
                 st.session_state.multifile_loaded = True
+                st.session_state.dashboard_cache = build_dashboard_cache(integrated)
                 
                 st.success("🎉 Integration erfolgreich!")
                 
@@ -233,7 +562,8 @@ def show_multifile_upload():
                              delta=f"{summary['deviation_pct']:+.1f}%")
                 
                 st.info("👉 Gehen Sie zum Dashboard!")
-                st.balloons()
+                if st.session_state.get('celebrate', False):
+                    st.balloons()
                 
             except Exception as e:
                 st.error(f"❌ Fehler: {str(e)}")
@@ -245,6 +575,10 @@ def show_dashboard():
         data = st.session_state.integrated_data
         summary = data['summary']
         
+        if st.session_state.dashboard_cache is None:
+            st.session_state.dashboard_cache = build_dashboard_cache(data)
+        charts = st.session_state.dashboard_cache
+        
         st.markdown("### 📈 Multi-Source Projekt-Übersicht")
         
         col1, col2, col3, col4, col5 = st.columns(5)
@@ -253,8 +587,7 @@ def show_dashboard():
         with col2:
             st.metric("Budget", f"€{summary['total_budget']:,.0f}")
         with col3:
-            pct = summary['total_ist']/summary['total_budget']*100 if summary['total_budget'] > 0 else 0
-            st.metric("Ist-Kosten", f"€{summary['total_ist']:,.0f}", delta=f"{pct:.0f}%")
+            st.metric("Ist-Kosten", f"€{summary['total_ist']:,.0f}", delta=f"{summary['ist_pct']:.0f}%")
         with col4:
             st.metric("Prognose", f"€{summary['projected_total']:,.0f}", 
                      delta=f"{summary['deviation_pct']:+.1f}%", delta_color="inverse")
@@ -264,31 +597,12 @@ def show_dashboard():
         
         st.markdown("---")
         
-        col1, col2, col3 = st.columns(3)
+        col1, col2 = st.columns([2, 1])
         
         with col1:
-            st.markdown("### 💰 Finanzen")
-            fig = go.Figure()
-            fig.add_trace(go.Bar(name='Budget', x=[''], y=[summary['total_budget']], marker_color='lightblue'))
-            fig.add_trace(go.Bar(name='Ist', x=[''], y=[summary['total_ist']], marker_color='orange'))
-            fig.add_trace(go.Bar(name='Forecast', x=[''], y=[summary['total_forecast']], marker_color='lightgreen'))
-            fig.update_layout(barmode='group', height=300, showlegend=True)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(charts['overview_fig'], use_container_width=True)
         
         with col2:
-            st.markdown("### 📦 Arbeitspakete")
-            if data['arbeitspakete']:
-                ap = data['arbeitspakete']['summary']
-                pie_data = {
-                    'Status': ['Fertig', 'In Arbeit', 'Nicht gestartet'],
-                    'Anzahl': [ap['completed'], ap['in_progress'], ap['not_started']]
-                }
-                fig = px.pie(pie_data, values='Anzahl', names='Status',
-                           color_discrete_map={'Fertig':'green','In Arbeit':'orange','Nicht gestartet':'gray'})
-                fig.update_layout(height=300)
-                st.plotly_chart(fig, use_container_width=True)
-        
-        with col3:
             st.markdown("### 👥 Ressourcen")
             if data['ressourcen_monatlich']:
                 res = data['ressourcen_monatlich']['summary']
@@ -324,10 +638,89 @@ def show_report_page():
         st.error("❌ API Key fehlt!")
         return
     
+    analysis = st.session_state.analysis_results
+    if not analysis or not analysis.get('top_risk_projects'):
+        st.info("ℹ️ KI-Reports basieren auf der Projektanalyse aus dem Daten Upload (Einzelne Datei).")
+        return
+    
     st.info("🤖 GPT-4 Report-Generierung")
     
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        report_type = st.selectbox("Report-Typ", ["Management Summary", "Detailreport", "Risikobericht"])
+    with col2:
+        language = st.selectbox("Sprache", ["Deutsch", "English"])
+    with col3:
+        detail_level = st.selectbox("Detailgrad", ["Kurz", "Mittel", "Ausführlich"], index=1)
+    
+    include_recommendations = st.checkbox("Handlungsempfehlungen für Risiko-Projekte", value=True)
+    context = st.text_area("Zusätzlicher Kontext (optional)")
+    
     if st.button("🚀 Report generieren"):
-        st.info("Report-Generierung in Entwicklung...")
+        params = {
+            'report_type': report_type,
+            'language': language,
+            'detail_level': detail_level,
+            'include_recommendations': include_recommendations,
+            'context': context
+        }
+        
+        # Alten Report verwerfen, damit ein Fehler keinen veralteten Stand hinterlässt
+        st.session_state.report_text = None
+        st.session_state.report_recommendations = []
+        st.session_state.report_docx = None
+        
+        with st.spinner("Report wird erstellt... Dies kann 30-60 Sekunden dauern"):
+            try:
+                from ai_generator import AIReportGenerator, render_report
+                
+                # Report und Handlungsempfehlungen werden parallel abgefragt
+                with AIReportGenerator() as generator:
+                    report, recommendations = asyncio.run(
+                        generator.generate_report_bundle_async(analysis, params=params)
+                    )
+                
+                st.session_state.report_text = render_report(report, params)
+                st.session_state.report_recommendations = recommendations
+                
+            except Exception as e:
+                st.error(f"❌ Fehler: {str(e)}")
+            
+            if st.session_state.report_text:
+                try:
+                    from report_builder import ReportBuilder
+                    
+                    # Word-Datei direkt im Speicher erzeugen, ohne Umweg über die Festplatte
+                    st.session_state.report_docx = ReportBuilder().create_word_report_bytes(
+                        st.session_state.report_text,
+                        analysis['detailed_projects_df'],
+                        include_charts=True
+                    )
+                except Exception as e:
+                    st.warning(f"⚠️ Word-Export nicht möglich: {str(e)}")
+    
+    if st.session_state.report_text:
+        st.markdown("---")
+        st.markdown(st.session_state.report_text)
+        
+        if st.session_state.report_recommendations:
+            st.markdown("### 💡 Handlungsempfehlungen")
+            st.markdown("\n".join(f"- {r}" for r in st.session_state.report_recommendations))
+        
+        st.download_button(
+            "📥 Report herunterladen (Markdown)",
+            data=st.session_state.report_text.encode('utf-8'),
+            file_name=f"controlbot_report_{datetime.now().strftime('%Y%m%d_%H%M')}.md",
+            mime="text/markdown"
+        )
+        
+        if st.session_state.report_docx:
+            st.download_button(
+                "📄 Report herunterladen (Word)",
+                data=st.session_state.report_docx,
+                file_name=f"controlbot_report_{datetime.now().strftime('%Y%m%d_%H%M')}.docx",
+                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+            )
 
 def show_help_page():
     st.header("ℹ️ Anleitung")
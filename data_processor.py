@@ -6,7 +6,229 @@ Verarbeitet und analysiert Projektdaten
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
+
+# Optional: Numba für die Kennzahlen-Berechnung
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Optional: xlsxwriter für den speicherschonenden Excel-Export
+try:
+    import xlsxwriter
+    XLSXWRITER_AVAILABLE = True
+except ImportError:
+    XLSXWRITER_AVAILABLE = False
+
+# Zeilen pro Block beim zeilenweisen Excel-Export
+EXPORT_CHUNK_ROWS = 10_000
+
+def top_k_positions(values: np.ndarray, k: int, largest: bool = True) -> np.ndarray:
+    """
+    Positionen der k größten (bzw. kleinsten) Werte, sortiert wie nlargest/nsmallest
+    
+    Bestimmt den k-ten Wert per np.partition in O(N) und sortiert nur die k
+    Treffer. Bei Gleichstand - auch an der Grenze zum k-ten Platz - gewinnt
+    die frühere Zeile (wie keep='first'). NaN-Werte kommen wie bei pandas nur
+    ans Ende, wenn es weniger als k gültige Werte gibt.
+    
+    Args:
+        values: float-Array
+        k: Anzahl der gewünschten Positionen
+        largest: True für die größten, False für die kleinsten Werte
+        
+    Returns:
+        Integer-Array mit bis zu k Zeilenpositionen
+    """
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    
+    missing = np.isnan(values)
+    positions = np.flatnonzero(~missing)
+    keys = -values if largest else values
+    if positions.size < k:
+        ordered = positions[np.argsort(keys[positions], kind='stable')]
+        return np.concatenate((ordered, np.flatnonzero(missing)[:k - positions.size]))
+    if positions.size > k:
+        candidates = keys[positions]
+        kth = np.partition(candidates, k - 1)[k - 1]
+        # Alle Werte echt vor dem k-ten, dann die frühesten Zeilen mit genau
+        # dem k-ten Wert (argpartition wählt unter Gleichständen beliebig)
+        inside = candidates < kth
+        need = k - np.count_nonzero(inside)
+        boundary = np.flatnonzero(candidates == kth)[:need]
+        inside[boundary] = True
+        positions = positions[inside]
+    return positions[np.argsort(keys[positions], kind='stable')]
+
+def frame_records(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Zeilen eines (kleinen) DataFrames als Liste von Dictionaries
+    
+    Schneller als to_dict('records') und liefert native Python-Zahlen statt
+    numpy-Skalaren. Spaltennamen werden unverändert übernommen, auch wenn sie
+    keine gültigen Python-Bezeichner sind.
+    """
+    columns = list(frame.columns)
+    return [dict(zip(columns, row)) for row in frame.itertuples(index=False, name=None)]
+
+def _sheet_rows(frame: pd.DataFrame, chunk_rows: int = EXPORT_CHUNK_ROWS, inf_rep=None):
+    """
+    Liefert Kopfzeile und Datenzeilen eines DataFrames als Listen für den Excel-Export
+    
+    Die Zeilen werden blockweise in Python-Objekte umgewandelt, damit nie
+    das ganze DataFrame gleichzeitig als Listen im Speicher liegt. NaN wird
+    zu einer leeren Zelle, ±inf optional zu inf_rep (wie bei to_excel).
+    """
+    yield [str(col) for col in frame.columns]
+    for start in range(0, len(frame), chunk_rows):
+        chunk = frame.iloc[start:start + chunk_rows].astype(object)
+        chunk = chunk.where(chunk.notna(), None)
+        if inf_rep is not None:
+            chunk = chunk.replace([np.inf, -np.inf], [inf_rep, '-' + inf_rep])
+        yield from chunk.to_numpy().tolist()
+
+def _read_excel(source, **kwargs) -> pd.DataFrame:
+    """Liest Excel mit der calamine-Engine (Rust), Fallback auf die pandas-Standardengine"""
+    try:
+        return pd.read_excel(source, engine='calamine', **kwargs)
+    except (ImportError, ValueError):
+        # python-calamine fehlt oder pandas < 2.2 kennt die Engine nicht
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        return pd.read_excel(source, **kwargs)
+
+def _read_csv(source, usecols=None) -> pd.DataFrame:
+    """
+    Liest CSV mit dem multithreaded pyarrow-Parser, Fallback auf die C-Engine
+    
+    Args:
+        source: Pfad oder Dateiobjekt
+        usecols: Spaltenliste oder Callable (Callables versteht nur die C-Engine)
+    """
+    if not callable(usecols):
+        try:
+            return pd.read_csv(source, engine='pyarrow', usecols=usecols)
+        except (ImportError, ValueError):
+            # pyarrow fehlt oder die Datei ist für pyarrow zu unregelmäßig
+            if hasattr(source, 'seek'):
+                source.seek(0)
+    return pd.read_csv(source, usecols=usecols)
+
+# Spalten, die Validierung und Analyse mindestens benötigen
+REQUIRED_COLUMNS = ('projekt_name', 'kosten_plan', 'kosten_ist')
+
+# Obergrenzen (inklusive) der Abweichung in % je Status, aufsteigend
+STATUS_THRESHOLDS = np.array([-5.0, 5.0, 10.0])
+STATUS_CATEGORIES = ['Unter Plan', 'Im Plan', 'Warnung', 'Kritisch']
+
+
+def _analyze_numpy(plan: np.ndarray, actual: np.ndarray) -> Tuple:
+    """
+    Berechnet Abweichungen, Status-Codes und Summary-Kennzahlen vektorisiert
+    (Fallback ohne Numba)
+    
+    Args:
+        plan: Plan-Kosten als float64-Array
+        actual: Ist-Kosten als float64-Array
+        
+    Returns:
+        Tupel (Abweichung absolut, Abweichung in %, Status-Codes, über Budget,
+        kritisch, Warnung, im Plan, Summe Plan, Summe Ist, Max/Min Abweichung
+        in %, Summe Abweichung in %)
+    """
+    diff = actual - plan
+    
+    # 0/0 und NaN -> 0, x/0 -> ±inf
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pct = diff / plan * 100.0
+    pct[np.isnan(pct)] = 0.0
+    
+    # <= -5 Unter Plan, <= 5 Im Plan, <= 10 Warnung, darüber Kritisch
+    codes = np.searchsorted(STATUS_THRESHOLDS, pct, side='left').astype(np.int8)
+    
+    if pct.size == 0:
+        return diff, pct, codes, 0, 0, 0, 0, 0.0, 0.0, np.nan, np.nan, 0.0
+    
+    return (
+        diff,
+        pct,
+        codes,
+        int(np.count_nonzero(pct > 0)),
+        int(np.count_nonzero(codes == 3)),
+        int(np.count_nonzero(codes == 2)),
+        int(np.count_nonzero(codes == 1)),
+        plan.sum(),
+        actual.sum(),
+        pct.max(),
+        pct.min(),
+        pct.sum()
+    )
+
+
+if NUMBA_AVAILABLE:
+    # Kein fastmath: ±inf bei Plan 0 und die NaN-Behandlung müssen erhalten bleiben
+    @njit(parallel=True, cache=True, error_model='numpy')
+    def _analyze_kernel(plan: np.ndarray, actual: np.ndarray) -> Tuple:
+        """Kompilierte Variante von _analyze_numpy in einem parallelen Durchlauf"""
+        n = plan.size
+        diff = np.empty(n)
+        pct = np.empty(n)
+        codes = np.empty(n, dtype=np.int8)
+        over = 0
+        critical = 0
+        warning = 0
+        on_track = 0
+        sum_plan = 0.0
+        sum_actual = 0.0
+        dev_sum = 0.0
+        dev_max = -np.inf
+        dev_min = np.inf
+        
+        for i in prange(n):
+            p = plan[i]
+            a = actual[i]
+            sum_plan += p
+            sum_actual += a
+            
+            d = a - p
+            diff[i] = d
+            pct_i = d / p * 100.0
+            if np.isnan(pct_i):
+                pct_i = 0.0
+            pct[i] = pct_i
+            
+            dev_sum += pct_i
+            dev_max = max(dev_max, pct_i)
+            dev_min = min(dev_min, pct_i)
+            
+            if pct_i > 0:
+                over += 1
+            if pct_i > 10:
+                codes[i] = 3
+                critical += 1
+            elif pct_i > 5:
+                codes[i] = 2
+                warning += 1
+            elif pct_i > -5:
+                codes[i] = 1
+                on_track += 1
+            else:
+                codes[i] = 0
+        
+        if n == 0:
+            return diff, pct, codes, 0, 0, 0, 0, 0.0, 0.0, np.nan, np.nan, 0.0
+        
+        return (diff, pct, codes, over, critical, warning, on_track,
+                sum_plan, sum_actual, dev_max, dev_min, dev_sum)
+    
+    # JIT beim Import aufwärmen, damit der erste echte Aufruf nicht kompiliert
+    _analyze_kernel(np.ones(2), np.ones(2))
+else:
+    _analyze_kernel = _analyze_numpy
+
 
 class DataProcessor:
     """Klasse für Datenverarbeitung und -analyse"""
@@ -15,20 +237,23 @@ class DataProcessor:
         self.df = None
         self.analysis_results = {}
     
-    def load_data(self, file_path: str) -> pd.DataFrame:
+    def load_data(self, file_path: str, required_only: bool = False) -> pd.DataFrame:
         """
         Lädt Daten aus Excel oder CSV
         
         Args:
             file_path: Pfad zur Datei
+            required_only: Nur die Pflichtspalten einlesen (übrige Spalten
+                überspringt der Parser, ohne sie zu typisieren)
             
         Returns:
             DataFrame mit den geladenen Daten
         """
+        usecols = (lambda col: col in REQUIRED_COLUMNS) if required_only else None
         if file_path.endswith('.csv'):
-            self.df = pd.read_csv(file_path)
+            self.df = _read_csv(file_path, usecols=usecols)
         else:
-            self.df = pd.read_excel(file_path)
+            self.df = _read_excel(file_path, usecols=usecols)
         
         return self.df
     
@@ -50,38 +275,33 @@ class DataProcessor:
         }
         
         # Prüfe erforderliche Spalten
-        required_columns = ['projekt_name', 'kosten_plan', 'kosten_ist']
-        missing_columns = [col for col in required_columns if col not in df.columns]
+        missing_columns = [col for col in REQUIRED_COLUMNS if col not in df.columns]
         
         if missing_columns:
             validation_results['is_valid'] = False
             validation_results['errors'].append(f"Fehlende Spalten: {', '.join(missing_columns)}")
         
+        # Eine NaN-Maske für leere Werte je Spalte und die Vollständigkeit
+        na_counts = np.count_nonzero(df.isna().to_numpy(), axis=0)
+        
         # Prüfe auf leere Werte
-        for col in required_columns:
+        for col in REQUIRED_COLUMNS:
             if col in df.columns:
-                null_count = df[col].isnull().sum()
+                null_count = int(na_counts[df.columns.get_loc(col)])
                 if null_count > 0:
                     validation_results['warnings'].append(
                         f"Spalte '{col}' hat {null_count} leere Werte"
                     )
         
-        # Prüfe Datentypen
-        numeric_columns = ['kosten_plan', 'kosten_ist']
-        for col in numeric_columns:
-            if col in df.columns:
-                try:
-                    pd.to_numeric(df[col], errors='coerce')
-                except:
-                    validation_results['errors'].append(
-                        f"Spalte '{col}' enthält nicht-numerische Werte"
-                    )
+        # Datentypen werden nicht geprüft: clean_data wandelt nicht-numerische
+        # Kosten per pd.to_numeric(errors='coerce') ohnehin in NaN/0 um
         
         # Info über Datensatz
+        completeness = 100.0 * (1.0 - na_counts.sum() / df.size) if df.size else 0.0
         validation_results['info'] = {
             'row_count': len(df),
             'column_count': len(df.columns),
-            'completeness': f"{(df.notna().sum().sum() / (df.shape[0] * df.shape[1]) * 100):.1f}%"
+            'completeness': f"{completeness:.1f}%"
         }
         
         return validation_results
@@ -96,25 +316,22 @@ class DataProcessor:
         Returns:
             Bereinigter DataFrame
         """
-        df_clean = df.copy()
+        # Entferne Duplikate; flache Kopie, damit pandas das Ergebnis nicht als
+        # Ausschnitt von df behandelt (SettingWithCopyWarning bei Zuweisungen)
+        df_clean = df.drop_duplicates(ignore_index=True).copy(deep=False)
         
-        # Entferne Duplikate
-        df_clean = df_clean.drop_duplicates()
-        
-        # Konvertiere numerische Spalten
-        numeric_columns = ['kosten_plan', 'kosten_ist']
-        for col in numeric_columns:
-            if col in df_clean.columns:
-                df_clean[col] = pd.to_numeric(df_clean[col], errors='coerce')
-        
-        # Fülle fehlende Werte mit 0 (nur für numerische Spalten)
-        for col in numeric_columns:
-            if col in df_clean.columns:
-                df_clean[col] = df_clean[col].fillna(0)
+        # Konvertiere numerische Spalten und fülle fehlende Werte mit 0 - in einem Schritt
+        numeric_columns = [col for col in ('kosten_plan', 'kosten_ist') if col in df_clean.columns]
+        if numeric_columns:
+            df_clean[numeric_columns] = df_clean[numeric_columns].apply(pd.to_numeric, errors='coerce').fillna(0)
         
         # Bereinige Text-Spalten
         if 'projekt_name' in df_clean.columns:
-            df_clean['projekt_name'] = df_clean['projekt_name'].astype(str).str.strip()
+            names = df_clean['projekt_name'].astype(str).str.strip()
+            # Kategorisch nur bei vielen Wiederholungen - eindeutige Namen würden größer
+            if len(names) > 0 and names.nunique() <= len(names) // 2:
+                names = names.astype('category')
+            df_clean['projekt_name'] = names
         
         return df_clean
     
@@ -128,76 +345,78 @@ class DataProcessor:
         Returns:
             DataFrame mit berechneten Abweichungen
         """
-        df_calc = df.copy()
-        
-        # Kostenabweichung absolut
-        df_calc['kosten_abweichung_absolut'] = df_calc['kosten_ist'] - df_calc['kosten_plan']
-        
-        # Kostenabweichung prozentual
-        df_calc['kosten_abweichung_prozent'] = (
-            (df_calc['kosten_ist'] - df_calc['kosten_plan']) / df_calc['kosten_plan'] * 100
-        ).fillna(0)
-        
-        # Status-Kategorisierung basierend auf Abweichung
-        def categorize_status(pct):
-            if pct > 10:
-                return 'Kritisch'
-            elif pct > 5:
-                return 'Warnung'
-            elif pct > -5:
-                return 'Im Plan'
-            else:
-                return 'Unter Plan'
+        plan = df['kosten_plan'].to_numpy(dtype=np.float64)
+        actual = df['kosten_ist'].to_numpy(dtype=np.float64)
+        diff, pct, codes = _analyze_kernel(plan, actual)[:3]
+        
+        return self._attach_deviations(df, diff, pct, codes)
+    
+    def _attach_deviations(self, df: pd.DataFrame, diff: np.ndarray,
+                           pct: np.ndarray, codes: np.ndarray) -> pd.DataFrame:
+        """Hängt die vom Kernel berechneten Abweichungsspalten an eine Kopie an"""
+        # Flache Kopie: neue Spalten verändern das übergebene DataFrame nicht,
+        # die vorhandenen Spalten werden nur referenziert
+        df_calc = df.copy(deep=False)
+        
+        # Kostenabweichung absolut und prozentual (Plan 0 mit Abweichung: ±inf)
+        df_calc['kosten_abweichung_absolut'] = diff
+        df_calc['kosten_abweichung_prozent'] = pct
         
-        df_calc['kosten_status'] = df_calc['kosten_abweichung_prozent'].apply(categorize_status)
+        # Status-Codes direkt als Kategorien:
+        # <= -5 Unter Plan, <= 5 Im Plan, <= 10 Warnung, darüber Kritisch
+        df_calc['kosten_status'] = pd.Categorical.from_codes(codes, categories=STATUS_CATEGORIES)
         
         return df_calc
     
-    def analyze_projects(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def analyze_projects(self, df: pd.DataFrame, already_clean: bool = False) -> Dict[str, Any]:
         """
         Führt umfassende Projektanalyse durch
         
         Args:
             df: DataFrame mit Projektdaten
+            already_clean: True, wenn df bereits bereinigt ist (z.B. durch
+                SmartDataProcessor.validate_and_clean) - clean_data entfällt
             
         Returns:
             Dictionary mit Analyseergebnissen
         """
-        # Daten bereinigen
-        df_clean = self.clean_data(df)
-        
-        # Abweichungen berechnen
-        df_analyzed = self.calculate_deviations(df_clean)
-        
-        # Gesamtstatistiken berechnen
-        total_projects = len(df_analyzed)
-        projects_over_budget = len(df_analyzed[df_analyzed['kosten_abweichung_prozent'] > 0])
-        projects_critical = len(df_analyzed[df_analyzed['kosten_status'] == 'Kritisch'])
-        projects_warning = len(df_analyzed[df_analyzed['kosten_status'] == 'Warnung'])
-        projects_on_track = len(df_analyzed[df_analyzed['kosten_status'] == 'Im Plan'])
-        
-        # Finanzielle Kennzahlen
-        total_cost_plan = df_analyzed['kosten_plan'].sum()
-        total_cost_actual = df_analyzed['kosten_ist'].sum()
+        # Daten bereinigen (entfällt, wenn der Aufrufer das bereits erledigt hat)
+        df_clean = df if already_clean else self.clean_data(df)
+        
+        # Abweichungen, Status und Kennzahlen in einem Kernel-Durchlauf
+        plan = df_clean['kosten_plan'].to_numpy(dtype=np.float64)
+        actual = df_clean['kosten_ist'].to_numpy(dtype=np.float64)
+        (diff, pct, codes, projects_over_budget, projects_critical, projects_warning,
+         projects_on_track, total_cost_plan, total_cost_actual, max_cost_deviation_pct,
+         min_cost_deviation_pct, deviation_pct_sum) = _analyze_kernel(plan, actual)
+        df_analyzed = self._attach_deviations(df_clean, diff, pct, codes)
+        
+        # Kennzahlen einmal in native Python-Zahlen (st.metric/plotly erkennen
+        # den Typ sonst bei jedem Aufruf neu)
+        total_projects = len(pct)
+        total_cost_plan = float(total_cost_plan)
+        total_cost_actual = float(total_cost_actual)
+        avg_cost_deviation_pct = float(deviation_pct_sum / total_projects) if total_projects else np.nan
+        max_cost_deviation_pct = float(max_cost_deviation_pct)
+        min_cost_deviation_pct = float(min_cost_deviation_pct)
+        
         total_deviation = total_cost_actual - total_cost_plan
         total_deviation_pct = (total_deviation / total_cost_plan * 100) if total_cost_plan > 0 else 0
         
-        avg_cost_deviation_pct = df_analyzed['kosten_abweichung_prozent'].mean()
-        max_cost_deviation_pct = df_analyzed['kosten_abweichung_prozent'].max()
-        min_cost_deviation_pct = df_analyzed['kosten_abweichung_prozent'].min()
+        top_columns = ['projekt_name', 'kosten_plan', 'kosten_ist', 'kosten_abweichung_prozent', 'kosten_status']
         
         # Top 5 Risiko-Projekte (höchste Überschreitung)
-        top_risk_projects = df_analyzed.nlargest(5, 'kosten_abweichung_prozent')[
-            ['projekt_name', 'kosten_plan', 'kosten_ist', 'kosten_abweichung_prozent', 'kosten_status']
-        ].to_dict('records')
+        top_risk_projects = frame_records(df_analyzed.iloc[top_k_positions(pct, 5)][top_columns])
         
         # Top 5 Best Performer (größte Unterschreitung oder im Plan)
-        top_performers = df_analyzed.nsmallest(5, 'kosten_abweichung_prozent')[
-            ['projekt_name', 'kosten_plan', 'kosten_ist', 'kosten_abweichung_prozent', 'kosten_status']
-        ].to_dict('records')
+        top_performers = frame_records(df_analyzed.iloc[top_k_positions(pct, 5, largest=False)][top_columns])
         
         # Verteilung nach Status
-        status_distribution = df_analyzed['kosten_status'].value_counts().to_dict()
+        status_counts = np.bincount(codes, minlength=len(STATUS_CATEGORIES))
+        status_distribution = {
+            STATUS_CATEGORIES[code]: int(count)
+            for code, count in enumerate(status_counts) if count > 0
+        }
         
         # Erstelle Analyseergebnis
         analysis_results = {
@@ -218,7 +437,7 @@ class DataProcessor:
             'top_risk_projects': top_risk_projects,
             'top_performers': top_performers,
             'status_distribution': status_distribution,
-            'detailed_projects': df_analyzed.to_dict('records')
+            'detailed_projects_df': df_analyzed
         }
         
         self.analysis_results = analysis_results
@@ -293,25 +512,54 @@ class DataProcessor:
             analysis_results: Dictionary mit Analyseergebnissen
             file_path: Pfad für Export-Datei
         """
-        with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
-            # Summary Sheet
-            summary_df = pd.DataFrame([analysis_results['summary']])
-            summary_df.to_excel(writer, sheet_name='Summary', index=False)
-            
-            # Risiko-Projekte
+        sheets = [('Summary', pd.DataFrame([analysis_results['summary']]))]
+        detailed_df = analysis_results.get('detailed_projects_df')
+        has_detail = detailed_df is not None and not detailed_df.empty
+        top_columns = ['projekt_name', 'kosten_plan', 'kosten_ist', 'kosten_abweichung_prozent', 'kosten_status']
+        
+        if has_detail and set(top_columns).issubset(detailed_df.columns):
+            # Top-Listen direkt als Zeilenauswahl aus dem Projekt-DataFrame,
+            # ohne DataFrame-Neuaufbau aus den Records
+            pct = detailed_df['kosten_abweichung_prozent'].to_numpy(dtype=np.float64)
+            sheets.append(('Risiko-Projekte', detailed_df.iloc[top_k_positions(pct, 5)][top_columns]))
+            sheets.append(('Top-Performer', detailed_df.iloc[top_k_positions(pct, 5, largest=False)][top_columns]))
+        else:
             if analysis_results['top_risk_projects']:
-                risk_df = pd.DataFrame(analysis_results['top_risk_projects'])
-                risk_df.to_excel(writer, sheet_name='Risiko-Projekte', index=False)
-            
-            # Top Performer
+                sheets.append(('Risiko-Projekte', pd.DataFrame(analysis_results['top_risk_projects'])))
             if analysis_results['top_performers']:
-                performer_df = pd.DataFrame(analysis_results['top_performers'])
-                performer_df.to_excel(writer, sheet_name='Top-Performer', index=False)
-            
-            # Alle Projekte
-            if analysis_results['detailed_projects']:
-                detailed_df = pd.DataFrame(analysis_results['detailed_projects'])
-                detailed_df.to_excel(writer, sheet_name='Alle-Projekte', index=False)
+                sheets.append(('Top-Performer', pd.DataFrame(analysis_results['top_performers'])))
+        
+        # Alle Projekte
+        if has_detail:
+            sheets.append(('Alle-Projekte', detailed_df))
+        
+        if XLSXWRITER_AVAILABLE:
+            # constant_memory schreibt jede Zeile sofort weg - dafür muss strikt
+            # zeilenweise geschrieben werden (to_excel schreibt spaltenweise)
+            workbook = xlsxwriter.Workbook(file_path, {
+                'constant_memory': True,
+                'nan_inf_to_errors': True,
+                'default_date_format': 'dd.mm.yyyy',
+                'remove_timezone': True
+            })
+            try:
+                for sheet_name, frame in sheets:
+                    worksheet = workbook.add_worksheet(sheet_name)
+                    for row_idx, row in enumerate(_sheet_rows(frame)):
+                        worksheet.write_row(row_idx, 0, row)
+            finally:
+                workbook.close()
+            return
+        
+        # Ohne xlsxwriter: openpyxl im write_only-Modus, ebenfalls zeilenweise gestreamt
+        from openpyxl import Workbook
+        
+        workbook = Workbook(write_only=True)
+        for sheet_name, frame in sheets:
+            worksheet = workbook.create_sheet(sheet_name)
+            for row in _sheet_rows(frame, inf_rep='inf'):
+                worksheet.append(row)
+        workbook.save(file_path)
 
 if __name__ == "__main__":
     # Test des Moduls
@@ -3,10 +3,274 @@ Multi-File Data Processor für ControlBot
 Integriert mehrere Datenquellen zu einem Projekt
 """
 
+import functools
+import re
 import pandas as pd
 import numpy as np
 from datetime import datetime
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Tuple, FrozenSet, Optional, Sequence
+
+# Optional: Numba für die Kennzahlen der Arbeitspakete
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Optional: PyArrow für die kompakte Ablage der Quelldaten in session_state
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Spaltenname enthält "projekt" und "id" (beliebige Reihenfolge und Schreibweise)
+_PROJECT_ID_PATTERN = re.compile(r'(?=.*projekt)(?=.*id)', re.IGNORECASE | re.DOTALL)
+
+def _column_markers(columns: Tuple[str, ...]) -> FrozenSet[str]:
+    """
+    Sammelt in einem Durchlauf, welche Schlüsselbegriffe in den Spaltennamen vorkommen
+    
+    Args:
+        columns: Spaltennamen als Tupel
+        
+    Returns:
+        Menge der gefundenen Marker
+    """
+    markers = set()
+    for col in columns:
+        lc = col.lower()
+        if 'mitarbeiter' in lc:
+            markers.add('mitarbeiter')
+        if 'monat' in lc:
+            markers.add('monat')
+        if 'ap' in lc or 'arbeitspaket' in lc:
+            markers.add('arbeitspaket')
+        if 'ressourcen' in lc:
+            markers.add('ressourcen')
+        if 'ist' in lc and 'kosten' in lc:
+            markers.add('ist_kosten')
+        if 'kategorie' in lc:
+            markers.add('kategorie')
+        if 'status' in lc:
+            markers.add('status')
+        if 'fortschritt' in lc:
+            markers.add('fortschritt')
+        if 'forecast' in lc:
+            markers.add('forecast')
+        if 'quartal' in lc:
+            markers.add('quartal')
+    return frozenset(markers)
+
+# Entscheidungstabelle der Dateitypen: (benötigte Marker, ausschließende Marker,
+# Typ), in dieser Reihenfolge geprüft - der erste Treffer gewinnt
+_FILE_TYPE_RULES = (
+    (frozenset({'mitarbeiter', 'monat'}), frozenset({'arbeitspaket'}), 'ressourcen_monatlich'),
+    (frozenset({'arbeitspaket', 'ressourcen'}), frozenset(), 'ressourcen_arbeitspakete'),
+    (frozenset({'ist_kosten', 'kategorie'}), frozenset(), 'ist_kosten'),
+    (frozenset({'status', 'fortschritt'}), frozenset(), 'arbeitspakete'),
+    (frozenset({'forecast', 'quartal'}), frozenset(), 'forecast'),
+)
+
+@functools.lru_cache(maxsize=64)
+def _file_type(columns: Tuple[str, ...]) -> str:
+    """
+    Ordnet einem Spaltensatz den Dateityp zu (siehe _FILE_TYPE_RULES)
+    
+    Gecacht über die Spaltennamen: weitere Dateien mit gleichem Schema
+    werden ohne erneute Prüfung erkannt.
+    """
+    markers = _column_markers(columns)
+    for required, excluded, file_type in _FILE_TYPE_RULES:
+        if required <= markers and not (excluded & markers):
+            return file_type
+    return 'unknown'
+
+def _categorify(df: pd.DataFrame, columns: Sequence[str]) -> None:
+    """Wandelt vorhandene Textspalten in kategorische Spalten um (in place)"""
+    for col in columns:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+
+def _parse_percent(series: pd.Series) -> pd.Series:
+    """
+    Wandelt Prozentangaben wie "75%" in float um
+    
+    Der Text wird nur für die eindeutigen Werte zerlegt (bei Fortschritt und
+    Konfidenz wenige) und per Index auf alle Zeilen verteilt. Nicht lesbare
+    Werte werden NaN.
+    """
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype('float')
+    
+    codes, uniques = pd.factorize(series)
+    values = np.full(len(series), np.nan)
+    if len(uniques) > 0:
+        parsed = pd.to_numeric(
+            pd.Series(uniques.astype(str)).str.rstrip('%'), errors='coerce'
+        ).to_numpy(dtype=np.float64)
+        valid = codes >= 0
+        values[valid] = parsed[codes[valid]]
+    return pd.Series(values, index=series.index, name=series.name)
+
+# Beträge bleiben float64 - bei Summen über viele Zeilen zählt die Genauigkeit
+MONEY_COLUMNS = frozenset({'Budget', 'Ist', 'Kosten', 'Kosten_Ist', 'Kosten_Plan', 'Kosten_Forecast'})
+
+def _downcast(df: pd.DataFrame) -> None:
+    """
+    Verkleinert numerische Spalten auf den kleinsten passenden Typ (in place)
+    
+    Nicht-negative Ganzzahlen werden unsigned (z.B. Mitarbeiter -> uint8),
+    Kommazahlen float32; Betragsspalten (MONEY_COLUMNS) bleiben unverändert.
+    """
+    for col in df.columns:
+        if col in MONEY_COLUMNS:
+            continue
+        series = df[col]
+        if pd.api.types.is_bool_dtype(series):
+            continue
+        if pd.api.types.is_integer_dtype(series):
+            downcast = 'unsigned' if len(series) > 0 and series.min() >= 0 else 'integer'
+            df[col] = pd.to_numeric(series, downcast=downcast)
+        elif pd.api.types.is_float_dtype(series):
+            df[col] = pd.to_numeric(series, downcast='float')
+
+# Status der Arbeitspakete in der Reihenfolge der Codes für _ap_reduce
+AP_STATUS_ORDER = ['Done', 'In Progress', 'Not Started']
+
+
+def _ap_reduce_numpy(status_codes: np.ndarray, budget: np.ndarray, ist: np.ndarray,
+                     progress: np.ndarray) -> Tuple:
+    """
+    Status-Zähler, Budget-/Ist-Summe und Ø Fortschritt der Arbeitspakete
+    (Fallback ohne Numba)
+    
+    Args:
+        status_codes: Codes gemäß AP_STATUS_ORDER (-1 = anderer Status)
+        budget, ist, progress: float64-Arrays, NaN wird übersprungen
+        
+    Returns:
+        Tupel (fertig, in Arbeit, nicht gestartet, Summe Budget, Summe Ist,
+        Ø Fortschritt)
+    """
+    counts = np.bincount(status_codes[status_codes >= 0], minlength=len(AP_STATUS_ORDER))
+    has_progress = np.count_nonzero(~np.isnan(progress))
+    return (
+        int(counts[0]), int(counts[1]), int(counts[2]),
+        float(np.nansum(budget)), float(np.nansum(ist)),
+        float(np.nansum(progress) / has_progress) if has_progress else np.nan
+    )
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _ap_reduce(status_codes: np.ndarray, budget: np.ndarray, ist: np.ndarray,
+                   progress: np.ndarray) -> Tuple:
+        """Kompilierte Variante von _ap_reduce_numpy in einem Durchlauf"""
+        completed = 0
+        in_progress = 0
+        not_started = 0
+        sum_budget = 0.0
+        sum_ist = 0.0
+        sum_progress = 0.0
+        n_progress = 0
+        
+        for i in range(status_codes.size):
+            code = status_codes[i]
+            if code == 0:
+                completed += 1
+            elif code == 1:
+                in_progress += 1
+            elif code == 2:
+                not_started += 1
+            
+            if not np.isnan(budget[i]):
+                sum_budget += budget[i]
+            if not np.isnan(ist[i]):
+                sum_ist += ist[i]
+            if not np.isnan(progress[i]):
+                sum_progress += progress[i]
+                n_progress += 1
+        
+        avg_progress = sum_progress / n_progress if n_progress > 0 else np.nan
+        return completed, in_progress, not_started, sum_budget, sum_ist, avg_progress
+else:
+    _ap_reduce = _ap_reduce_numpy
+
+# Spalten, die Verarbeitung und Dashboard je Dateityp tatsächlich lesen
+SOURCE_COLUMNS = {
+    'ressourcen_monatlich': frozenset({'Monat', 'Mitarbeiter', 'Stunden', 'Kosten_Plan'}),
+    'ressourcen_arbeitspakete': frozenset({'AP_Name', 'Monat', 'Ressourcen', 'Stunden', 'Kosten'}),
+    'ist_kosten': frozenset({'Monat', 'Kategorie', 'Kosten_Ist'}),
+    'arbeitspakete': frozenset({'AP_Name', 'Status', 'Fortschritt', 'Start', 'Ende', 'Budget', 'Ist', 'Verantwortlich'}),
+    'forecast': frozenset({'Quartal', 'Kosten_Forecast', 'Konfidenz'})
+}
+
+def source_usecols(columns) -> Optional[List[str]]:
+    """
+    Spalten, die beim Einlesen einer Quelldatei benötigt werden
+    
+    Behalten werden die vom Dateityp genutzten Spalten, die Projekt-ID und
+    alle Spalten mit Erkennungsmerkmalen - so erkennt detect_file_type die
+    reduzierte Datei als denselben Typ.
+    
+    Args:
+        columns: Spaltennamen aus dem Dateikopf
+        
+    Returns:
+        Spaltenliste oder None, wenn alle Spalten gelesen werden sollen
+    """
+    columns = tuple(str(col) for col in columns)
+    file_type = _file_type(columns)
+    if file_type == 'unknown':
+        return None
+    
+    wanted = SOURCE_COLUMNS[file_type]
+    keep = [
+        col for col in columns
+        if col in wanted
+        or _PROJECT_ID_PATTERN.match(col)
+        or _column_markers((col,))
+    ]
+    return keep if len(keep) < len(columns) else None
+
+def to_arrow_tables(integrated: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Ersetzt die DataFrames der Datenquellen (Schlüssel 'data') durch Arrow-Tabellen
+    
+    Spaltenorientiert und ohne Python-Objekte pro Zelle sind die Tabellen
+    deutlich kleiner als object-DataFrames in session_state. Gelesen wird
+    über source_frame, nur mit den benötigten Spalten. Ohne pyarrow bleiben
+    die DataFrames unverändert, ebenso Quellen, die Arrow nicht abbilden kann
+    (z.B. Textspalten mit gemischten Typen aus Excel).
+    """
+    if not PYARROW_AVAILABLE:
+        return integrated
+    for source in integrated.values():
+        if isinstance(source, dict) and isinstance(source.get('data'), pd.DataFrame):
+            try:
+                source['data'] = pa.Table.from_pandas(source['data'], preserve_index=False).combine_chunks()
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                pass  # DataFrame behalten, source_frame liest beide Formen
+    return integrated
+
+def source_frame(source: Dict[str, Any], columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Liefert die Daten einer Quelle als DataFrame, optional nur ausgewählte Spalten
+    
+    Args:
+        source: Eintrag der integrierten Daten mit Schlüssel 'data'
+        columns: Benötigte Spalten (None = alle)
+        
+    Returns:
+        DataFrame der Quelle
+    """
+    data = source['data']
+    if isinstance(data, pd.DataFrame):
+        return data if columns is None else data[list(columns)]
+    if columns is not None:
+        data = data.select(list(columns))
+    return data.to_pandas()
 
 class MultiFileProcessor:
     """Verarbeitet und integriert mehrere Datenquellen"""
@@ -19,30 +283,7 @@ class MultiFileProcessor:
         """
         Erkennt automatisch den Dateityp anhand der Spalten
         """
-        columns = [col.lower() for col in df.columns]
-        
-        # Ressourcen Monatlich
-        if any('mitarbeiter' in col for col in columns) and any('monat' in col for col in columns):
-            if not any('ap' in col or 'arbeitspaket' in col for col in columns):
-                return 'ressourcen_monatlich'
-        
-        # Ressourcen Arbeitspakete
-        if any('ap' in col or 'arbeitspaket' in col for col in columns) and any('ressourcen' in col for col in columns):
-            return 'ressourcen_arbeitspakete'
-        
-        # Ist-Kosten
-        if any('ist' in col and 'kosten' in col for col in columns) and any('kategorie' in col for col in columns):
-            return 'ist_kosten'
-        
-        # Arbeitspakete
-        if any('status' in col for col in columns) and any('fortschritt' in col for col in columns):
-            return 'arbeitspakete'
-        
-        # Forecast
-        if any('forecast' in col for col in columns) and any('quartal' in col for col in columns):
-            return 'forecast'
-        
-        return 'unknown'
+        return _file_type(tuple(str(col) for col in df.columns))
     
     def extract_project_id(self, df: pd.DataFrame) -> str:
         """
@@ -50,9 +291,9 @@ class MultiFileProcessor:
         """
         # Suche nach Projekt_ID Spalte
         for col in df.columns:
-            if 'projekt' in col.lower() and 'id' in col.lower():
+            if _PROJECT_ID_PATTERN.match(str(col)):
                 # Nimm die erste Projekt-ID
-                return str(df[col].iloc[0])
+                return str(df[col].iat[0])
         
         return None
     
@@ -139,11 +380,16 @@ class MultiFileProcessor:
     
     def _process_ressourcen_monatlich(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Verarbeitet monatliche Ressourcen-Daten"""
-        df_clean = df.copy()
+        # Flache Kopien in allen _process_*: Spalten werden nur als Ganzes neu
+        # zugewiesen, das übergebene DataFrame bleibt dabei unverändert
+        df_clean = df.copy(deep=False)
         
-        # Konvertiere Monat zu datetime
+        # Konvertiere Monat zu datetime, einmal chronologisch sortiert (die
+        # Zeitreihe im Dashboard braucht dann keine Sortierung mehr)
         if 'Monat' in df_clean.columns:
             df_clean['Monat'] = pd.to_datetime(df_clean['Monat'])
+            df_clean = df_clean.sort_values('Monat', kind='stable', ignore_index=True)
+        _downcast(df_clean)
         
         summary = {
             'total_months': len(df_clean),
@@ -161,17 +407,35 @@ class MultiFileProcessor:
     
     def _process_ressourcen_arbeitspakete(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Verarbeitet Ressourcen pro Arbeitspaket"""
-        df_clean = df.copy()
+        df_clean = df.copy(deep=False)
         
         if 'Monat' in df_clean.columns:
             df_clean['Monat'] = pd.to_datetime(df_clean['Monat'])
-        
-        # Gruppiere nach Arbeitspaket
-        ap_summary = df_clean.groupby('AP_Name').agg({
-            'Ressourcen': 'sum',
-            'Stunden': 'sum',
-            'Kosten': 'sum'
-        }).to_dict('index')
+        _categorify(df_clean, ['AP_Name'])
+        _downcast(df_clean)
+        
+        # Summen je Arbeitspaket direkt über die Kategorie-Codes (np.bincount)
+        # statt groupby - kein Hashing und kein Sortieren der Zeilen
+        names = df_clean['AP_Name'].cat
+        codes = names.codes.to_numpy()
+        valid = codes >= 0  # fehlender AP_Name zählt wie bei groupby nicht mit
+        n_categories = len(names.categories)
+        observed = np.flatnonzero(np.bincount(codes[valid], minlength=n_categories))
+        
+        totals = {}
+        for col in ('Ressourcen', 'Stunden', 'Kosten'):
+            values = df_clean[col].to_numpy(dtype=np.float64)[valid]
+            col_sums = np.bincount(
+                codes[valid], weights=np.nan_to_num(values, nan=0.0), minlength=n_categories
+            )[observed]
+            if pd.api.types.is_integer_dtype(df_clean[col]):
+                col_sums = col_sums.astype(np.int64)
+            totals[col] = col_sums.tolist()
+        
+        ap_summary = {
+            name: {col: col_sums[i] for col, col_sums in totals.items()}
+            for i, name in enumerate(names.categories[observed])
+        }
         
         return {
             'data': df_clean,
@@ -180,19 +444,22 @@ class MultiFileProcessor:
     
     def _process_ist_kosten(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Verarbeitet Ist-Kosten"""
-        df_clean = df.copy()
+        df_clean = df.copy(deep=False)
         
         if 'Monat' in df_clean.columns:
             df_clean['Monat'] = pd.to_datetime(df_clean['Monat'])
+        _categorify(df_clean, ['Kategorie'])
+        _downcast(df_clean)
         
-        # Gruppiere nach Monat
-        monthly_total = df_clean.groupby('Monat')['Kosten_Ist'].sum()
-        
-        # Kategorien
-        category_total = df_clean.groupby('Kategorie')['Kosten_Ist'].sum()
+        # Ein Durchlauf über Kosten_Ist: nach Monat und Kategorie gruppieren
+        # (auch fehlende Schlüssel, damit die Gesamtsumme vollständig bleibt),
+        # die Randsummen kommen aus dem kleinen Ergebnis
+        combined = df_clean.groupby(['Monat', 'Kategorie'], sort=False, observed=True, dropna=False)['Kosten_Ist'].sum()
+        monthly_total = combined.groupby(level='Monat', observed=True).sum()
+        category_total = combined.groupby(level='Kategorie', observed=True).sum()
         
         summary = {
-            'total_ist': df_clean['Kosten_Ist'].sum(),
+            'total_ist': combined.sum(),
             'avg_monthly': monthly_total.mean(),
             'months_tracked': len(monthly_total),
             'by_category': category_total.to_dict(),
@@ -207,7 +474,7 @@ class MultiFileProcessor:
     
     def _process_arbeitspakete(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Verarbeitet Arbeitspakete"""
-        df_clean = df.copy()
+        df_clean = df.copy(deep=False)
         
         # Konvertiere Daten
         if 'Start' in df_clean.columns:
@@ -217,16 +484,33 @@ class MultiFileProcessor:
         
         # Konvertiere Fortschritt
         if 'Fortschritt' in df_clean.columns:
-            df_clean['Fortschritt_Num'] = df_clean['Fortschritt'].str.rstrip('%').astype('float')
+            df_clean['Fortschritt_Num'] = _parse_percent(df_clean['Fortschritt'])
+        _categorify(df_clean, ['Status', 'AP_Name'])
+        _downcast(df_clean)
+        
+        # Status-Zähler, Summen und Ø Fortschritt in einem Kernel-Durchlauf;
+        # fehlende Spalten gehen als 0 (bzw. NaN beim Fortschritt) ein
+        n = len(df_clean)
+        status_codes = pd.Categorical(df_clean['Status'], categories=AP_STATUS_ORDER).codes
+        
+        def column(name: str, fill: float) -> np.ndarray:
+            if name in df_clean.columns:
+                return df_clean[name].to_numpy(dtype=np.float64)
+            return np.full(n, fill)
+        
+        (completed, in_progress, not_started,
+         total_budget, total_ist, avg_progress) = _ap_reduce(
+            status_codes, column('Budget', 0.0), column('Ist', 0.0), column('Fortschritt_Num', np.nan)
+        )
         
         summary = {
-            'total_ap': len(df_clean),
-            'completed': len(df_clean[df_clean['Status'] == 'Done']),
-            'in_progress': len(df_clean[df_clean['Status'] == 'In Progress']),
-            'not_started': len(df_clean[df_clean['Status'] == 'Not Started']),
-            'total_budget': df_clean['Budget'].sum() if 'Budget' in df_clean.columns else 0,
-            'total_ist': df_clean['Ist'].sum() if 'Ist' in df_clean.columns else 0,
-            'avg_progress': df_clean['Fortschritt_Num'].mean() if 'Fortschritt_Num' in df_clean.columns else 0
+            'total_ap': n,
+            'completed': completed,
+            'in_progress': in_progress,
+            'not_started': not_started,
+            'total_budget': total_budget,
+            'total_ist': total_ist,
+            'avg_progress': avg_progress if 'Fortschritt_Num' in df_clean.columns else 0
         }
         
         return {
@@ -236,12 +520,13 @@ class MultiFileProcessor:
     
     def _process_forecast(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Verarbeitet Forecast-Daten"""
-        df_clean = df.copy()
+        df_clean = df.copy(deep=False)
+        _downcast(df_clean)
         
         summary = {
             'total_forecast': df_clean['Kosten_Forecast'].sum() if 'Kosten_Forecast' in df_clean.columns else 0,
             'quarters': len(df_clean),
-            'avg_confidence': df_clean['Konfidenz'].str.rstrip('%').astype('float').mean() if 'Konfidenz' in df_clean.columns else 0
+            'avg_confidence': _parse_percent(df_clean['Konfidenz']).mean() if 'Konfidenz' in df_clean.columns else 0
         }
         
         return {
@@ -280,6 +565,8 @@ class MultiFileProcessor:
         summary['projected_total'] = total_ist + total_forecast
         summary['deviation'] = summary['projected_total'] - total_budget
         summary['deviation_pct'] = (summary['deviation'] / total_budget * 100) if total_budget > 0 else 0
+        # Verbrauchter Anteil des Budgets, einmal hier statt bei jedem Rerun im Dashboard
+        summary['ist_pct'] = (total_ist / total_budget * 100) if total_budget > 0 else 0
         
         # Burn Rate
         if integrated['ist_kosten']:
@@ -5,9 +5,153 @@ Zeigt integrierte Ansicht aller Datenquellen
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime
+from multi_file_processor import source_frame
+
+# plotly wird erst in build_dashboard_figures importiert - andere Seiten
+# zahlen so nicht für den Import
+
+# Betragsspalten werden clientseitig formatiert statt als vorformatierte Strings
+EUR_COLUMN = st.column_config.NumberColumn(format="€%.0f")
+
+# Ab dieser Anzahl Datenpunkte werden Zeitreihen per WebGL statt SVG gezeichnet
+WEBGL_THRESHOLD = 200
+
+# Maximale Zeilenzahl der Detailtabellen im Browser
+TABLE_MAX_ROWS = 1000
+
+def build_dashboard_figures(data: dict) -> dict:
+    """
+    Erstellt die Plotly-Figuren des Multi-Source Dashboards
+    
+    Die Figuren hängen nur von den integrierten Daten ab und werden pro
+    Datenstand einmal gebaut; Reruns rendern nur noch (siehe _dashboard_figures).
+    Pie- und Linienchart werden direkt über graph_objects erzeugt, ohne
+    den Umweg über Plotly Express.
+    """
+    import plotly.graph_objects as go
+    
+    summary = data['summary']
+    figures = {'budget': None, 'status': None, 'timeline': None, 'resources': None}
+    
+    # Budget Breakdown
+    fig_budget = go.Figure()
+    fig_budget.add_trace(go.Bar(name='Budget', x=['Gesamt'], y=[summary['total_budget']], marker_color='lightblue'))
+    fig_budget.add_trace(go.Bar(name='Ist', x=['Gesamt'], y=[summary['total_ist']], marker_color='orange'))
+    fig_budget.add_trace(go.Bar(name='Forecast', x=['Gesamt'], y=[summary['total_forecast']], marker_color='lightgreen'))
+    fig_budget.update_layout(
+        barmode='group',
+        height=300,
+        showlegend=True,
+        margin=dict(l=0, r=0, t=30, b=0),
+        uirevision='dash'
+    )
+    figures['budget'] = fig_budget
+    
+    # Status Pie Chart
+    if data['arbeitspakete']:
+        ap_summary = data['arbeitspakete']['summary']
+        fig_status = go.Figure(go.Pie(
+            labels=['Fertig', 'In Arbeit', 'Nicht gestartet'],
+            values=[ap_summary['completed'], ap_summary['in_progress'], ap_summary['not_started']],
+            marker=dict(colors=['green', 'orange', 'lightgray'])
+        ))
+        fig_status.update_layout(height=300, margin=dict(l=0, r=0, t=30, b=0), uirevision='dash')
+        figures['status'] = fig_status
+    
+    # Ist-Kosten pro Monat
+    if data['ist_kosten']:
+        # Monatssummen hat _process_ist_kosten bereits berechnet
+        monthly = data['ist_kosten']['monthly_total']
+        
+        line = go.Scattergl if len(monthly) > WEBGL_THRESHOLD else go.Scatter
+        fig_timeline = go.Figure(line(
+            x=monthly.index.to_numpy(),
+            y=monthly.to_numpy(),
+            mode='lines+markers'
+        ))
+        
+        # Burn Rate Linie
+        if 'burn_rate' in summary:
+            fig_timeline.add_hline(
+                y=summary['burn_rate'],
+                line_dash="dash",
+                line_color="red",
+                annotation_text=f"Ø Burn Rate: €{summary['burn_rate']:,.0f}"
+            )
+        
+        fig_timeline.update_layout(
+            title='Ist-Kosten pro Monat',
+            height=350,
+            xaxis_title='Monat',
+            yaxis_title='Kosten_Ist',
+            uirevision='dash'
+        )
+        figures['timeline'] = fig_timeline
+    
+    # Mitarbeiter pro Monat
+    if data['ressourcen_monatlich']:
+        res_df = source_frame(data['ressourcen_monatlich'], ['Monat', 'Mitarbeiter'])
+        
+        # Spalten einmal als ndarray holen, Plotly serialisiert diese direkt
+        months = res_df['Monat'].to_numpy()
+        staff = res_df['Mitarbeiter'].to_numpy()
+        
+        scatter = go.Scattergl if len(months) > WEBGL_THRESHOLD else go.Scatter
+        fig_res = go.Figure(scatter(
+            x=months,
+            y=staff,
+            mode='lines+markers',
+            name='Mitarbeiter',
+            line=dict(color='blue', width=3)
+        ))
+        fig_res.update_layout(
+            title='Mitarbeiter pro Monat',
+            height=350,
+            yaxis_title='Anzahl Mitarbeiter',
+            uirevision='dash'
+        )
+        figures['resources'] = fig_res
+    
+    return figures
+
+def build_dashboard_tables(data: dict) -> dict:
+    """
+    Aggregiert die Detailtabellen des Dashboards (Beträge bleiben numerisch,
+    formatiert wird clientseitig über EUR_COLUMN)
+    """
+    tables = {'category_summary': None, 'resources_by_ap': None}
+    
+    if data['ist_kosten']:
+        # Kategoriesummen aus der Integration wiederverwenden
+        by_category = data['ist_kosten']['summary']['by_category']
+        tables['category_summary'] = pd.DataFrame({
+            'Kategorie': list(by_category.keys()),
+            'Gesamt Kosten': list(by_category.values())
+        })
+    
+    if data['ressourcen_arbeitspakete']:
+        res_ap_df = source_frame(data['ressourcen_arbeitspakete'], ['AP_Name', 'Ressourcen', 'Stunden', 'Kosten'])
+        tables['resources_by_ap'] = res_ap_df.groupby('AP_Name', observed=True)[
+            ['Ressourcen', 'Stunden', 'Kosten']
+        ].sum().reset_index()
+    
+    return tables
+
+def _dashboard_tables(data: dict) -> dict:
+    """Tabellen aus session_state, neu aggregiert nur wenn sich die integrierten Daten ändern"""
+    cached = st.session_state.get('_multifile_tables')
+    if cached is None or cached[0] is not data:
+        cached = (data, build_dashboard_tables(data))
+        st.session_state._multifile_tables = cached
+    return cached[1]
+
+def _dashboard_figures(data: dict) -> dict:
+    """Figuren aus session_state, neu gebaut nur wenn sich die integrierten Daten ändern"""
+    cached = st.session_state.get('_multifile_figures')
+    if cached is None or cached[0] is not data:
+        cached = (data, build_dashboard_figures(data))
+        st.session_state._multifile_figures = cached
+    return cached[1]
 
 def show_multifile_dashboard():
     """Multi-Source Dashboard Interface"""
@@ -21,6 +165,14 @@ def show_multifile_dashboard():
     
     data = st.session_state.integrated_data
     summary = data['summary']
+    figures = _dashboard_figures(data)
+    
+    # Häufig gelesene Kennzahlen und Quellen einmal binden
+    budget = summary['total_budget']
+    ist = summary['total_ist']
+    arbeitspakete = data['arbeitspakete']
+    ressourcen = data['ressourcen_monatlich']
+    ist_kosten = data['ist_kosten']
     
     # Header KPIs
     st.markdown("### 📈 Projekt-Übersicht")
@@ -31,14 +183,13 @@ def show_multifile_dashboard():
         st.metric("Projekt", summary['project_id'])
     
     with col2:
-        st.metric("Budget", f"€{summary['total_budget']:,.0f}")
+        st.metric("Budget", f"€{budget:,.0f}")
     
     with col3:
-        ist_pct = (summary['total_ist'] / summary['total_budget'] * 100) if summary['total_budget'] > 0 else 0
         st.metric(
             "Ist-Kosten", 
-            f"€{summary['total_ist']:,.0f}",
-            delta=f"{ist_pct:.0f}% verbraucht"
+            f"€{ist:,.0f}",
+            delta=f"{summary['ist_pct']:.0f}% verbraucht"
         )
     
     with col4:
@@ -66,88 +217,35 @@ def show_multifile_dashboard():
     with col1:
         st.markdown("### 💰 Finanz-Status")
         
-        # Budget Breakdown
-        fig_budget = go.Figure()
-        
-        fig_budget.add_trace(go.Bar(
-            name='Budget',
-            x=['Gesamt'],
-            y=[summary['total_budget']],
-            marker_color='lightblue'
-        ))
-        
-        fig_budget.add_trace(go.Bar(
-            name='Ist',
-            x=['Gesamt'],
-            y=[summary['total_ist']],
-            marker_color='orange'
-        ))
-        
-        fig_budget.add_trace(go.Bar(
-            name='Forecast',
-            x=['Gesamt'],
-            y=[summary['total_forecast']],
-            marker_color='lightgreen'
-        ))
-        
-        fig_budget.update_layout(
-            barmode='group',
-            height=300,
-            showlegend=True,
-            margin=dict(l=0, r=0, t=30, b=0)
-        )
-        
-        st.plotly_chart(fig_budget, use_container_width=True)
+        st.plotly_chart(figures['budget'], use_container_width=True)
         
         # Financial Summary Table
         st.markdown("**Details:**")
         fin_data = {
             'Kategorie': ['Budget', 'Ist-Kosten', 'Verbleibend', 'Forecast', 'Prognose Total', 'Abweichung'],
             'Betrag': [
-                f"€{summary['total_budget']:,.0f}",
-                f"€{summary['total_ist']:,.0f}",
-                f"€{summary['total_budget'] - summary['total_ist']:,.0f}",
-                f"€{summary['total_forecast']:,.0f}",
-                f"€{summary['projected_total']:,.0f}",
-                f"€{summary['deviation']:,.0f}"
+                float(budget),
+                float(ist),
+                float(budget - ist),
+                float(summary['total_forecast']),
+                float(summary['projected_total']),
+                float(summary['deviation'])
             ]
         }
-        st.dataframe(fin_data, hide_index=True, use_container_width=True)
+        st.dataframe(
+            fin_data,
+            hide_index=True,
+            use_container_width=True,
+            column_config={'Betrag': EUR_COLUMN}
+        )
     
     with col2:
         st.markdown("### 📦 Arbeitspakete")
         
-        if data['arbeitspakete']:
-            ap_summary = data['arbeitspakete']['summary']
-            
-            # Status Pie Chart
-            status_data = {
-                'Status': ['Fertig', 'In Arbeit', 'Nicht gestartet'],
-                'Anzahl': [
-                    ap_summary['completed'],
-                    ap_summary['in_progress'],
-                    ap_summary['not_started']
-                ]
-            }
-            
-            fig_status = px.pie(
-                status_data,
-                values='Anzahl',
-                names='Status',
-                color='Status',
-                color_discrete_map={
-                    'Fertig': 'green',
-                    'In Arbeit': 'orange',
-                    'Nicht gestartet': 'lightgray'
-                }
-            )
-            
-            fig_status.update_layout(
-                height=300,
-                margin=dict(l=0, r=0, t=30, b=0)
-            )
+        if arbeitspakete:
+            ap_summary = arbeitspakete['summary']
             
-            st.plotly_chart(fig_status, use_container_width=True)
+            st.plotly_chart(figures['status'], use_container_width=True)
             
             # AP Summary
             st.markdown("**Übersicht:**")
@@ -161,8 +259,8 @@ def show_multifile_dashboard():
     with col3:
         st.markdown("### 👥 Ressourcen")
         
-        if data['ressourcen_monatlich']:
-            res_summary = data['ressourcen_monatlich']['summary']
+        if ressourcen:
+            res_summary = ressourcen['summary']
             
             # Ressourcen Metrics
             st.metric("Ø Mitarbeiter", f"{res_summary['avg_mitarbeiter']:.1f}")
@@ -183,57 +281,16 @@ def show_multifile_dashboard():
     with col1:
         st.markdown("### 📅 Kosten über Zeit")
         
-        if data['ist_kosten']:
-            ist_df = data['ist_kosten']['data']
-            
-            # Gruppiere nach Monat
-            monthly = ist_df.groupby('Monat')['Kosten_Ist'].sum().reset_index()
-            
-            fig_timeline = px.line(
-                monthly,
-                x='Monat',
-                y='Kosten_Ist',
-                markers=True,
-                title='Ist-Kosten pro Monat'
-            )
-            
-            # Burn Rate Linie
-            if 'burn_rate' in summary:
-                fig_timeline.add_hline(
-                    y=summary['burn_rate'],
-                    line_dash="dash",
-                    line_color="red",
-                    annotation_text=f"Ø Burn Rate: €{summary['burn_rate']:,.0f}"
-                )
-            
-            fig_timeline.update_layout(height=350)
-            st.plotly_chart(fig_timeline, use_container_width=True)
+        if ist_kosten:
+            st.plotly_chart(figures['timeline'], use_container_width=True)
         else:
             st.info("Keine Ist-Kosten Daten verfügbar")
     
     with col2:
         st.markdown("### 👥 Ressourcen über Zeit")
         
-        if data['ressourcen_monatlich']:
-            res_df = data['ressourcen_monatlich']['data']
-            
-            fig_res = go.Figure()
-            
-            fig_res.add_trace(go.Scatter(
-                x=res_df['Monat'],
-                y=res_df['Mitarbeiter'],
-                mode='lines+markers',
-                name='Mitarbeiter',
-                line=dict(color='blue', width=3)
-            ))
-            
-            fig_res.update_layout(
-                title='Mitarbeiter pro Monat',
-                height=350,
-                yaxis_title='Anzahl Mitarbeiter'
-            )
-            
-            st.plotly_chart(fig_res, use_container_width=True)
+        if ressourcen:
+            st.plotly_chart(figures['resources'], use_container_width=True)
         else:
             st.info("Keine Ressourcen-Daten verfügbar")
     
@@ -241,32 +298,53 @@ def show_multifile_dashboard():
     
     # Detaillierte Tabellen
     with st.expander("📋 Arbeitspakete Details"):
-        if data['arbeitspakete']:
-            ap_df = data['arbeitspakete']['data']
-            display_cols = ['AP_Name', 'Status', 'Fortschritt', 'Budget', 'Ist', 'Verantwortlich']
-            st.dataframe(ap_df[display_cols], use_container_width=True)
+        if arbeitspakete:
+            display_cols = ['AP_Name', 'Status', 'Fortschritt_Num', 'Budget', 'Ist', 'Verantwortlich']
+            ap_df = source_frame(arbeitspakete, display_cols)
+            # Nur die ersten Zeilen an den Browser schicken, die volle Liste als CSV
+            st.dataframe(
+                ap_df.iloc[:TABLE_MAX_ROWS],
+                use_container_width=True,
+                column_config={
+                    'Fortschritt_Num': st.column_config.ProgressColumn(
+                        'Fortschritt', format='%.0f%%', min_value=0, max_value=100
+                    ),
+                    'Budget': EUR_COLUMN,
+                    'Ist': EUR_COLUMN
+                }
+            )
+            if len(ap_df) > TABLE_MAX_ROWS:
+                st.caption(f"Angezeigt: {TABLE_MAX_ROWS:,} von {len(ap_df):,} Arbeitspaketen")
+                st.download_button(
+                    "📥 Alle Arbeitspakete (CSV)",
+                    data=ap_df.to_csv(index=False).encode('utf-8'),
+                    file_name="arbeitspakete.csv",
+                    mime="text/csv"
+                )
         else:
             st.info("Keine Daten")
     
+    tables = _dashboard_tables(data)
+    
     with st.expander("💰 Kosten nach Kategorie"):
-        if data['ist_kosten']:
-            ist_df = data['ist_kosten']['data']
-            category_summary = ist_df.groupby('Kategorie')['Kosten_Ist'].sum().reset_index()
-            category_summary.columns = ['Kategorie', 'Gesamt Kosten']
-            category_summary['Gesamt Kosten'] = category_summary['Gesamt Kosten'].apply(lambda x: f"€{x:,.0f}")
-            st.dataframe(category_summary, hide_index=True, use_container_width=True)
+        if tables['category_summary'] is not None:
+            st.dataframe(
+                tables['category_summary'],
+                hide_index=True,
+                use_container_width=True,
+                column_config={'Gesamt Kosten': EUR_COLUMN}
+            )
         else:
             st.info("Keine Daten")
     
     with st.expander("📊 Ressourcen pro Arbeitspaket"):
-        if data['ressourcen_arbeitspakete']:
-            res_ap_df = data['ressourcen_arbeitspakete']['data']
-            ap_agg = res_ap_df.groupby('AP_Name').agg({
-                'Ressourcen': 'sum',
-                'Stunden': 'sum',
-                'Kosten': 'sum'
-            }).reset_index()
-            st.dataframe(ap_agg, hide_index=True, use_container_width=True)
+        if tables['resources_by_ap'] is not None:
+            st.dataframe(
+                tables['resources_by_ap'],
+                hide_index=True,
+                use_container_width=True,
+                column_config={'Kosten': EUR_COLUMN}
+            )
         else:
             st.info("Keine Daten")
 
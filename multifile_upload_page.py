@@ -5,7 +5,86 @@ Ermöglicht Upload und Integration mehrerer Datenquellen
 
 import streamlit as st
 import pandas as pd
-from multi_file_processor import MultiFileProcessor
+from concurrent.futures import ThreadPoolExecutor
+from multi_file_processor import MultiFileProcessor, source_usecols, to_arrow_tables
+
+# Optional: pyarrow für das blockweise, multithreaded Parsen großer CSVs
+try:
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Ab dieser Dateigröße wird eine CSV in Blöcken gelesen
+CSV_CHUNK_THRESHOLD = 50 * 1024 * 1024
+CSV_CHUNK_ROWS = 100_000
+CSV_BLOCK_SIZE = 1 << 20  # Bytes je Arrow-Block
+
+# Höchstzahl paralleler Leser beim Einlesen der Dateien
+MAX_READ_WORKERS = 8
+
+def _read_csv_blocks(file, usecols=None) -> pd.DataFrame:
+    """
+    Liest eine große CSV über den Arrow-Streaming-Reader
+    
+    Die Datei wird in Blöcken von CSV_BLOCK_SIZE geparst; beim Umwandeln in
+    pandas gibt Arrow seine Puffer spaltenweise frei (self_destruct), so liegt
+    die Datei nie doppelt im Speicher.
+    """
+    reader = pa_csv.open_csv(
+        file,
+        read_options=pa_csv.ReadOptions(use_threads=True, block_size=CSV_BLOCK_SIZE),
+        convert_options=pa_csv.ConvertOptions(include_columns=list(usecols or []))
+    )
+    table = reader.read_all()
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+def _read_streaming(file) -> pd.DataFrame:
+    """
+    Liest eine hochgeladene Datei speicherschonend
+    
+    Große CSV-Dateien werden blockweise geparst (Arrow-Streaming-Reader, sonst
+    C-Engine in Chunks), kleinere vom pyarrow-Parser;
+    anhand des Dateikopfs werden nur die für den Dateityp nötigen Spalten
+    gelesen. .xlsx-Dateien liest die calamine-Engine (Rust), ohne sie der
+    read_only-Modus von openpyxl.
+    """
+    if file.name.endswith('.csv'):
+        usecols = source_usecols(pd.read_csv(file, nrows=0).columns)
+        file.seek(0)
+        if file.size > CSV_CHUNK_THRESHOLD:
+            if PYARROW_AVAILABLE:
+                try:
+                    return _read_csv_blocks(file, usecols)
+                except ValueError:
+                    # z.B. Typwechsel nach dem ersten Block (ArrowInvalid)
+                    file.seek(0)
+            return pd.concat(pd.read_csv(file, usecols=usecols, chunksize=CSV_CHUNK_ROWS), ignore_index=True)
+        try:
+            return pd.read_csv(file, engine='pyarrow', usecols=usecols)
+        except (ImportError, ValueError):
+            file.seek(0)  # pyarrow fehlt oder Datei zu unregelmäßig: C-Engine
+            return pd.read_csv(file, usecols=usecols)
+    
+    try:
+        return pd.read_excel(file, engine='calamine')
+    except (ImportError, ValueError):
+        file.seek(0)  # python-calamine fehlt oder pandas < 2.2: openpyxl read_only
+    
+    import openpyxl
+    
+    wb = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = wb.active.values
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame()
+        df = pd.DataFrame(list(rows), columns=list(header))
+    finally:
+        wb.close()
+    
+    # Leere Zeilen am Blattende (formatierte, aber leere Zellen) entfernen
+    return df.dropna(how='all').reset_index(drop=True)
 
 def show_multifile_upload():
     """Multi-File Upload Interface"""
@@ -102,29 +181,39 @@ def show_multifile_upload():
     # Dateien anzeigen
     if uploaded_files:
         with st.expander("📋 Hochgeladene Dateien"):
-            for key, file in uploaded_files.items():
-                st.write(f"✓ {file.name} ({file.size:,} bytes)")
+            st.markdown("\n\n".join(f"✓ {file.name} ({file.size:,} bytes)" for file in uploaded_files.values()))
     
     # Verarbeiten
     if can_process and st.button("🚀 Daten integrieren und analysieren", type="primary"):
         with st.spinner("Verarbeite und integriere Datenquellen..."):
             try:
-                # Lade alle Dateien
+                # Lade alle Dateien parallel (die Parser geben den GIL frei);
+                # Streamlit-Ausgaben bleiben im Haupt-Thread
+                files = list(uploaded_files.values())
+                with ThreadPoolExecutor(max_workers=min(MAX_READ_WORKERS, len(files))) as executor:
+                    futures = [executor.submit(_read_streaming, file) for file in files]
+                
                 dataframes = {}
-                for key, file in uploaded_files.items():
-                    if file.name.endswith('.csv'):
-                        df = pd.read_csv(file)
-                    else:
-                        df = pd.read_excel(file)
+                failed = False
+                for file, future in zip(files, futures):
+                    try:
+                        df = future.result()
+                    except Exception as e:
+                        st.error(f"❌ {file.name} konnte nicht gelesen werden: {str(e)}")
+                        failed = True
+                        continue
                     dataframes[file.name] = df
                     st.success(f"✅ {file.name} geladen: {len(df)} Zeilen")
                 
+                if failed:
+                    return
+                
                 # Verarbeite mit MultiFileProcessor
                 processor = MultiFileProcessor()
                 integrated_data = processor.load_files(dataframes)
                 
-                # Speichere in Session State
-                st.session_state.integrated_data = integrated_data
+                # Speichere in Session State (Quelldaten als kompakte Arrow-Tabellen)
+                st.session_state.integrated_data = to_arrow_tables(integrated_data)
                 st.session_state.multifile_loaded = True
                 
                 # Erfolgs-Meldung
@@ -153,25 +242,32 @@ def show_multifile_upload():
                 
                 # Details
                 with st.expander("🔍 Integrations-Details"):
-                    st.write("**Geladene Datenquellen:**")
-                    for source in integrated_data['files_loaded']:
-                        if source != 'unknown':
-                            st.write(f"✓ {source}")
-                    
-                    st.write("\n**Finanz-Übersicht:**")
-                    st.write(f"- Budget gesamt: €{summary['total_budget']:,.0f}")
-                    st.write(f"- Ist-Kosten: €{summary['total_ist']:,.0f}")
-                    st.write(f"- Forecast: €{summary['total_forecast']:,.0f}")
-                    st.write(f"- Prognose gesamt: €{summary['projected_total']:,.0f}")
-                    st.write(f"- Abweichung: €{summary['deviation']:,.0f} ({summary['deviation_pct']:+.1f}%)")
+                    # Ein Markdown-Block statt eines Elements pro Zeile
+                    lines = ["**Geladene Datenquellen:**", ""]
+                    lines += [f"✓ {source}  " for source in integrated_data['files_loaded'] if source != 'unknown']
+                    lines += [
+                        "",
+                        "**Finanz-Übersicht:**",
+                        f"- Budget gesamt: €{summary['total_budget']:,.0f}",
+                        f"- Ist-Kosten: €{summary['total_ist']:,.0f}",
+                        f"- Forecast: €{summary['total_forecast']:,.0f}",
+                        f"- Prognose gesamt: €{summary['projected_total']:,.0f}",
+                        f"- Abweichung: €{summary['deviation']:,.0f} ({summary['deviation_pct']:+.1f}%)"
+                    ]
                     
                     if 'burn_rate' in summary:
-                        st.write(f"\n**Burn Rate:**")
-                        st.write(f"- Durchschnitt: €{summary['burn_rate']:,.0f}/Monat")
-                        st.write(f"- Budget-Reichweite: {summary.get('budget_runway_months', 0):.1f} Monate")
+                        lines += [
+                            "",
+                            "**Burn Rate:**",
+                            f"- Durchschnitt: €{summary['burn_rate']:,.0f}/Monat",
+                            f"- Budget-Reichweite: {summary.get('budget_runway_months', 0):.1f} Monate"
+                        ]
+                    
+                    st.markdown("\n".join(lines))
                 
                 st.info("👉 Gehen Sie zum **Multi-Source Dashboard** um die integrierte Ansicht zu sehen!")
-                st.balloons()
+                if st.session_state.get('celebrate', False):
+                    st.balloons()
                 
             except Exception as e:
                 st.error(f"❌ Fehler bei der Verarbeitung: {str(e)}")
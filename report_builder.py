@@ -3,23 +3,169 @@ Report Builder für ControlBot
 Erstellt professionelle Word-Dokumente aus Report-Daten
 """
 
-import os
+import functools
+import re
 from datetime import datetime
-from typing import Dict, Any
+from typing import IO, Dict, Any, Optional, Tuple, Union
+import numpy as np
 import pandas as pd
 from docx import Document
-from docx.shared import Inches, Pt, RGBColor
-from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.shared import Inches, Length, Pt, RGBColor
 from docx.enum.style import WD_STYLE_TYPE
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+from xml.sax.saxutils import escape
 import io
-from PIL import Image
+
+# Auflösung der eingebetteten Charts - Word zeigt sie mit ca. 96 dpi an
+CHART_DPI = 100
+
+
+def _new_axes():
+    """
+    Erzeugt Figur und Achse über die objektorientierte matplotlib-API
+    
+    Ohne pyplot wird die Figur in keinem globalen Register geführt und muss
+    nicht geschlossen werden; gerendert wird über Agg (PNG).
+    """
+    from matplotlib.figure import Figure
+    
+    fig = Figure(figsize=(10, 6))
+    return fig, fig.add_subplot(111)
+
+def _figure_to_png(fig) -> bytes:
+    """Rendert eine matplotlib-Figur als PNG in den Speicher"""
+    fig.tight_layout()
+    image = io.BytesIO()
+    fig.savefig(image, format='png', dpi=CHART_DPI, bbox_inches='tight')
+    return image.getvalue()
+
+@functools.lru_cache(maxsize=32)
+def _render_cost_chart_png(
+    projects: Tuple[str, ...],
+    plan_values: Tuple[float, ...],
+    ist_values: Tuple[float, ...]
+) -> bytes:
+    """
+    Rendert den Plan/Ist-Kostenvergleich (einmal pro Datenstand)
+    
+    Die Werte kommen als Tupel, damit identische Daten bei erneuter
+    Report-Generierung das bereits gerenderte PNG aus dem Cache liefern.
+    """
+    fig, ax = _new_axes()
+    x_pos = np.arange(len(projects))
+    
+    width = 0.35
+    ax.bar(x_pos - width/2, plan_values, width, label='Plan', color='lightblue')
+    ax.bar(x_pos + width/2, ist_values, width, label='Ist', color='coral')
+    
+    ax.set_xlabel('Projekt')
+    ax.set_ylabel('Kosten (€)')
+    ax.set_title('Kosten: Plan vs. Ist (Top 10 Projekte)')
+    ax.set_xticks(x_pos)
+    ax.set_xticklabels(projects, rotation=45, ha='right')
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    
+    return _figure_to_png(fig)
+
+@functools.lru_cache(maxsize=32)
+def _render_deviation_chart_png(projects: Tuple[str, ...], deviations: Tuple[float, ...]) -> bytes:
+    """Rendert die Kostenabweichungen je Projekt (einmal pro Datenstand)"""
+    fig, ax = _new_axes()
+    
+    dev = np.asarray(deviations, dtype=float)
+    colors = np.select([dev > 10, dev > 0], ['red', 'orange'], default='green').tolist()
+    
+    ax.barh(projects, deviations, color=colors)
+    ax.set_xlabel('Abweichung (%)')
+    ax.set_title('Kostenabweichungen (Top 10 Projekte)')
+    ax.axvline(x=0, color='black', linestyle='-', linewidth=0.8)
+    ax.axvline(x=10, color='red', linestyle='--', linewidth=0.5, alpha=0.7)
+    ax.grid(True, alpha=0.3)
+    
+    return _figure_to_png(fig)
+
+# Markdown-Zeilentyp in einem Match: Überschriften, Aufzählung, Nummerierung (1. )
+_MD_LINE_PATTERN = re.compile(r'(?P<h1># )|(?P<h2>## )|(?P<h3>### )|(?P<ul>[-*] )|(?P<ol>\d\. )')
+
+def _run_xml(text: str, bold: bool = False, italic: bool = False,
+             size: Optional[float] = None, color: Optional[str] = None) -> str:
+    """
+    WordprocessingML eines Runs
+    
+    Args:
+        text: Text des Runs; Zeilenumbrüche werden wie bei add_run() zu <w:br/>
+        bold: Fett
+        italic: Kursiv
+        size: Schriftgröße in Punkt (None = aus dem Style)
+        color: Schriftfarbe als Hex-RGB (z.B. '808080')
+        
+    Returns:
+        XML des Runs, leerer String für leeren Text
+    """
+    if not text:
+        return ''
+    props = (
+        ('<w:b/>' if bold else '')
+        + ('<w:i/>' if italic else '')
+        + (f'<w:color w:val="{color}"/>' if color else '')
+        + (f'<w:sz w:val="{round(size * 2)}"/>' if size else '')
+    )
+    text_xml = '</w:t><w:br/><w:t xml:space="preserve">'.join(escape(part) for part in text.split('\n'))
+    return f'<w:r>{f"<w:rPr>{props}</w:rPr>" if props else ""}<w:t xml:space="preserve">{text_xml}</w:t></w:r>'
+
+def _paragraph_xml(runs, style_id: Optional[str] = None, align: Optional[str] = None) -> str:
+    """
+    WordprocessingML eines Absatzes
+    
+    Args:
+        runs: Folge von Run-XML-Strings (siehe _run_xml)
+        style_id: Style-ID des Absatzes (None = Standard)
+        align: Ausrichtung als w:jc-Wert, z.B. 'center' (None = Standard)
+    """
+    props = (
+        (f'<w:pStyle w:val="{style_id}"/>' if style_id else '')
+        + (f'<w:jc w:val="{align}"/>' if align else '')
+    )
+    return f'<w:p>{f"<w:pPr>{props}</w:pPr>" if props else ""}{"".join(runs)}</w:p>'
+
+def _table_cell_xml(text: str, width: Optional[Length], color: Optional[str] = None,
+                    bold: bool = False, size: float = 9) -> str:
+    """
+    WordprocessingML einer Tabellenzelle mit einem formatierten Run
+    
+    Entspricht einer Zelle aus table.add_row() mit gesetztem Text, Schriftgröße,
+    optionaler Schriftfarbe (Hex-RGB) und Fettdruck.
+    """
+    cell_props = f'<w:tcPr><w:tcW w:w="{width.twips}" w:type="dxa"/></w:tcPr>' if width is not None else ''
+    return f'<w:tc>{cell_props}<w:p>{_run_xml(text, bold=bold, size=size, color=color)}</w:p></w:tc>'
 
 class ReportBuilder:
     """Klasse für Erstellung von Word-Reports"""
     
+    # Leeres Dokument mit eingerichteten Styles (serialisiert) und deren
+    # Style-IDs - einmal je Prozess erzeugt, danach je Report nur geladen
+    _template: Optional[Tuple[bytes, Dict[str, str]]] = None
+    
     def __init__(self):
+        self._new_document()
+    
+    def _new_document(self):
+        """Setzt self.doc auf ein neues, leeres Dokument mit Custom Styles"""
+        template = ReportBuilder._template
+        if template is not None:
+            template_bytes, style_ids = template
+            self.doc = Document(io.BytesIO(template_bytes))
+            self._style_ids = dict(style_ids)
+            return
+        
         self.doc = Document()
         self._setup_styles()
+        
+        buffer = io.BytesIO()
+        self.doc.save(buffer)
+        ReportBuilder._template = (buffer.getvalue(), dict(self._style_ids))
     
     def _setup_styles(self):
         """Richtet Custom Styles für das Dokument ein"""
@@ -50,13 +196,20 @@ class ReportBuilder:
             subheading_font.name = 'Calibri'
             subheading_font.size = Pt(12)
             subheading_font.bold = True
+        
+        # Style-IDs für die als XML erzeugten Absätze, einmal je Dokument aufgelöst
+        self._style_ids = {
+            name: styles[name].style_id
+            for name in ('CustomTitle', 'CustomHeading', 'CustomSubheading', 'List Bullet', 'List Number')
+        }
     
     def create_word_report(
         self,
         report_content: str,
         df: pd.DataFrame,
-        include_charts: bool = True
-    ) -> str:
+        include_charts: bool = True,
+        output: Union[str, IO[bytes], None] = None
+    ) -> Union[str, IO[bytes]]:
         """
         Erstellt ein Word-Dokument aus Report-Content
         
@@ -64,13 +217,45 @@ class ReportBuilder:
             report_content: Markdown-formatierter Report-Text
             df: DataFrame mit Projektdaten
             include_charts: Ob Diagramme eingebettet werden sollen
+            output: Zielpfad oder beschreibbares Datei-Objekt (z.B. io.BytesIO);
+                ohne Angabe wird eine Datei mit Zeitstempel angelegt
             
         Returns:
-            Pfad zum erstellten Word-Dokument
+            Pfad bzw. Datei-Objekt, in das das Word-Dokument geschrieben wurde
         """
-        # Neues Dokument
-        self.doc = Document()
-        self._setup_styles()
+        self._build_document(report_content, df, include_charts)
+        
+        if output is None:
+            output = f"controlbot_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.docx"
+        
+        # Speichere Dokument (python-docx akzeptiert Pfad oder Stream)
+        self.doc.save(output)
+        
+        return output
+    
+    def create_word_report_bytes(
+        self,
+        report_content: str,
+        df: pd.DataFrame,
+        include_charts: bool = True
+    ) -> bytes:
+        """
+        Erstellt ein Word-Dokument im Speicher (z.B. für st.download_button)
+        
+        Args:
+            report_content: Markdown-formatierter Report-Text
+            df: DataFrame mit Projektdaten
+            include_charts: Ob Diagramme eingebettet werden sollen
+            
+        Returns:
+            Inhalt der .docx-Datei
+        """
+        return self.create_word_report(report_content, df, include_charts, output=io.BytesIO()).getvalue()
+    
+    def _build_document(self, report_content: str, df: pd.DataFrame, include_charts: bool):
+        """Baut das Dokument in self.doc auf"""
+        # Neues Dokument (aus der Vorlage mit bereits eingerichteten Styles)
+        self._new_document()
         
         # Füge Header hinzu
         self._add_header()
@@ -90,36 +275,20 @@ class ReportBuilder:
         
         # Füge Footer hinzu
         self._add_footer()
-        
-        # Speichere Dokument
-        output_path = f"/home/claude/controlbot_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.docx"
-        self.doc.save(output_path)
-        
-        return output_path
     
     def _add_header(self):
         """Fügt den Dokumenten-Header hinzu"""
-        # Logo-Platzhalter (optional)
-        title = self.doc.add_paragraph('ControlBot')
-        title.style = 'CustomTitle'
-        title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        
-        subtitle = self.doc.add_paragraph('Projektcontrolling Report')
-        subtitle.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        run = subtitle.runs[0]
-        run.font.size = Pt(14)
-        run.font.color.rgb = RGBColor(128, 128, 128)
-        
-        # Datum
-        date_para = self.doc.add_paragraph(f"Erstellt am: {datetime.now().strftime('%d.%m.%Y um %H:%M Uhr')}")
-        date_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        run = date_para.runs[0]
-        run.font.size = Pt(10)
-        run.font.italic = True
-        
-        self.doc.add_paragraph()  # Leerzeile
-        self.doc.add_paragraph('─' * 80)  # Trennlinie
-        self.doc.add_paragraph()
+        created = datetime.now().strftime('%d.%m.%Y um %H:%M Uhr')
+        self._append_paragraphs([
+            # Logo-Platzhalter (optional)
+            _paragraph_xml([_run_xml('ControlBot')], self._style_ids['CustomTitle'], align='center'),
+            _paragraph_xml([_run_xml('Projektcontrolling Report', size=14, color='808080')], align='center'),
+            # Datum
+            _paragraph_xml([_run_xml(f"Erstellt am: {created}", italic=True, size=10)], align='center'),
+            _paragraph_xml([]),  # Leerzeile
+            _paragraph_xml([_run_xml('─' * 80)]),  # Trennlinie
+            _paragraph_xml([]),
+        ])
     
     def _add_content_from_markdown(self, markdown_text: str):
         """
@@ -128,51 +297,68 @@ class ReportBuilder:
         Args:
             markdown_text: Markdown-formatierter Text
         """
-        lines = markdown_text.split('\n')
+        style_ids = self._style_ids
         
-        for line in lines:
+        # Absätze als XML sammeln und am Ende in einem Schritt einfügen
+        paragraphs = []
+        for line in markdown_text.split('\n'):
             line = line.strip()
             
             if not line or line == '---':
                 continue
             
+            match = _MD_LINE_PATTERN.match(line)
+            kind = match.lastgroup if match else None
+            rest = line[match.end():] if match else line
+            
             # Hauptüberschriften (# )
-            if line.startswith('# '):
-                para = self.doc.add_paragraph(line[2:])
-                para.style = 'CustomTitle'
+            if kind == 'h1':
+                paragraphs.append(_paragraph_xml([_run_xml(rest)], style_ids['CustomTitle']))
             
             # Überschriften (## )
-            elif line.startswith('## '):
-                self.doc.add_paragraph()  # Abstand vor Überschrift
-                para = self.doc.add_paragraph(line[3:])
-                para.style = 'CustomHeading'
+            elif kind == 'h2':
+                paragraphs.append(_paragraph_xml([]))  # Abstand vor Überschrift
+                paragraphs.append(_paragraph_xml([_run_xml(rest)], style_ids['CustomHeading']))
             
             # Unterüberschriften (### )
-            elif line.startswith('### '):
-                para = self.doc.add_paragraph(line[4:])
-                para.style = 'CustomSubheading'
+            elif kind == 'h3':
+                paragraphs.append(_paragraph_xml([_run_xml(rest)], style_ids['CustomSubheading']))
             
             # Bullet Points (- oder *)
-            elif line.startswith('- ') or line.startswith('* '):
-                para = self.doc.add_paragraph(line[2:], style='List Bullet')
+            elif kind == 'ul':
+                paragraphs.append(_paragraph_xml([_run_xml(rest)], style_ids['List Bullet']))
             
             # Nummerierte Listen (1. )
-            elif len(line) > 2 and line[0].isdigit() and line[1:3] == '. ':
-                para = self.doc.add_paragraph(line[3:], style='List Number')
+            elif kind == 'ol':
+                paragraphs.append(_paragraph_xml([_run_xml(rest)], style_ids['List Number']))
             
-            # Fett gedruckt (**text**)
+            # Fett gedruckt (**text**): ungerade Teile liegen zwischen **
             elif '**' in line:
-                para = self.doc.add_paragraph()
                 parts = line.split('**')
-                for i, part in enumerate(parts):
-                    run = para.add_run(part)
-                    if i % 2 == 1:  # Ungerade Index = zwischen **
-                        run.bold = True
+                paragraphs.append(_paragraph_xml([_run_xml(part, bold=i % 2 == 1) for i, part in enumerate(parts)]))
             
             # Normaler Text
             else:
-                if line:  # Nur nicht-leere Zeilen
-                    self.doc.add_paragraph(line)
+                paragraphs.append(_paragraph_xml([_run_xml(line)]))
+        
+        self._append_paragraphs(paragraphs)
+    
+    def _append_paragraphs(self, paragraphs):
+        """
+        Hängt Absätze (XML-Strings, siehe _paragraph_xml) in einem Schritt an den Body an
+        
+        Ersetzt einzelne add_paragraph()-Aufrufe; die Abschnittseigenschaften
+        (sectPr) bleiben dabei das letzte Element des Bodys.
+        """
+        if not paragraphs:
+            return
+        
+        body = self.doc.element.body
+        fragment = parse_xml(f'<w:body {nsdecls("w")}>{"".join(paragraphs)}</w:body>')
+        sect_pr = body.sectPr
+        body.extend(list(fragment))
+        if sect_pr is not None:
+            body.append(sect_pr)  # Abschnittseigenschaften bleiben letztes Element
     
     def _add_data_table(self, df: pd.DataFrame):
         """
@@ -193,14 +379,14 @@ class ReportBuilder:
         if 'kosten_status' in df.columns:
             display_columns.append('kosten_status')
         
-        df_display = df[display_columns].copy()
+        df_display = df[display_columns]
         
-        # Erstelle Tabelle
-        table = self.doc.add_table(rows=1, cols=len(display_columns))
+        # Erstelle Tabelle (nur Raster und Style, alle Zeilen kommen als XML)
+        table = self.doc.add_table(rows=0, cols=len(display_columns))
         table.style = 'Light Grid Accent 1'
+        widths = [grid_col.w for grid_col in table._tbl.tblGrid.gridCol_lst]
         
-        # Header-Zeile
-        header_cells = table.rows[0].cells
+        # Header-Zeile: fett in 10pt, direkt im Run formatiert
         headers = {
             'projekt_name': 'Projektname',
             'kosten_plan': 'Plan (€)',
@@ -208,43 +394,40 @@ class ReportBuilder:
             'kosten_abweichung_prozent': 'Abweichung (%)',
             'kosten_status': 'Status'
         }
+        header_xml = ''.join(
+            _table_cell_xml(headers.get(col, col), width, bold=True, size=10)
+            for col, width in zip(display_columns, widths)
+        )
         
-        for i, col in enumerate(display_columns):
-            cell = header_cells[i]
-            cell.text = headers.get(col, col)
-            # Fett für Header
-            for paragraph in cell.paragraphs:
-                for run in paragraph.runs:
-                    run.font.bold = True
-                    run.font.size = Pt(10)
-        
-        # Daten-Zeilen
-        for _, row in df_display.iterrows():
-            row_cells = table.add_row().cells
-            for i, col in enumerate(display_columns):
-                value = row[col]
-                
-                # Formatierung je nach Spalte
-                if col == 'kosten_plan' or col == 'kosten_ist':
-                    row_cells[i].text = f"€{value:,.0f}"
-                elif col == 'kosten_abweichung_prozent':
-                    row_cells[i].text = f"{value:.1f}%"
-                    # Farbcodierung
-                    if value > 10:
-                        for paragraph in row_cells[i].paragraphs:
-                            for run in paragraph.runs:
-                                run.font.color.rgb = RGBColor(192, 0, 0)  # Rot
-                    elif value > 5:
-                        for paragraph in row_cells[i].paragraphs:
-                            for run in paragraph.runs:
-                                run.font.color.rgb = RGBColor(255, 153, 0)  # Orange
-                else:
-                    row_cells[i].text = str(value)
-                
-                # Kleinere Schrift für Daten
-                for paragraph in row_cells[i].paragraphs:
-                    for run in paragraph.runs:
-                        run.font.size = Pt(9)
+        # Texte und Farben spaltenweise vorberechnen statt je Zelle zu formatieren
+        column_cells = []
+        for col, width in zip(display_columns, widths):
+            values = df_display[col]
+            colors = [None] * len(values)
+            
+            # Formatierung je nach Spalte
+            if col == 'kosten_plan' or col == 'kosten_ist':
+                texts = values.map('€{:,.0f}'.format)
+            elif col == 'kosten_abweichung_prozent':
+                texts = values.map('{:.1f}%'.format)
+                # Farbcodierung: Rot über 10 %, Orange über 5 %
+                pct = values.to_numpy(dtype=np.float64)
+                colors = np.select([pct > 10, pct > 5], ['C00000', 'FF9900'], default='').tolist()
+            else:
+                texts = values.astype(str)
+            
+            column_cells.append([
+                _table_cell_xml(text, width, color or None)
+                for text, color in zip(texts.tolist(), colors)
+            ])
+        
+        # Daten-Zeilen: als ein XML-Fragment aufbauen und in einem Schritt
+        # anhängen - add_row() und .cells durchsuchen die Tabelle bei jedem Aufruf
+        rows_xml = [f'<w:tr>{header_xml}</w:tr>']
+        rows_xml.extend(f'<w:tr>{"".join(cells)}</w:tr>' for cells in zip(*column_cells))
+        
+        fragment = parse_xml(f'<w:tbl {nsdecls("w")}>{"".join(rows_xml)}</w:tbl>')
+        table._tbl.extend(list(fragment))
     
     def _add_charts_section(self, df: pd.DataFrame):
         """
@@ -254,76 +437,31 @@ class ReportBuilder:
             df: DataFrame mit Projektdaten
         """
         try:
-            import matplotlib.pyplot as plt
-            import matplotlib
-            matplotlib.use('Agg')  # Non-interactive backend
-            
             self.doc.add_page_break()
             
             heading = self.doc.add_paragraph('Visualisierungen')
             heading.style = 'CustomHeading'
             
-            # Chart 1: Kosten Vergleich
-            fig, ax = plt.subplots(figsize=(10, 6))
-            
-            projects = df['projekt_name'][:10]  # Top 10 Projekte
-            x_pos = range(len(projects))
-            
-            plan_values = df['kosten_plan'][:10]
-            ist_values = df['kosten_ist'][:10]
-            
-            width = 0.35
-            ax.bar([x - width/2 for x in x_pos], plan_values, width, label='Plan', color='lightblue')
-            ax.bar([x + width/2 for x in x_pos], ist_values, width, label='Ist', color='coral')
-            
-            ax.set_xlabel('Projekt')
-            ax.set_ylabel('Kosten (€)')
-            ax.set_title('Kosten: Plan vs. Ist (Top 10 Projekte)')
-            ax.set_xticks(x_pos)
-            ax.set_xticklabels(projects, rotation=45, ha='right')
-            ax.legend()
-            ax.grid(True, alpha=0.3)
-            
-            plt.tight_layout()
-            
-            # Speichere Chart als Bild
-            chart_path = '/home/claude/temp_chart1.png'
-            plt.savefig(chart_path, dpi=150, bbox_inches='tight')
-            plt.close()
+            # Chart 1: Kosten Vergleich (Top 10 Projekte)
+            head = df.head(10)
+            projects = tuple(head['projekt_name'].astype(str))
             
-            # Füge Bild zum Dokument hinzu
-            self.doc.add_picture(chart_path, width=Inches(6))
-            
-            # Lösche temporäre Datei
-            if os.path.exists(chart_path):
-                os.remove(chart_path)
+            png = _render_cost_chart_png(
+                projects,
+                tuple(head['kosten_plan'].to_numpy(dtype=float).tolist()),
+                tuple(head['kosten_ist'].to_numpy(dtype=float).tolist())
+            )
+            self.doc.add_picture(io.BytesIO(png), width=Inches(6))
             
             # Chart 2: Abweichungsanalyse
             if 'kosten_abweichung_prozent' in df.columns:
                 self.doc.add_paragraph()
                 
-                fig, ax = plt.subplots(figsize=(10, 6))
-                
-                abweichungen = df['kosten_abweichung_prozent'][:10]
-                colors = ['red' if x > 10 else 'orange' if x > 0 else 'green' for x in abweichungen]
-                
-                ax.barh(projects, abweichungen, color=colors)
-                ax.set_xlabel('Abweichung (%)')
-                ax.set_title('Kostenabweichungen (Top 10 Projekte)')
-                ax.axvline(x=0, color='black', linestyle='-', linewidth=0.8)
-                ax.axvline(x=10, color='red', linestyle='--', linewidth=0.5, alpha=0.7)
-                ax.grid(True, alpha=0.3)
-                
-                plt.tight_layout()
-                
-                chart_path = '/home/claude/temp_chart2.png'
-                plt.savefig(chart_path, dpi=150, bbox_inches='tight')
-                plt.close()
-                
-                self.doc.add_picture(chart_path, width=Inches(6))
-                
-                if os.path.exists(chart_path):
-                    os.remove(chart_path)
+                png = _render_deviation_chart_png(
+                    projects,
+                    tuple(head['kosten_abweichung_prozent'].to_numpy(dtype=float).tolist())
+                )
+                self.doc.add_picture(io.BytesIO(png), width=Inches(6))
         
         except ImportError:
             self.doc.add_paragraph("Hinweis: Charts konnten nicht erstellt werden (matplotlib nicht installiert)")
@@ -332,20 +470,15 @@ class ReportBuilder:
     
     def _add_footer(self):
         """Fügt den Dokumenten-Footer hinzu"""
-        self.doc.add_paragraph()
-        self.doc.add_paragraph('─' * 80)
-        
-        footer = self.doc.add_paragraph()
-        run = footer.add_run('Dieser Report wurde automatisch mit ControlBot generiert.\n')
-        run.font.size = Pt(9)
-        run.font.italic = True
-        run.font.color.rgb = RGBColor(128, 128, 128)
-        
-        run = footer.add_run(f'© {datetime.now().year} ControlBot | www.controlbot.de')
-        run.font.size = Pt(8)
-        run.font.color.rgb = RGBColor(128, 128, 128)
-        
-        footer.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        self._append_paragraphs([
+            _paragraph_xml([]),
+            _paragraph_xml([_run_xml('─' * 80)]),
+            _paragraph_xml([
+                _run_xml('Dieser Report wurde automatisch mit ControlBot generiert.\n',
+                         italic=True, size=9, color='808080'),
+                _run_xml(f'© {datetime.now().year} ControlBot | www.controlbot.de', size=8, color='808080'),
+            ], align='center'),
+        ])
 
 if __name__ == "__main__":
     # Test des Moduls
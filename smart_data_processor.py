@@ -3,12 +3,190 @@ Smart Data Processor für ControlBot
 Erweiterte Version mit automatischer Spaltenerkennung, flexiblen Formaten und KI-Support
 """
 
+import functools
 import pandas as pd
 import numpy as np
 from datetime import datetime
-from typing import Dict, List, Any, Tuple, Optional
+from typing import Dict, List, Any, Tuple, Optional, Iterable, Iterator
 import re
 from difflib import get_close_matches
+from data_processor import frame_records, top_k_positions
+
+# Optional: pyarrow für den blockweisen Parquet-Export
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Optional: Numba für parallele Spalten-Kennzahlen
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    @njit(nogil=True, parallel=True, cache=True)
+    def _column_reduce(values: np.ndarray) -> Tuple:
+        """Summe, Mittelwert, Max und Min je Spalte (NaN wird wie bei pandas übersprungen)"""
+        n, c = values.shape
+        sums = np.zeros(c)
+        means = np.full(c, np.nan)
+        maxs = np.full(c, np.nan)
+        mins = np.full(c, np.nan)
+        
+        for j in prange(c):
+            s = 0.0
+            count = 0
+            hi = -np.inf
+            lo = np.inf
+            for i in range(n):
+                v = values[i, j]
+                if np.isnan(v):
+                    continue
+                s += v
+                count += 1
+                hi = max(hi, v)
+                lo = min(lo, v)
+            sums[j] = s
+            if count > 0:
+                means[j] = s / count
+                maxs[j] = hi
+                mins[j] = lo
+        
+        return sums, means, maxs, mins
+    
+    @njit(nogil=True, cache=True)
+    def _parse_ascii_row(row: np.ndarray) -> float:
+        """
+        Liest eine bereinigte Zahl (Ziffern, ',', '.', Vorzeichen) aus ASCII-Bytes
+        
+        Tausender-/Dezimaltrennzeichen nach denselben Regeln wie parse_number.
+        Liefert NaN für alles andere und für Werte, die sich nicht exakt über
+        Mantisse / 10^k darstellen lassen - diese übernimmt der pandas-Pfad.
+        """
+        length = 0
+        commas = 0
+        dots = 0
+        last_comma = -1
+        last_dot = -1
+        while length < row.size and row[length] != 0:
+            c = row[length]
+            if c == 44:  # ','
+                commas += 1
+                last_comma = length
+            elif c == 46:  # '.'
+                dots += 1
+                last_dot = length
+            elif not (48 <= c <= 57) and not ((c == 43 or c == 45) and length == 0):
+                return np.nan
+            length += 1
+        
+        german = commas > 0 and dots > 0 and last_comma > last_dot
+        english = commas > 0 and dots > 0 and not german
+        drop_dots = german or (commas == 0 and dots > 1)
+        drop_commas = english or (dots == 0 and commas > 1)
+        comma_decimal = german or (dots == 0 and commas == 1)
+        
+        mantissa = 0
+        digits = 0
+        scale = 0
+        in_fraction = False
+        for k in range(length):
+            c = row[k]
+            if 48 <= c <= 57:
+                mantissa = mantissa * 10 + (c - 48)
+                if mantissa > 9007199254740992:  # 2^53: als float nicht mehr exakt
+                    return np.nan
+                digits += 1
+                if in_fraction:
+                    scale += 1
+            elif (c == 46 and not drop_dots) or (c == 44 and comma_decimal):
+                if in_fraction:
+                    return np.nan
+                in_fraction = True
+            elif (c == 46 and drop_dots) or (c == 44 and drop_commas):
+                continue
+            elif c == 44:
+                return np.nan
+        
+        if digits == 0 or scale > 22:
+            return np.nan
+        
+        value = mantissa / (10.0 ** scale)
+        return -value if row[0] == 45 else value
+    
+    @njit(nogil=True, parallel=True, cache=True)
+    def _parse_ascii_kernel(buf: np.ndarray) -> np.ndarray:
+        """Wendet _parse_ascii_row parallel auf alle Zeilen eines Byte-Puffers an"""
+        out = np.empty(buf.shape[0])
+        for i in prange(buf.shape[0]):
+            out[i] = _parse_ascii_row(buf[i])
+        return out
+
+
+def _parse_ascii_numbers(text: pd.Series) -> np.ndarray:
+    """
+    Schneller Pfad für bereits bereinigte Zahl-Strings (ohne Währung, Suffix, Leerzeichen)
+    
+    Die Strings werden als Byte-Matrix fester Breite an einen Numba-Kernel
+    übergeben. Ohne Numba oder bei Nicht-ASCII-Text ist das Ergebnis komplett
+    NaN und parse_number_series fällt auf die pandas-Stringoperationen zurück.
+    
+    Args:
+        text: String-Serie
+        
+    Returns:
+        float64-Array, NaN wo der Kernel den Wert nicht lesen konnte
+    """
+    if NUMBA_AVAILABLE and len(text):
+        try:
+            encoded = text.to_numpy(dtype=object).astype(np.bytes_)
+        except UnicodeEncodeError:
+            encoded = None
+        if encoded is not None and encoded.itemsize:
+            buf = encoded.view(np.uint8).reshape(len(encoded), encoded.itemsize)
+            return _parse_ascii_kernel(buf)
+    
+    return np.full(len(text), np.nan)
+
+def _column_stats(frame: pd.DataFrame) -> Dict[str, Dict[str, float]]:
+    """
+    Berechnet Summe, Mittelwert, Max und Min für alle Spalten eines numerischen DataFrames
+    
+    Args:
+        frame: DataFrame mit numerischen Spalten
+        
+    Returns:
+        Dictionary {spalte: {'sum', 'mean', 'max', 'min'}}
+    """
+    if NUMBA_AVAILABLE:
+        # Spaltenweise Ablage, damit jeder Thread zusammenhängenden Speicher liest
+        values = np.asfortranarray(frame.to_numpy(dtype=np.float64))
+        sums, means, maxs, mins = _column_reduce(values)
+        return {
+            col: {'sum': float(sums[j]), 'mean': float(means[j]), 'max': float(maxs[j]), 'min': float(mins[j])}
+            for j, col in enumerate(frame.columns)
+        }
+    
+    return frame.agg(['sum', 'mean', 'max', 'min']).to_dict()
+
+# Eine Übersetzungstabelle statt sieben replace()-Aufrufen
+_NORMALIZE_TABLE = str.maketrans({'_': None, '-': None, ' ': None, 'ä': 'a', 'ö': 'o', 'ü': 'u', 'ß': 'ss'})
+
+@functools.lru_cache(maxsize=4096)
+def _normalize_name(name: str) -> str:
+    """Kleinschreibung ohne Trennzeichen und Umlaute (gecacht je Spaltenname)"""
+    return name.lower().translate(_NORMALIZE_TABLE)
+
+def _to_float(value: str) -> float:
+    """float() ohne Exception (NaN bei nicht lesbaren Werten)"""
+    try:
+        return float(value)
+    except ValueError:
+        return np.nan
 
 class SmartDataProcessor:
     """Intelligente Datenverarbeitung mit automatischer Erkennung"""
@@ -63,6 +241,9 @@ class SmartDataProcessor:
         ]
     }
     
+    # Dieselben Varianten als Mengen für die exakte Suche in O(1)
+    PATTERN_SETS = {field: frozenset(patterns) for field, patterns in COLUMN_PATTERNS.items()}
+    
     # Währungssymbole
     CURRENCY_SYMBOLS = {
         'EUR': ['€', 'EUR', 'Euro'],
@@ -72,6 +253,25 @@ class SmartDataProcessor:
         'JPY': ['¥', 'JPY', 'Yen']
     }
     
+    # Obergrenzen (inklusive) der Abweichung in % je Status, aufsteigend
+    STATUS_THRESHOLDS = np.array([-5.0, 5.0, 10.0, 15.0])
+    STATUS_CATEGORIES = ['Unter Plan', 'Im Plan', 'Warnung', 'Risiko', 'Kritisch']
+    
+    # Datumsformate in der Reihenfolge, in der parse_date sie versucht
+    DATE_FORMATS = [
+        '%d.%m.%Y',      # 31.12.2024
+        '%d.%m.%y',      # 31.12.24
+        '%Y-%m-%d',      # 2024-12-31
+        '%d-%m-%Y',      # 31-12-2024
+        '%m/%d/%Y',      # 12/31/2024
+        '%m/%d/%y',      # 12/31/24
+        '%d/%m/%Y',      # 31/12/2024
+        '%Y/%m/%d',      # 2024/12/31
+        '%B %Y',         # December 2024
+        '%b %Y',         # Dec 2024
+        '%Y',            # 2024
+    ]
+    
     def __init__(self):
         self.df = None
         self.mapping = {}
@@ -85,6 +285,21 @@ class SmartDataProcessor:
         Args:
             df: DataFrame mit unbekannten Spalten
             
+        Returns:
+            Dictionary mit Mapping: standard_name -> actual_column_name
+        """
+        # Kopie, damit Änderungen des Aufrufers den Cache nicht verfälschen
+        return dict(self._detect_for_columns(tuple(df.columns)))
+    
+    @classmethod
+    @functools.lru_cache(maxsize=128)
+    def _detect_for_columns(cls, columns: tuple) -> Dict[str, str]:
+        """
+        Spaltenerkennung für ein Spalten-Schema (gecacht je Tupel der Spaltennamen)
+        
+        Args:
+            columns: Spaltennamen in Original-Reihenfolge
+            
         Returns:
             Dictionary mit Mapping: standard_name -> actual_column_name
         """
@@ -93,12 +308,25 @@ class SmartDataProcessor:
         
         # Normalisiere Spalten-Namen für Vergleich
         normalized_columns = {
-            col: self._normalize_string(col) 
-            for col in df.columns
+            col: _normalize_name(str(col))
+            for col in columns
         }
         
         # Für jedes Standard-Feld
-        for standard_field, patterns in self.COLUMN_PATTERNS.items():
+        for standard_field, patterns in cls.COLUMN_PATTERNS.items():
+            # Exakte Übereinstimmung: die erste freie Spalte gewinnt, Fuzzy-
+            # und Substring-Suche entfallen dann für dieses Feld
+            pattern_set = cls.PATTERN_SETS[standard_field]
+            exact_match = next(
+                (col for col, normalized in normalized_columns.items()
+                 if col not in used_columns and normalized in pattern_set),
+                None
+            )
+            if exact_match is not None:
+                mapping[standard_field] = exact_match
+                used_columns.add(exact_match)
+                continue
+            
             best_match = None
             best_score = 0
             
@@ -106,17 +334,11 @@ class SmartDataProcessor:
             for actual_col, normalized in normalized_columns.items():
                 if actual_col in used_columns:
                     continue
-                    
-                # Exakte Übereinstimmung
-                if normalized in patterns:
-                    best_match = actual_col
-                    best_score = 100
-                    break
                 
                 # Fuzzy Match
                 matches = get_close_matches(normalized, patterns, n=1, cutoff=0.6)
                 if matches and len(matches) > 0:
-                    score = self._similarity_score(normalized, matches[0])
+                    score = cls._similarity_score(normalized, matches[0])
                     if score > best_score:
                         best_match = actual_col
                         best_score = score
@@ -138,12 +360,10 @@ class SmartDataProcessor:
     
     def _normalize_string(self, s: str) -> str:
         """Normalisiert String für Vergleich"""
-        s = str(s).lower()
-        s = s.replace('_', '').replace('-', '').replace(' ', '')
-        s = s.replace('ä', 'a').replace('ö', 'o').replace('ü', 'u').replace('ß', 'ss')
-        return s
+        return _normalize_name(str(s))
     
-    def _similarity_score(self, s1: str, s2: str) -> float:
+    @staticmethod
+    def _similarity_score(s1: str, s2: str) -> float:
         """Berechnet Ähnlichkeit zwischen zwei Strings"""
         from difflib import SequenceMatcher
         return SequenceMatcher(None, s1, s2).ratio() * 100
@@ -222,6 +442,91 @@ class SmartDataProcessor:
         except ValueError:
             return None
     
+    def parse_number_series(self, series: pd.Series) -> pd.Series:
+        """
+        Vektorisierte Variante von parse_number für eine ganze Spalte
+        
+        Numerische Spalten werden direkt übernommen; Textwerte durchlaufen
+        dieselben Regeln wie parse_number, aber als pandas-String-Operationen
+        statt eines Python-Aufrufs pro Zelle.
+        
+        Args:
+            series: Spalte mit Zahlen oder Zahl-Strings
+            
+        Returns:
+            float64-Serie, NaN für nicht lesbare Werte
+        """
+        if pd.api.types.is_bool_dtype(series) or pd.api.types.is_numeric_dtype(series):
+            return series.astype(float)
+        
+        result = pd.Series(np.nan, index=series.index, dtype=float)
+        
+        # Bereits Zahlen (gemischte object-Spalten)
+        is_number = np.fromiter(
+            (isinstance(v, (int, float)) for v in series.to_numpy()), dtype=bool, count=len(series)
+        )
+        if is_number.any():
+            result[is_number] = series[is_number].astype(float)
+        
+        text_mask = ~is_number & series.notna().to_numpy()
+        if not text_mask.any():
+            return result
+        
+        text = series[text_mask].astype(str).str.strip()
+        
+        # Entferne Währungssymbole
+        text = text.str.replace(_CURRENCY_PATTERN, '', regex=True).str.strip()
+        
+        # Handle k/K/m/M Suffixe
+        last = text.str[-1:]
+        multiplier = np.select([last.isin(['k', 'K']), last.isin(['m', 'M'])], [1000.0, 1000000.0], 1.0)
+        text = text.where(multiplier == 1.0, text.str[:-1])
+        
+        # Entferne Leerzeichen
+        text = text.str.replace(' ', '', regex=False)
+        
+        # Reine Ziffern/Trennzeichen liest der Numba-Kernel, nur der Rest
+        # durchläuft die pandas-Stringoperationen
+        numbers = _parse_ascii_numbers(text)
+        pending = np.isnan(numbers) & (text != '').to_numpy()
+        if pending.any():
+            numbers[pending] = self._parse_number_text(text[pending])
+        
+        result[text_mask] = numbers * multiplier
+        return result
+    
+    def _parse_number_text(self, text: pd.Series) -> np.ndarray:
+        """
+        Liest bereinigte Zahl-Strings über pandas-Stringoperationen
+        
+        Args:
+            text: Strings ohne Währungssymbol, Suffix und Leerzeichen
+            
+        Returns:
+            float64-Array, NaN für nicht lesbare Werte
+        """
+        # Erkenne Format (gleiche Regeln wie parse_number)
+        commas = text.str.count(',')
+        dots = text.str.count(r'\.')
+        german = (commas > 0) & (dots > 0) & (text.str.rfind(',') > text.str.rfind('.'))
+        english = (commas > 0) & (dots > 0) & ~german
+        drop_dots = german | ((commas == 0) & (dots > 1))
+        drop_commas = english | ((dots == 0) & (commas > 1))
+        comma_decimal = german | ((dots == 0) & (commas == 1))
+        
+        text = text.where(~drop_dots, text.str.replace('.', '', regex=False))
+        text = text.where(~drop_commas, text.str.replace(',', '', regex=False))
+        text = text.where(~comma_decimal, text.str.replace(',', '.', regex=False))
+        
+        numbers = pd.to_numeric(text, errors='coerce')
+        
+        # Seltene Schreibweisen, die nur float() versteht (z.B. "1_000")
+        retry = numbers.isna() & (text != '')
+        if retry.any():
+            numbers[retry] = text[retry].map(_to_float)
+        
+        return numbers.to_numpy(dtype=float)
+    
     def parse_date(self, value: Any) -> Optional[datetime]:
         """
         Parsed verschiedene Datumsformate
@@ -245,21 +550,7 @@ class SmartDataProcessor:
         value_str = str(value).strip()
         
         # Verschiedene Formate versuchen
-        date_formats = [
-            '%d.%m.%Y',      # 31.12.2024
-            '%d.%m.%y',      # 31.12.24
-            '%Y-%m-%d',      # 2024-12-31
-            '%d-%m-%Y',      # 31-12-2024
-            '%m/%d/%Y',      # 12/31/2024
-            '%m/%d/%y',      # 12/31/24
-            '%d/%m/%Y',      # 31/12/2024
-            '%Y/%m/%d',      # 2024/12/31
-            '%B %Y',         # December 2024
-            '%b %Y',         # Dec 2024
-            '%Y',            # 2024
-        ]
-        
-        for fmt in date_formats:
+        for fmt in self.DATE_FORMATS:
             try:
                 return datetime.strptime(value_str, fmt)
             except ValueError:
@@ -271,19 +562,147 @@ class SmartDataProcessor:
         except:
             return None
     
-    def validate_and_clean(self, df: pd.DataFrame, mapping: Dict[str, str]) -> Tuple[pd.DataFrame, Dict]:
+    def parse_date_series(self, series: pd.Series) -> pd.Series:
+        """
+        Vektorisierte Variante von parse_date für eine ganze Spalte
+        
+        Jeder eindeutige Wert wird nur einmal geparst. Die Formate aus
+        DATE_FORMATS laufen in derselben Reihenfolge wie in parse_date als
+        je ein pd.to_datetime über die noch offenen Werte; nur was keines
+        davon trifft, geht einzeln durch parse_date.
+        
+        Args:
+            series: Spalte mit Datumswerten oder Datums-Strings
+            
+        Returns:
+            datetime64-Serie, NaT für nicht lesbare Werte
+        """
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return series
+        
+        codes, uniques = pd.factorize(series)
+        if len(uniques) == 0:
+            return pd.Series(pd.NaT, index=series.index, name=series.name, dtype='datetime64[ns]')
+        
+        values = pd.Series(uniques, dtype=object)
+        parsed = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+        
+        # Bereits Datumswerte (datetime und pd.Timestamp)
+        pending = ~np.fromiter(
+            (isinstance(v, datetime) for v in uniques), dtype=bool, count=len(uniques)
+        )
+        if not pending.all():
+            parsed[~pending] = pd.to_datetime(values[~pending])
+        
+        text = values.astype(str).str.strip()
+        for fmt in self.DATE_FORMATS:
+            if not pending.any():
+                break
+            attempt = pd.to_datetime(text[pending], format=fmt, errors='coerce')
+            hit = attempt.notna().to_numpy()
+            parsed[attempt.index[hit]] = attempt[hit]
+            pending[np.flatnonzero(pending)[hit]] = False
+        
+        if pending.any():
+            parsed[pending] = pd.to_datetime(text[pending].map(self.parse_date), errors='coerce')
+        
+        result = parsed.to_numpy()[codes]
+        result[codes < 0] = np.datetime64('NaT')
+        return pd.Series(result, index=series.index, name=series.name)
+    
+    def validate_and_clean(self, df: pd.DataFrame, mapping: Dict[str, str],
+                           keep_originals: bool = False) -> Tuple[pd.DataFrame, Dict]:
         """
         Validiert und bereinigt Daten mit ausführlichem Report
+        
+        Args:
+            df: Rohdaten
+            mapping: Standard-Spalte -> Spalte in df
+            keep_originals: True legt zu Kosten- und Datumsfeldern zusätzlich
+                eine Spalte '<feld>_original' mit dem Rohwert an (pandas kopiert
+                die Spalte dabei vollständig)
         """
-        df_clean = df.copy()
-        validation_report = {
-            'total_rows': len(df),
-            'issues': [],
-            'warnings': [],
-            'infos': [],
-            'cleaned_rows': 0,
-            'removed_rows': 0
-        }
+        df_clean, invalid = self._clean_frame(df, mapping, keep_originals)
+        validation_report = self._validation_report(mapping, len(df), len(df_clean), invalid)
+        return df_clean, validation_report
+    
+    def validate_and_clean_chunks(self, chunks: Iterable[pd.DataFrame], mapping: Dict[str, str],
+                                  keep_originals: bool = False) -> Iterator[pd.DataFrame]:
+        """
+        Bereinigt Daten blockweise, z.B. aus pd.read_csv(..., chunksize=100_000)
+        
+        Es liegt immer nur ein Block im Speicher. Die Zähler der Validierung
+        werden über alle Blöcke summiert; der fertige Report steht nach dem
+        letzten Block in self.validation_results.
+        
+        Args:
+            chunks: Iterable von Rohdaten-Blöcken mit gleichen Spalten
+            mapping: Standard-Spalte -> Spalte in den Blöcken
+            keep_originals: wie bei validate_and_clean
+            
+        Yields:
+            Bereinigte Blöcke
+        """
+        total_rows = 0
+        cleaned_rows = 0
+        invalid: Dict[str, int] = {}
+        
+        for chunk in chunks:
+            chunk_clean, chunk_invalid = self._clean_frame(chunk, mapping, keep_originals)
+            total_rows += len(chunk)
+            cleaned_rows += len(chunk_clean)
+            for standard_col, nulls in chunk_invalid.items():
+                invalid[standard_col] = invalid.get(standard_col, 0) + nulls
+            yield chunk_clean
+        
+        self.validation_results = self._validation_report(mapping, total_rows, cleaned_rows, invalid)
+    
+    def write_clean_parquet(self, chunks: Iterable[pd.DataFrame], mapping: Dict[str, str], path: str,
+                            keep_originals: bool = False) -> Dict:
+        """
+        Bereinigt Daten blockweise und schreibt jeden Block als Row-Group in eine Parquet-Datei
+        
+        Args:
+            chunks: Iterable von Rohdaten-Blöcken mit gleichen Spalten
+            mapping: Standard-Spalte -> Spalte in den Blöcken
+            path: Ziel-Datei
+            keep_originals: wie bei validate_and_clean
+            
+        Returns:
+            Validierungs-Report über alle Blöcke
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow ist für den Parquet-Export nicht installiert")
+        
+        writer = None
+        try:
+            for chunk_clean in self.validate_and_clean_chunks(chunks, mapping, keep_originals):
+                if writer is None:
+                    table = pa.Table.from_pandas(chunk_clean, preserve_index=False)
+                    writer = pq.ParquetWriter(path, table.schema)
+                else:
+                    # Schema des ersten Blocks, damit alle Row-Groups zusammenpassen
+                    table = pa.Table.from_pandas(chunk_clean, schema=writer.schema, preserve_index=False)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+        
+        return self.validation_results
+    
+    def _clean_frame(self, df: pd.DataFrame, mapping: Dict[str, str],
+                     keep_originals: bool) -> Tuple[pd.DataFrame, Dict[str, int]]:
+        """
+        Legt die Standard-Spalten an und entfernt komplett leere Zeilen
+        
+        Returns:
+            Tuple (bereinigtes DataFrame, ungültige Werte je Kosten-/Datumsfeld)
+        """
+        # Flache Kopie: die Original-Spalten werden nur referenziert, nicht
+        # kopiert. Standard-Spalten werden als neue Spalten zugewiesen und
+        # verändern das übergebene DataFrame daher nicht.
+        df_clean = df.copy(deep=False)
+        validated_columns = []
         
         # Standard-Spalten erstellen
         for standard_col, actual_col in mapping.items():
@@ -292,31 +711,62 @@ class SmartDataProcessor:
             
             # Kosten-Felder
             if 'kosten' in standard_col:
-                df_clean[f'{standard_col}_original'] = df_clean[actual_col]
-                df_clean[standard_col] = df_clean[actual_col].apply(self.parse_number)
-                
-                # Validierung
-                nulls = df_clean[standard_col].isna().sum()
-                if nulls > 0:
-                    validation_report['warnings'].append(
-                        f"{nulls} Zeilen mit ungültigen Werten in {actual_col} (Spalte: {standard_col})"
-                    )
+                if keep_originals:
+                    df_clean[f'{standard_col}_original'] = df_clean[actual_col]
+                df_clean[standard_col] = self.parse_number_series(df_clean[actual_col])
+                validated_columns.append(standard_col)
             
             # Datums-Felder
             elif 'termin' in standard_col or 'date' in standard_col:
-                df_clean[f'{standard_col}_original'] = df_clean[actual_col]
-                df_clean[standard_col] = df_clean[actual_col].apply(self.parse_date)
-                
-                nulls = df_clean[standard_col].isna().sum()
-                if nulls > 0:
-                    validation_report['warnings'].append(
-                        f"{nulls} Zeilen mit ungültigen Daten in {actual_col}"
-                    )
+                if keep_originals:
+                    df_clean[f'{standard_col}_original'] = df_clean[actual_col]
+                df_clean[standard_col] = self.parse_date_series(df_clean[actual_col])
+                validated_columns.append(standard_col)
             
             # Text-Felder
             else:
                 df_clean[standard_col] = df_clean[actual_col].astype(str).str.strip()
         
+        # Ungültige Werte aller Kosten-/Datumsfelder in einer Reduktion zählen
+        invalid = {
+            col: int(count)
+            for col, count in df_clean[validated_columns].isna().sum().items()
+        } if validated_columns else {}
+        
+        # Leere Zeilen entfernen (gefiltert und damit kopiert wird nur, wenn
+        # es tatsächlich komplett leere Zeilen gibt)
+        empty_rows = df_clean.isna().all(axis=1).to_numpy()
+        if empty_rows.any():
+            df_clean = df_clean[~empty_rows]
+        
+        return df_clean, invalid
+    
+    def _validation_report(self, mapping: Dict[str, str], total_rows: int, cleaned_rows: int,
+                           invalid: Dict[str, int]) -> Dict:
+        """Erstellt den Validierungs-Report aus den gezählten Werten"""
+        validation_report = {
+            'total_rows': total_rows,
+            'issues': [],
+            'warnings': [],
+            'infos': [],
+            'cleaned_rows': cleaned_rows,
+            'removed_rows': total_rows - cleaned_rows
+        }
+        
+        # Validierung
+        for standard_col, nulls in invalid.items():
+            if nulls == 0:
+                continue
+            actual_col = mapping[standard_col]
+            if 'kosten' in standard_col:
+                validation_report['warnings'].append(
+                    f"{nulls} Zeilen mit ungültigen Werten in {actual_col} (Spalte: {standard_col})"
+                )
+            else:
+                validation_report['warnings'].append(
+                    f"{nulls} Zeilen mit ungültigen Daten in {actual_col}"
+                )
+        
         # Pflichtfelder prüfen
         required = ['projekt_name', 'kosten_plan', 'kosten_ist']
         missing_required = [field for field in required if field not in mapping]
@@ -326,47 +776,33 @@ class SmartDataProcessor:
                 f"Fehlende Pflichtfelder: {', '.join(missing_required)}"
             )
         
-        # Leere Zeilen entfernen
-        rows_before = len(df_clean)
-        df_clean = df_clean.dropna(how='all')
-        rows_after = len(df_clean)
-        validation_report['removed_rows'] = rows_before - rows_after
-        
         if validation_report['removed_rows'] > 0:
             validation_report['infos'].append(
                 f"{validation_report['removed_rows']} komplett leere Zeilen entfernt"
             )
         
-        validation_report['cleaned_rows'] = rows_after
-        
-        return df_clean, validation_report
+        return validation_report
 
     def calculate_deviations(self, df: pd.DataFrame) -> pd.DataFrame:
         """Berechnet Abweichungen"""
-        df_calc = df.copy()
+        # Flache Kopie reicht - es werden nur neue Spalten zugewiesen
+        df_calc = df.copy(deep=False)
         
         if 'kosten_plan' in df.columns and 'kosten_ist' in df.columns:
-            df_calc['kosten_abweichung_absolut'] = df_calc['kosten_ist'] - df_calc['kosten_plan']
-            
-            df_calc['kosten_abweichung_prozent'] = df_calc.apply(
-                lambda row: ((row['kosten_ist'] - row['kosten_plan']) / row['kosten_plan'] * 100) 
-                if row['kosten_plan'] != 0 else 0,
-                axis=1
-            )
+            plan = df_calc['kosten_plan'].to_numpy(dtype=np.float64)
+            diff = df_calc['kosten_ist'].to_numpy(dtype=np.float64) - plan
+            df_calc['kosten_abweichung_absolut'] = diff
             
-            def categorize_status(pct):
-                if pct > 15:
-                    return 'Kritisch'
-                elif pct > 10:
-                    return 'Risiko'
-                elif pct > 5:
-                    return 'Warnung'
-                elif pct > -5:
-                    return 'Im Plan'
-                else:
-                    return 'Unter Plan'
+            # Plan 0 -> 0 %, fehlende Werte bleiben NaN
+            pct = np.zeros_like(diff)
+            np.divide(diff, plan, out=pct, where=plan != 0)
+            pct *= 100.0
+            df_calc['kosten_abweichung_prozent'] = pct
             
-            df_calc['kosten_status'] = df_calc['kosten_abweichung_prozent'].apply(categorize_status)
+            # <= -5 Unter Plan, <= 5 Im Plan, <= 10 Warnung, <= 15 Risiko, darüber Kritisch
+            codes = np.searchsorted(self.STATUS_THRESHOLDS, pct, side='left')
+            codes[np.isnan(pct)] = 0  # nicht berechenbar -> Unter Plan (wie bisher)
+            df_calc['kosten_status'] = pd.Categorical.from_codes(codes, categories=self.STATUS_CATEGORIES)
         
         return df_calc
     
@@ -379,16 +815,24 @@ class SmartDataProcessor:
             'top_risk_projects': [],
             'top_performers': [],
             'status_distribution': {},
-            'detailed_projects': []
+            'detailed_projects_df': None
         }
         
         total_projects = len(df_analyzed)
+        status_counts = None
         
         if 'kosten_plan' in df_analyzed.columns:
+            # Alle Spalten-Kennzahlen in einem (parallelen) Durchlauf
+            stat_cols = [
+                col for col in ('kosten_plan', 'kosten_ist', 'kosten_abweichung_prozent')
+                if col in df_analyzed.columns
+            ]
+            stats = _column_stats(df_analyzed[stat_cols])
+            
             analysis['summary'] = {
                 'total_projects': total_projects,
-                'total_cost_plan': df_analyzed['kosten_plan'].sum(),
-                'total_cost_actual': df_analyzed['kosten_ist'].sum() if 'kosten_ist' in df_analyzed.columns else 0,
+                'total_cost_plan': stats['kosten_plan']['sum'],
+                'total_cost_actual': stats['kosten_ist']['sum'] if 'kosten_ist' in stats else 0,
             }
             
             if 'kosten_ist' in df_analyzed.columns:
@@ -397,28 +841,44 @@ class SmartDataProcessor:
                     analysis['summary']['total_deviation'] / analysis['summary']['total_cost_plan'] * 100
                     if analysis['summary']['total_cost_plan'] > 0 else 0
                 )
-                analysis['summary']['avg_cost_deviation_pct'] = df_analyzed['kosten_abweichung_prozent'].mean()
-                analysis['summary']['max_cost_deviation_pct'] = df_analyzed['kosten_abweichung_prozent'].max()
-                analysis['summary']['min_cost_deviation_pct'] = df_analyzed['kosten_abweichung_prozent'].min()
+                analysis['summary']['avg_cost_deviation_pct'] = stats['kosten_abweichung_prozent']['mean']
+                analysis['summary']['max_cost_deviation_pct'] = stats['kosten_abweichung_prozent']['max']
+                analysis['summary']['min_cost_deviation_pct'] = stats['kosten_abweichung_prozent']['min']
                 
-                analysis['summary']['projects_over_budget'] = len(df_analyzed[df_analyzed['kosten_abweichung_prozent'] > 0])
-                analysis['summary']['projects_critical'] = len(df_analyzed[df_analyzed['kosten_status'] == 'Kritisch'])
-                analysis['summary']['projects_warning'] = len(df_analyzed[df_analyzed['kosten_status'].isin(['Warnung', 'Risiko'])])
-                analysis['summary']['projects_on_track'] = len(df_analyzed[df_analyzed['kosten_status'] == 'Im Plan'])
+                # Ein value_counts statt je einer Maske pro Status
+                status_counts = df_analyzed['kosten_status'].value_counts()
+                analysis['summary']['projects_over_budget'] = int(
+                    np.count_nonzero(df_analyzed['kosten_abweichung_prozent'].to_numpy() > 0)
+                )
+                analysis['summary']['projects_critical'] = int(status_counts.get('Kritisch', 0))
+                analysis['summary']['projects_warning'] = int(status_counts.get('Warnung', 0) + status_counts.get('Risiko', 0))
+                analysis['summary']['projects_on_track'] = int(status_counts.get('Im Plan', 0))
         
         if 'kosten_abweichung_prozent' in df_analyzed.columns:
-            top_risks = df_analyzed.nlargest(10, 'kosten_abweichung_prozent')
-            analysis['top_risk_projects'] = top_risks.to_dict('records')
+            pct = df_analyzed['kosten_abweichung_prozent'].to_numpy(dtype=np.float64)
             
-            top_performers = df_analyzed.nsmallest(10, 'kosten_abweichung_prozent')
-            analysis['top_performers'] = top_performers.to_dict('records')
+            top_risks = df_analyzed.iloc[top_k_positions(pct, 10)]
+            analysis['top_risk_projects'] = frame_records(top_risks)
+            
+            top_performers = df_analyzed.iloc[top_k_positions(pct, 10, largest=False)]
+            analysis['top_performers'] = frame_records(top_performers)
         
         if 'kosten_status' in df_analyzed.columns:
-            analysis['status_distribution'] = df_analyzed['kosten_status'].value_counts().to_dict()
+            if status_counts is None:
+                status_counts = df_analyzed['kosten_status'].value_counts()
+            analysis['status_distribution'] = status_counts[status_counts > 0].to_dict()
         
-        analysis['detailed_projects'] = df_analyzed.to_dict('records')
+        # Alle Projekte als DataFrame, ohne Umwandlung in ein dict pro Zeile
+        analysis['detailed_projects_df'] = df_analyzed
         
         return analysis
 
+# Alle Währungssymbole als ein Regex, in derselben Reihenfolge wie in parse_number
+_CURRENCY_PATTERN = '|'.join(
+    re.escape(symbol)
+    for symbols in SmartDataProcessor.CURRENCY_SYMBOLS.values()
+    for symbol in symbols
+)
+
 if __name__ == "__main__":
     print("Smart Data Processor geladen!")
@@ -4,241 +4,396 @@ Verwaltet vordefinierte Templates für verschiedene Datenquellen
 """
 
 import json
-from typing import Dict, List, Any
-from dataclasses import dataclass, asdict
+import sys
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Any, Mapping, Optional, Tuple
+from dataclasses import dataclass, field
 
-@dataclass
+# Optional: orjson für schnelleren JSON-Export
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# __slots__ für Dataclasses gibt es erst ab Python 3.10
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(frozen=True, **_SLOTS)
 class DataTemplate:
-    """Repräsentiert ein Daten-Template"""
+    """Repräsentiert ein Daten-Template (unveränderlich, ab Python 3.10 mit __slots__)"""
     name: str
     description: str
     source_system: str
     column_mapping: Dict[str, str]
-    expected_columns: List[str]
+    expected_columns: Tuple[str, ...]
     special_handling: Dict[str, str]
     example_format: str
-
-class TemplateManager:
-    """Verwaltet Templates für verschiedene Datenquellen"""
+    # Erwartete Spalten als Menge für den Abgleich in suggest_template;
+    # wird nicht übergeben und nicht exportiert
+    _expected_set: FrozenSet[str] = field(init=False, repr=False, compare=False, default=frozenset())
     
-    def __init__(self):
-        self.templates = self._load_default_templates()
+    def __post_init__(self):
+        # Importierte Templates liefern Listen - einheitlich als Tupel ablegen
+        if not isinstance(self.expected_columns, tuple):
+            object.__setattr__(self, 'expected_columns', tuple(self.expected_columns))
+        
+        # Internierte Namen: Treffer in suggest_template sind dann identisch
+        # und werden ohne Zeichenvergleich erkannt
+        expected = frozenset(
+            sys.intern(col) if isinstance(col, str) else col for col in self.expected_columns
+        )
+        object.__setattr__(self, '_expected_set', expected)
     
-    def _load_default_templates(self) -> Dict[str, DataTemplate]:
-        """Lädt vordefinierte Templates"""
-        templates = {}
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Flaches Dictionary der exportierten Felder (ohne asdict()-Rekursion)
         
-        # Template 1: SAP Export
-        templates['sap'] = DataTemplate(
-            name="SAP Projekt-Export",
-            description="Standard-Export aus SAP PS/PPM",
-            source_system="SAP",
-            column_mapping={
-                'projekt_name': 'Projektdefinition',
-                'kosten_plan': 'Plankosten',
-                'kosten_ist': 'Istkosten',
-                'kosten_forecast': 'Forecast',
-                'termin_plan': 'Basisendtermin',
-                'termin_ist': 'Istendtermin',
-                'status': 'Systemstatus',
-                'verantwortlich': 'Projektleiter',
-                'abteilung': 'Buchungskreis'
-            },
-            expected_columns=[
-                'Projektdefinition', 'PSP-Element', 'Plankosten', 
-                'Istkosten', 'Systemstatus'
-            ],
-            special_handling={
-                'currency': 'EUR',
-                'date_format': 'DD.MM.YYYY',
-                'number_format': 'DE'
-            },
-            example_format="""
+        Die Werte sind dieselben Objekte wie im Template, nicht kopiert.
+        """
+        return {
+            'name': self.name,
+            'description': self.description,
+            'source_system': self.source_system,
+            'column_mapping': self.column_mapping,
+            'expected_columns': self.expected_columns,
+            'special_handling': self.special_handling,
+            'example_format': self.example_format
+        }
+
+# Template, das suggest_template ohne passende Spalten vorschlägt
+_DEFAULT_FALLBACK = 'excel_simple'
+
+# Gemeinsames leeres Mapping für unbekannte Templates
+_EMPTY_MAPPING: Mapping[str, str] = MappingProxyType({})
+
+# Erwarteter JSON-Typ je Feld beim Import
+_IMPORT_TYPES = {
+    'name': str,
+    'description': str,
+    'source_system': str,
+    'column_mapping': dict,
+    'expected_columns': list,
+    'special_handling': dict,
+    'example_format': str
+}
+
+def _validate_template_data(data: Any) -> None:
+    """
+    Prüft importierte Template-Daten gezielt auf Felder und Typen
+    
+    Raises:
+        ValueError: bei fehlenden, unbekannten oder falsch typisierten Feldern
+    """
+    if not isinstance(data, dict):
+        raise ValueError("JSON-Objekt erwartet")
+    
+    missing = [name for name in _IMPORT_TYPES if name not in data]
+    if missing:
+        raise ValueError(f"Fehlende Felder: {', '.join(missing)}")
+    
+    unknown = [name for name in data if name not in _IMPORT_TYPES]
+    if unknown:
+        raise ValueError(f"Unbekannte Felder: {', '.join(unknown)}")
+    
+    for name, expected_type in _IMPORT_TYPES.items():
+        if not isinstance(data[name], expected_type):
+            raise ValueError(f"Feld '{name}' muss vom Typ {expected_type.__name__} sein")
+
+def _template_json(template: DataTemplate) -> str:
+    """Serialisiert ein Template als eingerücktes JSON (orjson, falls installiert)"""
+    data = template.to_dict()
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(data, indent=2)
+
+def _load_default_templates() -> Dict[str, DataTemplate]:
+    """Erstellt die vordefinierten Templates (einmal beim Import des Moduls)"""
+    templates = {}
+    
+    # Template 1: SAP Export
+    templates['sap'] = DataTemplate(
+        name="SAP Projekt-Export",
+        description="Standard-Export aus SAP PS/PPM",
+        source_system="SAP",
+        column_mapping={
+            'projekt_name': 'Projektdefinition',
+            'kosten_plan': 'Plankosten',
+            'kosten_ist': 'Istkosten',
+            'kosten_forecast': 'Forecast',
+            'termin_plan': 'Basisendtermin',
+            'termin_ist': 'Istendtermin',
+            'status': 'Systemstatus',
+            'verantwortlich': 'Projektleiter',
+            'abteilung': 'Buchungskreis'
+        },
+        expected_columns=(
+            'Projektdefinition', 'PSP-Element', 'Plankosten', 
+            'Istkosten', 'Systemstatus'
+        ),
+        special_handling={
+            'currency': 'EUR',
+            'date_format': 'DD.MM.YYYY',
+            'number_format': 'DE'
+        },
+        example_format="""
 Projektdefinition | PSP-Element | Plankosten | Istkosten | Systemstatus
 P-12345          | A.1.2.3     | 150.000,00 | 165.000,00| TEIL
             """
-        )
-        
-        # Template 2: MS Project
-        templates['msproject'] = DataTemplate(
-            name="Microsoft Project Export",
-            description="Export aus MS Project",
-            source_system="MS Project",
-            column_mapping={
-                'projekt_name': 'Name',
-                'kosten_plan': 'Baseline Cost',
-                'kosten_ist': 'Actual Cost',
-                'kosten_forecast': 'Cost',
-                'termin_plan': 'Baseline Finish',
-                'termin_ist': 'Actual Finish',
-                'status': 'Status',
-                'verantwortlich': 'Resource Names',
-                'prioritaet': 'Priority'
-            },
-            expected_columns=[
-                'Name', 'Baseline Cost', 'Actual Cost', 'Cost', 'Status'
-            ],
-            special_handling={
-                'currency': 'USD',
-                'date_format': 'MM/DD/YYYY',
-                'number_format': 'EN'
-            },
-            example_format="""
+    )
+    
+    # Template 2: MS Project
+    templates['msproject'] = DataTemplate(
+        name="Microsoft Project Export",
+        description="Export aus MS Project",
+        source_system="MS Project",
+        column_mapping={
+            'projekt_name': 'Name',
+            'kosten_plan': 'Baseline Cost',
+            'kosten_ist': 'Actual Cost',
+            'kosten_forecast': 'Cost',
+            'termin_plan': 'Baseline Finish',
+            'termin_ist': 'Actual Finish',
+            'status': 'Status',
+            'verantwortlich': 'Resource Names',
+            'prioritaet': 'Priority'
+        },
+        expected_columns=(
+            'Name', 'Baseline Cost', 'Actual Cost', 'Cost', 'Status'
+        ),
+        special_handling={
+            'currency': 'USD',
+            'date_format': 'MM/DD/YYYY',
+            'number_format': 'EN'
+        },
+        example_format="""
 Name     | Baseline Cost | Actual Cost | Cost Variance | Status
 Project A| $150,000      | $165,000    | $15,000       | In Progress
             """
-        )
-        
-        # Template 3: Jira/Confluence
-        templates['jira'] = DataTemplate(
-            name="Jira Export",
-            description="Export aus Jira/Confluence",
-            source_system="Jira",
-            column_mapping={
-                'projekt_name': 'Summary',
-                'kosten_plan': 'Story Points',
-                'kosten_ist': 'Time Spent',
-                'status': 'Status',
-                'verantwortlich': 'Assignee',
-                'prioritaet': 'Priority',
-                'abteilung': 'Team'
-            },
-            expected_columns=[
-                'Key', 'Summary', 'Status', 'Assignee'
-            ],
-            special_handling={
-                'use_story_points': True,
-                'convert_time_to_cost': True,
-                'hourly_rate': 100
-            },
-            example_format="""
+    )
+    
+    # Template 3: Jira/Confluence
+    templates['jira'] = DataTemplate(
+        name="Jira Export",
+        description="Export aus Jira/Confluence",
+        source_system="Jira",
+        column_mapping={
+            'projekt_name': 'Summary',
+            'kosten_plan': 'Story Points',
+            'kosten_ist': 'Time Spent',
+            'status': 'Status',
+            'verantwortlich': 'Assignee',
+            'prioritaet': 'Priority',
+            'abteilung': 'Team'
+        },
+        expected_columns=(
+            'Key', 'Summary', 'Status', 'Assignee'
+        ),
+        special_handling={
+            'use_story_points': True,
+            'convert_time_to_cost': True,
+            'hourly_rate': 100
+        },
+        example_format="""
 Key      | Summary    | Story Points | Time Spent | Status
 PROJ-123 | CRM System | 89          | 120h       | In Progress
             """
-        )
-        
-        # Template 4: Excel Standard (Zugbranche)
-        templates['rail_standard'] = DataTemplate(
-            name="Zugbranche Standard",
-            description="Standard-Format für Bahnprojekte",
-            source_system="Excel",
-            column_mapping={
-                'projekt_name': 'Projektbezeichnung',
-                'kosten_plan': 'Budget',
-                'kosten_ist': 'Kosten_Aktuell',
-                'kosten_forecast': 'Hochrechnung',
-                'termin_plan': 'Fertigstellung_Plan',
-                'termin_ist': 'Fertigstellung_Ist',
-                'status': 'Projektstatus',
-                'verantwortlich': 'PM',
-                'abteilung': 'Werk',
-                'risiko': 'Risikostufe'
-            },
-            expected_columns=[
-                'Projektbezeichnung', 'Budget', 'Kosten_Aktuell', 
-                'Projektstatus', 'Werk'
-            ],
-            special_handling={
-                'currency': 'EUR',
-                'date_format': 'DD.MM.YYYY',
-                'number_format': 'DE',
-                'rail_specific': True
-            },
-            example_format="""
+    )
+    
+    # Template 4: Excel Standard (Zugbranche)
+    templates['rail_standard'] = DataTemplate(
+        name="Zugbranche Standard",
+        description="Standard-Format für Bahnprojekte",
+        source_system="Excel",
+        column_mapping={
+            'projekt_name': 'Projektbezeichnung',
+            'kosten_plan': 'Budget',
+            'kosten_ist': 'Kosten_Aktuell',
+            'kosten_forecast': 'Hochrechnung',
+            'termin_plan': 'Fertigstellung_Plan',
+            'termin_ist': 'Fertigstellung_Ist',
+            'status': 'Projektstatus',
+            'verantwortlich': 'PM',
+            'abteilung': 'Werk',
+            'risiko': 'Risikostufe'
+        },
+        expected_columns=(
+            'Projektbezeichnung', 'Budget', 'Kosten_Aktuell', 
+            'Projektstatus', 'Werk'
+        ),
+        special_handling={
+            'currency': 'EUR',
+            'date_format': 'DD.MM.YYYY',
+            'number_format': 'DE',
+            'rail_specific': True
+        },
+        example_format="""
 Projektbezeichnung | Budget      | Kosten_Aktuell | Projektstatus | Werk
 ICE Modernisierung | 5.000.000,00| 5.250.000,00   | In Arbeit     | Hamburg
             """
-        )
-        
-        # Template 5: Einfaches Excel
-        templates['excel_simple'] = DataTemplate(
-            name="Einfaches Excel",
-            description="Einfaches Excel-Format ohne spezielle Anforderungen",
-            source_system="Excel",
-            column_mapping={
-                'projekt_name': 'Projektname',
-                'kosten_plan': 'Kosten_Plan',
-                'kosten_ist': 'Kosten_Ist',
-                'status': 'Status',
-                'verantwortlich': 'Verantwortlich'
-            },
-            expected_columns=[
-                'Projektname', 'Kosten_Plan', 'Kosten_Ist'
-            ],
-            special_handling={
-                'flexible': True
-            },
-            example_format="""
+    )
+    
+    # Template 5: Einfaches Excel
+    templates['excel_simple'] = DataTemplate(
+        name="Einfaches Excel",
+        description="Einfaches Excel-Format ohne spezielle Anforderungen",
+        source_system="Excel",
+        column_mapping={
+            'projekt_name': 'Projektname',
+            'kosten_plan': 'Kosten_Plan',
+            'kosten_ist': 'Kosten_Ist',
+            'status': 'Status',
+            'verantwortlich': 'Verantwortlich'
+        },
+        expected_columns=(
+            'Projektname', 'Kosten_Plan', 'Kosten_Ist'
+        ),
+        special_handling={
+            'flexible': True
+        },
+        example_format="""
 Projektname | Kosten_Plan | Kosten_Ist | Status
 CRM System  | 150000      | 165000     | Aktiv
             """
-        )
-        
-        return templates
+    )
+    
+    return templates
+
+class TemplateManager:
+    """Verwaltet Templates für verschiedene Datenquellen"""
+    
+    # Vordefinierte Templates, einmal je Prozess aufgebaut
+    DEFAULT_TEMPLATES: Dict[str, DataTemplate] = _load_default_templates()
+    # JSON-Export der vordefinierten Templates, beim Import vorberechnet
+    DEFAULT_EXPORTS: Dict[str, str] = {
+        key: _template_json(template) for key, template in DEFAULT_TEMPLATES.items()
+    }
+    
+    def __init__(self):
+        # Eigenes Dictionary je Instanz, damit add_custom_template die
+        # Vorgaben anderer Instanzen nicht verändert
+        self.templates = dict(self.DEFAULT_TEMPLATES)
+        # JSON-Export je Template-Name (Templates sind unveränderlich); die
+        # Vorgaben sind bereits serialisiert
+        self._export_cache: Dict[str, str] = dict(self.DEFAULT_EXPORTS)
+        # Einträge für list_templates, bis add_custom_template die Liste ändert
+        self._list_cache: Optional[Tuple[Mapping[str, str], ...]] = None
+        # Invertierter Index für suggest_template: erwartete Spalte -> Template-Keys,
+        # dazu die Reihenfolge der Templates (entscheidet bei Gleichstand)
+        self._column_index: Dict[str, List[str]] = {}
+        self._positions: Dict[str, int] = {}
+        for key, template in self.templates.items():
+            self._index_template(key, template)
+    
+    def _index_template(self, key: str, template: DataTemplate):
+        """Trägt die erwarteten Spalten eines Templates in den Spalten-Index ein"""
+        self._positions.setdefault(key, len(self._positions))
+        for col in template._expected_set:
+            self._column_index.setdefault(col, []).append(key)
+    
+    def _unindex_template(self, key: str, template: DataTemplate):
+        """Entfernt die erwarteten Spalten eines Templates aus dem Spalten-Index"""
+        for col in template._expected_set:
+            keys = self._column_index[col]
+            keys.remove(key)
+            if not keys:
+                del self._column_index[col]
     
     def get_template(self, template_name: str) -> DataTemplate:
         """Gibt ein Template zurück"""
         return self.templates.get(template_name)
     
-    def list_templates(self) -> List[Dict[str, str]]:
-        """Listet alle verfügbaren Templates"""
-        return [
-            {
-                'key': key,
-                'name': template.name,
-                'description': template.description,
-                'source_system': template.source_system
-            }
-            for key, template in self.templates.items()
-        ]
-    
-    def get_template_mapping(self, template_name: str) -> Dict[str, str]:
-        """Gibt das Column-Mapping eines Templates zurück"""
+    def list_templates(self) -> List[Mapping[str, str]]:
+        """
+        Listet alle verfügbaren Templates
+        
+        Die Einträge werden gecacht und sind schreibgeschützt (MappingProxyType);
+        die zurückgegebene Liste selbst ist eine Kopie.
+        """
+        if self._list_cache is None:
+            self._list_cache = tuple(
+                MappingProxyType({
+                    'key': key,
+                    'name': template.name,
+                    'description': template.description,
+                    'source_system': template.source_system
+                })
+                for key, template in self.templates.items()
+            )
+        return list(self._list_cache)
+    
+    def get_template_mapping(self, template_name: str) -> Mapping[str, str]:
+        """Gibt das Column-Mapping eines Templates zurück (schreibgeschützt)"""
         template = self.get_template(template_name)
-        return template.column_mapping if template else {}
+        return MappingProxyType(template.column_mapping) if template else _EMPTY_MAPPING
     
     def add_custom_template(self, key: str, template: DataTemplate):
         """Fügt ein benutzerdefiniertes Template hinzu"""
+        previous = self.templates.get(key)
+        if previous is not None:
+            self._unindex_template(key, previous)
         self.templates[key] = template
+        self._index_template(key, template)
+        self._export_cache.pop(key, None)
+        self._list_cache = None
     
     def export_template(self, template_name: str) -> str:
-        """Exportiert ein Template als JSON"""
+        """Exportiert ein Template als JSON (gecacht je Template-Name)"""
+        cached = self._export_cache.get(template_name)
+        if cached is not None:
+            return cached
+        
         template = self.get_template(template_name)
         if template:
-            return json.dumps(asdict(template), indent=2)
+            exported = self._export_cache[template_name] = _template_json(template)
+            return exported
         return None
     
     def import_template(self, json_str: str) -> str:
         """Importiert ein Template aus JSON"""
         try:
-            data = json.loads(json_str)
+            data = orjson.loads(json_str) if ORJSON_AVAILABLE else json.loads(json_str)
+            _validate_template_data(data)
             template = DataTemplate(**data)
-            key = data.get('source_system', 'custom').lower() + '_custom'
+            key = data['source_system'].lower() + '_custom'
             self.add_custom_template(key, template)
             return key
         except Exception as e:
             raise ValueError(f"Fehler beim Importieren: {str(e)}")
     
-    def suggest_template(self, columns: List[str]) -> str:
-        """Schlägt ein passendes Template vor basierend auf Spalten"""
-        max_match_score = 0
-        best_template = 'excel_simple'
+    def suggest_template(self, columns: Optional[List[str]]) -> str:
+        """
+        Schlägt ein passendes Template vor basierend auf Spalten
         
-        for key, template in self.templates.items():
-            score = 0
-            # Zähle übereinstimmende Spalten
-            for expected_col in template.expected_columns:
-                if expected_col in columns:
-                    score += 1
-            
-            # Normalisierte Score
-            if len(template.expected_columns) > 0:
-                normalized_score = score / len(template.expected_columns)
-                if normalized_score > max_match_score:
-                    max_match_score = normalized_score
-                    best_template = key
+        Gezählt wird über den Spalten-Index: der Aufwand hängt nur von den
+        übergebenen Spalten ab, nicht von der Anzahl der Templates.
+        """
+        # Keine Spalten (oder None): nichts zu vergleichen
+        if columns is None or len(columns) == 0:
+            return _DEFAULT_FALLBACK
+        
+        # Menge: jede Spalte zählt einmal; internierte Namen treffen die
+        # Index-Schlüssel über die Identität
+        column_set = {sys.intern(col) if type(col) is str else col for col in columns}
         
-        return best_template
+        # Übereinstimmende Spalten je Template
+        scores: Dict[str, int] = {}
+        column_index = self._column_index
+        for col in column_set:
+            for key in column_index.get(col, ()):
+                scores[key] = scores.get(key, 0) + 1
+        
+        if not scores:
+            return _DEFAULT_FALLBACK
+        
+        # Höchste normalisierte Score; bei Gleichstand gewinnt das Template,
+        # das zuerst registriert wurde
+        templates = self.templates
+        positions = self._positions
+        return max(
+            scores,
+            key=lambda key: (scores[key] / len(templates[key]._expected_set), -positions[key])
+        )
 
 if __name__ == "__main__":
     manager = TemplateManager()
@@ -0,0 +1,25 @@
+"""Tests für DataProcessor.clean_data"""
+
+import warnings
+
+import pandas as pd
+
+from data_processor import DataProcessor
+
+
+def test_duplicate_rows_without_setting_with_copy_warning():
+    df = pd.DataFrame({
+        'projekt_name': [' A ', ' A ', 'B', 'B', 'B'],
+        'kosten_plan': ['100', '100', '200', None, None],
+        'kosten_ist': [90, 90, 'x', 50, 50],
+    })
+    
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        df_clean = DataProcessor().clean_data(df)
+    
+    assert len(df_clean) == 3
+    assert df_clean['kosten_plan'].tolist() == [100, 200, 0]
+    assert df_clean['kosten_ist'].tolist() == [90, 0, 50]
+    assert df_clean['projekt_name'].astype(str).tolist() == ['A', 'B', 'B']
+    assert df['projekt_name'].iloc[0] == ' A '
@@ -0,0 +1,22 @@
+"""Tests für to_arrow_tables (Ablage der integrierten Quellen als Arrow-Tabellen)"""
+
+import pandas as pd
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+from multi_file_processor import source_frame, to_arrow_tables
+
+
+def test_mixed_object_column_keeps_dataframe():
+    mixed = pd.DataFrame({'Projekt_ID': ['P1', 'P2'], 'Verantwortlich': ['Max', 4711]})
+    clean = pd.DataFrame({'Projekt_ID': ['P1', 'P2'], 'Budget': [1.0, 2.0]})
+    integrated = to_arrow_tables({
+        'stammdaten': {'data': mixed},
+        'budget': {'data': clean},
+    })
+    
+    assert integrated['stammdaten']['data'] is mixed
+    assert isinstance(integrated['budget']['data'], pa.Table)
+    assert source_frame(integrated['stammdaten'], ['Verantwortlich'])['Verantwortlich'].tolist() == ['Max', 4711]
+    pd.testing.assert_frame_equal(source_frame(integrated['budget']), clean)
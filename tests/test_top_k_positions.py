@@ -0,0 +1,33 @@
+"""Tests für top_k_positions (Gleichstände wie nlargest/nsmallest mit keep='first')"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_processor import top_k_positions
+
+
+def test_ties_at_boundary_smallest():
+    values = np.array([3., 1, 3, 3, 2, 3, 3, 3, 3, 3, 3, 3])
+    expected = pd.Series(values).nsmallest(3).index.to_numpy()
+    assert top_k_positions(values, 3, largest=False).tolist() == expected.tolist() == [1, 4, 0]
+
+
+def test_ties_at_boundary_largest():
+    values = np.array([1., 5, 2, 2, 5, 2, 0, 2])
+    expected = pd.Series(values).nlargest(4).index.to_numpy()
+    assert top_k_positions(values, 4).tolist() == expected.tolist()
+
+
+@pytest.mark.parametrize('largest', [True, False])
+def test_matches_pandas_with_repeated_integer_values(largest):
+    # k < Anzahl Zeilen: bei k >= n sortiert pandas komplett und ohne
+    # stabile Reihenfolge unter Gleichständen
+    rng = np.random.default_rng(0)
+    for _ in range(2000):
+        k = int(rng.integers(1, 8))
+        values = rng.integers(0, 5, size=rng.integers(k + 1, 30)).astype(float)
+        values[rng.random(values.size) < 0.3] = np.nan
+        series = pd.Series(values)
+        expected = series.nlargest(k) if largest else series.nsmallest(k)
+        assert top_k_positions(values, k, largest).tolist() == expected.index.tolist()